@@ -5,6 +5,8 @@ from django.core.asgi import get_asgi_application
 # from channels.auth import AuthMiddlewareStack
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# settings ASGI rejimiga mos DB ulanish sozlamalarini tanlaydi (CONN_MAX_AGE=0, pool)
+os.environ.setdefault('DJANGO_ASGI', '1')
 # django.setup()
 # import main.routing
 #
@@ -1,31 +1,21 @@
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from rest_framework_simplejwt.views import token_obtain_pair, token_refresh
 from django.conf import settings
-from django.conf.urls.static import static
+from django.urls import re_path
 
+from main.async_views import async_urlpatterns
+from main.health import liveness, readiness
+from main.media import serve_media
+from main.openapi import schema_document, swagger_ui
 from main.views import *
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Joy Bor API",
-        default_version='v1',
-        description="Test description",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@snippets.local"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
-
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', schema_view.with_ui('swagger', cache_timeout=0),
-         name='schema-swagger-ui'),
+    path('', swagger_ui, name='schema-swagger-ui'),
+    re_path(r'^swagger\.(?P<fmt>json|yaml)$', schema_document, name='schema-document'),
+    path('health/live/', liveness, name='health-live'),
+    path('health/ready/', readiness, name='health-ready'),
 ]
 
 urlpatterns += [
@@ -114,6 +104,7 @@ urlpatterns += [
     
     path('likes/toggle/', LikeToggleAPIView.as_view(), name='like-toggle'),
     path('likes/status/', LikeStatusAPIView.as_view(), name='like-status'),
+    path('likes/status/batch/', LikeBatchStatusAPIView.as_view(), name='like-status-batch'),
     path('likes/my/', UserLikesAPIView.as_view(), name='user-likes'),
 
     path('apartment_images/', ApartmentImageListCreateAPIView.as_view(), name='apartment-image-list-create'),
@@ -131,6 +122,7 @@ urlpatterns += [
     path('attendance-sessions/create/', AttendanceSessionCreateAPIView.as_view(), name='attendance-session-create'),
     path('attendance-sessions/<int:pk>/', AttendanceSessionDetailAPIView.as_view(), name='attendance-session-detail'),
     path("attendance-records/<int:session_id>/bulk-update/", AttendanceRecordBulkUpdateAPIView.as_view(), name="attendance-bulk-update"),
+    path('attendance-analytics/', AttendanceAnalyticsAPIView.as_view(), name='attendance-analytics'),
 
     path('statistic-for-leader/', StatisticForLeaderAPIView.as_view(), name='statistic-for-leader'),
 
@@ -145,6 +137,10 @@ urlpatterns += [
     path('duty_schedules/<int:pk>/', DutyScheduleDetailAPIView.as_view(), name='duty-schedule-detail'),
     path("check-username/", UsernameCheckAPIView.as_view(), name="check-username"),
 
+    path('uploads/', ChunkedUploadCreateAPIView.as_view(), name='chunked-upload-create'),
+    path('uploads/<uuid:token>/', ChunkedUploadDetailAPIView.as_view(), name='chunked-upload-detail'),
+    path('uploads/<uuid:token>/complete/', ChunkedUploadCompleteAPIView.as_view(), name='chunked-upload-complete'),
+
 ]
 
 urlpatterns += [
@@ -155,4 +151,13 @@ urlpatterns += [
     # path('auth/registration/', include('dj_rest_auth.registration.urls')),  # email-based reg
     # path('google/', include('allauth.socialaccount.urls')),  # google login
 
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
+
+if settings.ASYNC_VIEWS:
+    # async variantlar bir xil yo‘lda birinchi mos keladi; sync view lar swagger hujjati uchun qoladi
+    urlpatterns = async_urlpatterns + urlpatterns
+
+if settings.SERVE_MEDIA:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
+    ]
@@ -0,0 +1,64 @@
+"""
+Ko‘p jarayonli production server: `gunicorn` (shu papkadagi gunicorn.conf.py avtomatik o‘qiladi).
+
+  GUNICORN_INTERFACE=asgi (standart) - core.asgi + uvicorn worker: har bir worker o‘z event loop i bilan
+  GUNICORN_INTERFACE=wsgi            - core.wsgi + gthread worker: har birida GUNICORN_THREADS ta thread
+
+Ilova master jarayonda oldindan yuklanadi (preload): Django, URLconf, view va serializer lar bir marta
+import qilinadi, fork dan keyin worker lar bu xotirani copy-on-write bilan bo‘lishadi. Worker lar
+GUNICORN_MAX_REQUESTS (+ jitter) so‘rovdan keyin qayta ishga tushadi, shuning uchun xotira sizib
+chiqishi to‘planib qolmaydi. Excel eksport yoki parol hash lash bitta worker ni band qiladi, qolganlari
+javob berishda davom etadi. Tekshiruvlar: /health/live/ va /health/ready/.
+Single daphne bilan solishtirish: python manage.py benchmark_servers
+"""
+import gc
+import multiprocessing
+
+# `config` nomi bo‘lmasin: gunicorn modul darajasidagi nomlarni sozlama deb o‘qiydi (config = konfig fayl yo‘li)
+from decouple import config as env
+
+interface = env('GUNICORN_INTERFACE', default='asgi')
+if interface == 'asgi':
+    wsgi_app = 'core.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    default_workers = multiprocessing.cpu_count()
+else:
+    wsgi_app = 'core.wsgi:application'
+    worker_class = 'gthread'
+    default_workers = multiprocessing.cpu_count() * 2 + 1
+
+bind = f"{env('HOST', default='0.0.0.0')}:{env('PORT', default='8000')}"
+workers = env('WEB_CONCURRENCY', cast=int, default=default_workers)
+threads = env('GUNICORN_THREADS', cast=int, default=4)
+
+preload_app = env('GUNICORN_PRELOAD', cast=bool, default=True)
+max_requests = env('GUNICORN_MAX_REQUESTS', cast=int, default=1000)
+# hamma worker bir vaqtda qayta ishga tushmasligi uchun
+max_requests_jitter = env('GUNICORN_MAX_REQUESTS_JITTER', cast=int, default=100)
+
+timeout = env('GUNICORN_TIMEOUT', cast=int, default=60)
+graceful_timeout = env('GUNICORN_GRACEFUL_TIMEOUT', cast=int, default=30)
+keepalive = env('GUNICORN_KEEPALIVE', cast=int, default=5)
+
+accesslog = env('GUNICORN_ACCESS_LOG', default='-') or None
+errorlog = '-'
+loglevel = env('GUNICORN_LOG_LEVEL', default='info')
+
+
+def when_ready(server):
+    """Master da, worker lar fork qilinishidan oldin (preload bo‘lsa)"""
+    if not preload_app:
+        return
+    from django.db import connections
+    from django.urls import get_resolver
+
+    from main.openapi import warm
+
+    # URLconf lazy import qilinadi: shu yerda yuklanmasa har bir worker birinchi so‘rovda o‘zi import qiladi
+    get_resolver().url_patterns
+    # OpenAPI hujjati ham bir marta, master da (artefakt bo‘lmasa shu yerda yig‘iladi)
+    warm()
+    # master ochgan ulanishlar worker larga meros bo‘lib, bitta socket ni bo‘lishmasin
+    connections.close_all()
+    # yuklangan obyektlar GC dan chiqariladi: worker dagi gc aylanishlari bu sahifalarga yozib, nusxalatmaydi
+    gc.freeze()
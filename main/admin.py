@@ -3,6 +3,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import *
 from django.core.exceptions import ValidationError
 from django import forms
+from .seeding import recount_collection_counts
 
 
 class UserAdmin(BaseUserAdmin):
@@ -96,6 +97,41 @@ admin.site.register(UserProfile)
 admin.site.register(FloorLeader)
 admin.site.register(AttendanceSession)
 admin.site.register(AttendanceRecord)
-admin.site.register(Collection)
-admin.site.register(CollectionRecord)
+admin.site.register(AttendanceMonth)
+
+
+@admin.action(description="To‘lagan/to‘lamagan hisoblagichlarini qayta hisoblash")
+def recount_counts(modeladmin, request, queryset):
+    recount_collection_counts(queryset.values_list('id', flat=True))
+
+
+class CollectionAdmin(admin.ModelAdmin):
+    list_display = ('title', 'floor', 'paid_count', 'unpaid_count', 'created_at')
+    readonly_fields = ('paid_count', 'unpaid_count')
+    actions = [recount_counts]
+
+admin.site.register(Collection, CollectionAdmin)
+
+
+class CollectionRecordAdmin(admin.ModelAdmin):
+    """Admin paneldagi o‘zgarishlardan keyin Collection hisoblagichlari recordlardan qayta hisoblanadi"""
+    list_display = ('collection', 'student', 'status')
+    list_filter = ['status']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # record boshqa yig‘imga ko‘chirilgan bo‘lsa eskisi ham
+        collection_ids = {obj.collection_id, form.initial.get('collection')}
+        recount_collection_counts(collection_ids - {None})
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        recount_collection_counts([obj.collection_id])
+
+    def delete_queryset(self, request, queryset):
+        collection_ids = set(queryset.values_list('collection_id', flat=True))
+        super().delete_queryset(request, queryset)
+        recount_collection_counts(collection_ids)
+
+admin.site.register(CollectionRecord, CollectionRecordAdmin)
 
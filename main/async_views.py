@@ -0,0 +1,167 @@
+"""
+Eng ko‘p chaqiriladigan o‘qish endpointlarining async (Django async ORM) variantlari.
+
+ASGI (daphne/uvicorn) ostida sync DRF view har so‘rovda sync_to_async orqali cheklangan thread pool ga
+o‘tadi. Bu view lar esa event loop da ishlaydi: faqat DB so‘rovlari async ORM orqali bajariladi, shuning
+uchun yuqori parallellikda thread pool navbatiga tiqilib qolmaydi. Javoblar, autentifikatsiya (JWT) va
+ruxsatlar main.views dagi sync view lar bilan bir xil; swagger hujjati o‘sha sync view lardan olinadi.
+
+settings.ASYNC_VIEWS=True bo‘lsa (ASGI da standart) core/urls.py async_urlpatterns ni sync marshrutlardan
+oldin ulaydi. Middleware zanjiri ham async bo‘lishi kerak: RequestProfiling, NPlusOne va ReplicaPin
+middleware lari faqat sync, ular yoqilganda Django har so‘rovni baribir thread ga o‘tkazadi.
+"""
+from functools import wraps
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
+from django.urls import path
+from django.views.decorators.http import require_safe
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .auth import ClaimsJWTAuthentication
+from .likes import LIKE_MODELS, alike_statuses
+from .models import Apartment, ApplicationNotification, Dormitory, Student, User, UserNotification
+from .routers import ais_pinned, replica_reads
+from .serializers import DormitorySafeSerializer
+from .views import DormitoryListAPIView
+
+
+class AsyncJWTAuthentication(ClaimsJWTAuthentication):
+    """Token tekshiruvi sync (DB siz), claim lar eskirgan bo‘lsa foydalanuvchi async ORM bilan olinadi"""
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user = self.get_claims_user(validated_token)
+        if user is not None:
+            return user
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
+
+authenticator = AsyncJWTAuthentication()
+
+
+def _json(data, status_code=status.HTTP_200_OK):
+    # DRF JSONRenderer kabi: UTF-8, \uXXXX siz
+    return JsonResponse(data, status=status_code, safe=False, json_dumps_params={'ensure_ascii': False})
+
+
+def _error_response(request, exc):
+    data = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+    response = _json(data, exc.status_code)
+    if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+        response['WWW-Authenticate'] = authenticator.authenticate_header(request)
+    return response
+
+
+def async_api_view(authenticated=True):
+    """
+    DRF APIView ning async view uchun zarur qismi: GET/HEAD, JWT autentifikatsiya (token noto‘g‘ri bo‘lsa
+    AllowAny view da ham 401) va IsAuthenticated. request.user o‘rnatiladi (ReplicaPinMiddleware uchun).
+    """
+    def decorator(view):
+        @require_safe
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                result = await authenticator.aauthenticate(request)
+                request.user = result[0] if result else AnonymousUser()
+                if authenticated and not request.user.is_authenticated:
+                    raise NotAuthenticated()
+            except APIException as exc:
+                return _error_response(request, exc)
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@async_api_view()
+async def unread_notification_count(request):
+    system_unread = await UserNotification.objects.filter(
+        user=request.user, is_read=False, notification__is_active=True,
+    ).acount()
+    application_unread = await ApplicationNotification.objects.filter(user=request.user, is_read=False).acount()
+    return _json({'unread_count': system_unread + application_unread})
+
+
+@async_api_view()
+async def like_status(request):
+    content_type = request.GET.get('content_type')
+    object_id = request.GET.get('object_id')
+
+    if not content_type or not object_id:
+        return _json({'error': 'content_type va object_id kerak'}, status.HTTP_400_BAD_REQUEST)
+    try:
+        object_id = int(object_id)
+    except ValueError:
+        return _json({'error': 'object_id raqam bo\'lishi kerak'}, status.HTTP_400_BAD_REQUEST)
+    if content_type not in LIKE_MODELS:
+        return _json({'error': 'content_type dormitory yoki apartment bo\'lishi kerak'}, status.HTTP_400_BAD_REQUEST)
+
+    statuses = await alike_statuses(request.user.id, content_type, [object_id])
+    return _json(statuses[object_id])
+
+
+@async_api_view()
+async def check_username(request):
+    username = request.GET.get('username')
+    if not username:
+        return _json({'detail': 'Username kiritilmagan'}, status.HTTP_400_BAD_REQUEST)
+
+    exists = await User.objects.filter(username=username).aexists()
+    return _json({'username': username, 'available': not exists})
+
+
+@async_api_view(authenticated=False)
+async def statistics(request):
+    return _json({
+        'students_count': await Student.objects.acount(),
+        'dormitories_count': await Dormitory.objects.acount(),
+        'apartments_count': await Apartment.objects.acount(),
+    })
+
+
+@async_api_view(authenticated=False)
+async def dormitory_list(request):
+    # sync view bilan bir xil queryset: sonlar annotatsiyada, bog‘liq obyektlar prefetch da, shuning uchun
+    # serializer DB ga murojaat qilmaydi (async kontekstda lazy so‘rov SynchronousOnlyOperation beradi)
+    queryset = DormitoryListAPIView.queryset.all()
+    if await ais_pinned(request.user):
+        dormitories = [dormitory async for dormitory in queryset]
+    else:
+        with replica_reads():
+            dormitories = [dormitory async for dormitory in queryset]
+    return _json(DormitorySafeSerializer(dormitories, many=True, context={'request': request}).data)
+
+
+async_urlpatterns = [
+    path('notifications/unread-count/', unread_notification_count, name='unread-count'),
+    path('likes/status/', like_status, name='like-status'),
+    path('check-username/', check_username, name='check-username'),
+    path('statistics/', statistics, name='statistics-list'),
+    path('dormitories/', dormitory_list, name='dormitory-list'),
+]
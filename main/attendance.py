@@ -0,0 +1,131 @@
+import calendar
+
+from django.db import connection
+from django.db.models import F
+
+from .models import AttendanceMonth, AttendanceRecord
+
+
+def day_bit(day):
+    """Oyning N-kuni uchun bit (1-kun -> 1 << 0)"""
+    return 1 << (day.day - 1)
+
+
+def mark_attendance(day, in_student_ids=(), out_student_ids=()):
+    """
+    Berilgan kun uchun talabalarning oylik bitmaplarini yangilash.
+    Bitta INSERT (yo‘q qatorlar uchun) va har bir status uchun bitta UPDATE.
+    """
+    in_student_ids = set(in_student_ids)
+    out_student_ids = set(out_student_ids)
+    student_ids = in_student_ids | out_student_ids
+    if not student_ids:
+        return
+
+    AttendanceMonth.objects.bulk_create(
+        [AttendanceMonth(student_id=student_id, year=day.year, month=day.month) for student_id in student_ids],
+        ignore_conflicts=True
+    )
+
+    bit = day_bit(day)
+    months = AttendanceMonth.objects.filter(year=day.year, month=day.month)
+    if in_student_ids:
+        months.filter(student_id__in=in_student_ids).update(
+            recorded_mask=F('recorded_mask').bitor(bit),
+            out_mask=F('out_mask').bitand(~bit),
+        )
+    if out_student_ids:
+        months.filter(student_id__in=out_student_ids).update(
+            recorded_mask=F('recorded_mask').bitor(bit),
+            out_mask=F('out_mask').bitor(bit),
+        )
+
+
+def mark_records_attendance(day, records):
+    """
+    mark_attendance ning set-based varianti: `records` (AttendanceRecord queryset) talabalari
+    Python ga yuklanmaydi, oylik qatorlar INSERT ... SELECT bilan yaratiladi.
+    """
+    sql, params = records.values('student_id').query.sql_with_params()
+    table = connection.ops.quote_name(AttendanceMonth._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (student_id, year, month, recorded_mask, out_mask)
+            SELECT DISTINCT u.student_id, %s, %s, 0, 0 FROM ({sql}) u
+            WHERE 1 = 1
+            ON CONFLICT (student_id, year, month) DO NOTHING
+            """,
+            [day.year, day.month, *params]
+        )
+
+    bit = day_bit(day)
+    months = AttendanceMonth.objects.filter(year=day.year, month=day.month)
+    months.filter(student_id__in=records.filter(status=AttendanceRecord.Status.IN).values('student_id')).update(
+        recorded_mask=F('recorded_mask').bitor(bit),
+        out_mask=F('out_mask').bitand(~bit),
+    )
+    months.filter(student_id__in=records.filter(status=AttendanceRecord.Status.OUT).values('student_id')).update(
+        recorded_mask=F('recorded_mask').bitor(bit),
+        out_mask=F('out_mask').bitor(bit),
+    )
+
+
+def unmark_attendance(day, student_ids):
+    """Kun uchun davomat o‘chirilganda bitlarni tozalash"""
+    bit = day_bit(day)
+    AttendanceMonth.objects.filter(year=day.year, month=day.month, student_id__in=student_ids).update(
+        recorded_mask=F('recorded_mask').bitand(~bit),
+        out_mask=F('out_mask').bitand(~bit),
+    )
+
+
+def rebuild_attendance_months(records=None):
+    """AttendanceRecord lardan bitmaplarni qaytadan qurish (backfill uchun)"""
+    if records is None:
+        records = AttendanceRecord.objects.all()
+
+    masks = {}
+    for student_id, date, record_status in records.values_list('student_id', 'session__date', 'status').iterator():
+        key = (student_id, date.year, date.month)
+        recorded, out = masks.get(key, (0, 0))
+        bit = day_bit(date)
+        recorded |= bit
+        if record_status == AttendanceRecord.Status.OUT:
+            out |= bit
+        masks[key] = (recorded, out)
+
+    AttendanceMonth.objects.bulk_create(
+        [
+            AttendanceMonth(student_id=student_id, year=year, month=month, recorded_mask=recorded, out_mask=out)
+            for (student_id, year, month), (recorded, out) in masks.items()
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['student', 'year', 'month'],
+        update_fields=['recorded_mask', 'out_mask'],
+    )
+    return len(masks)
+
+
+def streak_expression(field, length):
+    """`length` kun ketma-ket bit o‘rnatilgan bo‘lsa 0 dan farqli qiymat beruvchi SQL ifoda"""
+    expression = F(field)
+    for shift in range(1, length):
+        expression = expression.bitand(F(field).bitrightshift(shift))
+    return expression
+
+
+def longest_streak(mask, days):
+    longest = current = 0
+    for day in range(days):
+        if mask & (1 << day):
+            current += 1
+            longest = max(longest, current)
+        else:
+            current = 0
+    return longest
+
+
+def days_in_month(year, month):
+    return calendar.monthrange(year, month)[1]
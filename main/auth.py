@@ -0,0 +1,196 @@
+"""
+JWT autentifikatsiyasi: har bir so‘rovda User qatorini o‘qimasdan.
+
+Token berilayotganda (login, ro‘yxatdan o‘tish, refresh) unga imzolangan claim lar qo‘shiladi: rol,
+is_superuser/is_staff, admin bo‘lgan yotoqxona ID si va qavat sardori ID si, hamda ular qachon
+o‘qilganligi (claims_at). ClaimsJWTAuthentication shu claim lardan yengil User obyektini quradi:
+faqat pk yuklangan, claim lar model maydonlariga emas, alohida token_claims atributiga qo‘yiladi.
+Ruxsatlar (main.permissions) claim_value orqali token_claims dan o‘qiydi. Qolgan maydonlardan biriga
+(user.role, user.username, ...) murojaat qilinsa hamma maydon bitta so‘rovda bazadan yuklanadi
+(User.refresh_from_db), shuning uchun save() eskirgan claim qiymatlarini bazaga qaytarib yozmaydi:
+deferred obyektda faqat yuklangan yoki o‘zgartirilgan maydonlar saqlanadi.
+
+Bekor qilish: User, Dormitory.admin yoki FloorLeader o‘zgarsa (main.signals) foydalanuvchining
+o‘zgarish vaqti keshga yoziladi. claims_at shu vaqtdan oldin bo‘lgan token claim lari eskirgan
+hisoblanadi va so‘rov odatdagidek bazadan o‘qilgan User bilan o‘tadi (keyingi refresh yangi claim
+beradi). Kesh qiymatlari har bir jarayonda JWT_REVOCATION_SYNC_SECONDS davomida xotirada saqlanadi,
+shuning uchun oddiy so‘rov na bazaga, na keshga murojaat qiladi. Kesh barcha worker lar uchun umumiy
+bo‘lishi shart: JWT_CLAIMS_AUTH faqat Redis/Memcached bilan yoqiladi (settings.SHARED_CACHE_BACKENDS).
+Kesh tozalansa (restart, eviction) auth:epoch yangilanadi va undan oldingi barcha claim lar eskiradi.
+QuerySet.update() signal yubormaydi: foydalanuvchilarni shunday o‘zgartirganda revoke_claims ni chaqiring.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import Dormitory, FloorLeader, User
+
+CLAIMS_AT = 'claims_at'
+# User maydonlaridan olinadigan claim lar
+USER_FIELD_CLAIMS = ('role', 'is_superuser', 'is_staff')
+RELATION_CLAIMS = ('dormitory_id', 'floor_leader_id')
+
+EPOCH_KEY = 'auth:epoch'
+
+# {user_id: (o‘zgarish vaqti, keshdan o‘qilgan monotonic vaqt)}
+_revoked = {}
+_epoch = [0.0, None]
+
+
+def _revoked_key(user_id):
+    return f"auth:revoked:{user_id}"
+
+
+def _revocation_timeout():
+    # refresh token muddatidan keyin eski claim li token qolmaydi
+    return int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def with_relation_claims(queryset):
+    return queryset.annotate(
+        dormitory_id=Subquery(Dormitory.objects.filter(admin=OuterRef('pk')).order_by('pk').values('pk')[:1]),
+        floor_leader_id=Subquery(FloorLeader.objects.filter(user=OuterRef('pk')).values('pk')[:1]),
+    )
+
+
+def token_claims(user_id):
+    """Token ga yoziladigan claim lar: bitta so‘rov, vaqt so‘rovdan oldin olinadi"""
+    claims_at = time.time()
+    row = with_relation_claims(User.objects.filter(pk=user_id)).values(*USER_FIELD_CLAIMS, *RELATION_CLAIMS).first()
+    if row is None:
+        return None
+    return {**row, CLAIMS_AT: claims_at}
+
+
+def find_login_user(username_or_email):
+    """
+    Login uchun foydalanuvchi: username yoki email bo‘yicha bitta so‘rov (ikkalasiga mos kelsa username
+    ustun). Natija: (user, claims) - token claim lari ham shu so‘rovda o‘qiladi, topilmasa (None, None).
+    """
+    claims_at = time.time()
+    users = list(with_relation_claims(
+        User.objects.filter(Q(username=username_or_email) | Q(email=username_or_email))
+    )[:2])
+    user = next((user for user in users if user.username == username_or_email), users[0] if users else None)
+    if user is None:
+        return None, None
+    claims = {name: getattr(user, name) for name in (*USER_FIELD_CLAIMS, *RELATION_CLAIMS)}
+    return user, {**claims, CLAIMS_AT: claims_at}
+
+
+def _epoch_value():
+    now = time.monotonic()
+    if _epoch[1] is None or now - _epoch[1] > settings.JWT_REVOCATION_SYNC_SECONDS:
+        epoch = cache.get(EPOCH_KEY)
+        if epoch is None:
+            cache.add(EPOCH_KEY, time.time(), timeout=None)
+            epoch = cache.get(EPOCH_KEY, time.time())
+        _epoch[:] = [epoch, now]
+    return _epoch[0]
+
+
+def _revoked_at(user_id):
+    now = time.monotonic()
+    entry = _revoked.get(user_id)
+    if entry is None or now - entry[1] > settings.JWT_REVOCATION_SYNC_SECONDS:
+        if len(_revoked) >= settings.JWT_REVOCATION_LOCAL_SIZE:
+            _revoked.clear()
+        entry = (cache.get(_revoked_key(user_id), 0.0), now)
+        _revoked[user_id] = entry
+    return entry[0]
+
+
+def claims_revoked(user_id, claims_at):
+    return claims_at < _epoch_value() or claims_at < _revoked_at(user_id)
+
+
+def revoke_claims(user_id):
+    """Foydalanuvchining avval berilgan token claim larini eskirgan deb belgilash (commit dan keyin)"""
+    def revoke():
+        revoked_at = time.time()
+        cache.set(_revoked_key(user_id), revoked_at, _revocation_timeout())
+        _revoked[user_id] = (revoked_at, time.monotonic())
+
+    transaction.on_commit(revoke)
+
+
+def claims_user(validated_token):
+    """
+    Token claim laridan yengil User: faqat pk yuklangan, claim lar token_claims da.
+    Boshqa maydonga birinchi murojaatda butun qator bitta so‘rovda yuklanadi.
+    """
+    user = User.from_db(None, [User._meta.pk.attname], [validated_token[api_settings.USER_ID_CLAIM]])
+    user.token_claims = {name: validated_token[name] for name in (*USER_FIELD_CLAIMS, *RELATION_CLAIMS)}
+    return user
+
+
+def user_claims(user):
+    """Token dan qurilgan foydalanuvchi claim lari, bazadan o‘qilgan foydalanuvchi uchun None"""
+    return getattr(user, 'token_claims', None)
+
+
+def claim_value(user, name):
+    """role/is_superuser/is_staff: token claim idan (so‘rovsiz), bo‘lmasa User maydonidan"""
+    claims = user_claims(user)
+    if claims is not None:
+        return claims[name]
+    return getattr(user, name)
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Claim lar bilan token: login/ro‘yxatdan o‘tishda ham, refresh da ham"""
+
+    @classmethod
+    def for_user(cls, user, claims=None):
+        token = super().for_user(user)
+        if claims is None:
+            claims = token_claims(user.pk)
+        if claims is not None:
+            for name, value in claims.items():
+                token[name] = value
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        claims_at = self.payload.get(CLAIMS_AT)
+        # eskirgan (yoki eski, claim siz) refresh token: yangi access token ga joriy claim lar
+        if user_id is not None and (claims_at is None or claims_revoked(user_id, claims_at)):
+            claims = token_claims(user_id)
+            if claims is not None:
+                for name, value in claims.items():
+                    access[name] = value
+        return access
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Claim lari eskirmagan token uchun User bazadan o‘qilmaydi. Claim siz yoki eskirgan token,
+    CHECK_REVOKE_TOKEN yoqilgan yoki JWT_CLAIMS_AUTH o‘chiq bo‘lsa - odatdagi JWTAuthentication (bitta SELECT).
+    """
+
+    def get_claims_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        claims_at = validated_token.get(CLAIMS_AT)
+        if not settings.JWT_CLAIMS_AUTH or user_id is None or claims_at is None or api_settings.CHECK_REVOKE_TOKEN:
+            return None
+        if any(name not in validated_token for name in (*USER_FIELD_CLAIMS, *RELATION_CLAIMS)):
+            return None
+        if claims_revoked(user_id, claims_at):
+            return None
+        return claims_user(validated_token)
+
+    def get_user(self, validated_token):
+        return self.get_claims_user(validated_token) or super().get_user(validated_token)
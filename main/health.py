@@ -0,0 +1,50 @@
+"""
+Load balancer / orchestrator tekshiruvlari.
+  /health/live/  - jarayon javob beryapti (DB ga tegmaydi; ASGI da thread pool ga ham o‘tmaydi)
+  /health/ready/ - so‘rov qabul qilishga tayyor: har bir DB alias va kesh ishlaydi, aks holda 503
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import connections
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+logger = logging.getLogger(__name__)
+
+
+@never_cache
+@require_safe
+async def liveness(request):
+    return JsonResponse({'status': 'ok'})
+
+
+def _check_database(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def _check_cache():
+    cache.set('health:ready', 1, 10)
+    if cache.get('health:ready') != 1:
+        raise RuntimeError("kesh yozilgan qiymatni qaytarmadi")
+
+
+@never_cache
+@require_safe
+def readiness(request):
+    checks = {f"db:{alias}": (lambda alias=alias: _check_database(alias)) for alias in connections}
+    checks['cache'] = _check_cache
+
+    results, ready = {}, True
+    for name, check in checks.items():
+        try:
+            check()
+            results[name] = 'ok'
+        except Exception as exc:
+            # har qanday xato (ImproperlyConfigured, redis ConnectionError, ...) 500 emas, 503 bo‘lishi kerak
+            logger.warning("Readiness %s: %s", name, exc, exc_info=True)
+            results[name] = 'error'
+            ready = False
+    return JsonResponse({'status': 'ok' if ready else 'error', 'checks': results}, status=200 if ready else 503)
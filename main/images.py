@@ -0,0 +1,171 @@
+"""
+Yuklangan rasmlar uchun kichik variantlar (thumb/medium, JPEG va WebP).
+Variantlar original yonida saqlanadi: dormitory_images/fon.jpg -> dormitory_images/fon_thumb.webp
+EXIF (GPS va h.k.) variantlarga ko‘chirilmaydi, orientatsiya esa oldindan qo‘llanadi.
+Yaratilgan variantlar modelning <maydon>_variants JSON ustuniga yoziladi, URL lar diskka qaramasdan quriladi.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger('main.images')
+
+VARIANT_SIZES = {
+    'thumb': (320, 320),
+    'medium': (960, 960),
+}
+FORMATS = {
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+}
+
+# modellar va ularning variant yaratiladigan rasm maydonlari (signals.py shu ro‘yxat bilan ulanadi)
+IMAGE_FIELDS = {
+    'DormitoryImage': ['image'],
+    'ApartmentImage': ['image'],
+    'Student': ['picture'],
+    'Application': ['user_image'],
+    'UserProfile': ['image'],
+    'University': ['logo'],
+}
+
+_executor = None
+
+
+def variant_name(name, variant, extension):
+    stem, _ = os.path.splitext(name)
+    return f"{stem}_{variant}.{extension}"
+
+
+def variant_names(name):
+    return {
+        f"{variant}_{extension}" if extension != 'jpg' else variant: variant_name(name, variant, extension)
+        for variant in VARIANT_SIZES for extension in FORMATS
+    }
+
+
+def variants_field(field_name):
+    """Rasm maydoni uchun variantlar ro‘yxati saqlanadigan ustun: image -> image_variants"""
+    return f"{field_name}_variants"
+
+
+def _flatten(image):
+    """JPEG uchun: shaffof fonni oq rangga aylantirish"""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def generate_variants(name, storage=default_storage, force=False):
+    """Bitta rasm uchun barcha variantlarni yaratish; yaratilgan fayl nomlarini qaytaradi"""
+    targets = variant_names(name)
+    if not force and all(storage.exists(target) for target in targets.values()):
+        return []
+
+    try:
+        with storage.open(name, 'rb') as f:
+            source = Image.open(f)
+            source = ImageOps.exif_transpose(source)
+            source.load()
+    except (FileNotFoundError, UnidentifiedImageError, OSError) as exc:
+        logger.warning("Rasm variantlari yaratilmadi: %s (%s)", name, exc)
+        return []
+
+    created = []
+    for variant, size in VARIANT_SIZES.items():
+        image = source.copy()
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        image = _flatten(image)
+        for extension, (image_format, options) in FORMATS.items():
+            buffer = BytesIO()
+            # exif berilmaydi: Pillow metama'lumotlarsiz saqlaydi
+            image.save(buffer, image_format, **options)
+            target = variant_name(name, variant, extension)
+            if storage.exists(target):
+                storage.delete(target)
+            created.append(storage.save(target, ContentFile(buffer.getvalue())))
+    return created
+
+
+def record_variants(name, storage=default_storage):
+    """
+    Diskdagi tayyor variantlarni shu rasmga ishora qiluvchi barcha yozuvlarga yozish.
+    .update() signal chaqirmaydi; content-addressed nom bir nechta yozuvda bo‘lishi mumkin.
+    """
+    ready = {key: target for key, target in variant_names(name).items() if storage.exists(target)}
+    for model_name, fields in IMAGE_FIELDS.items():
+        model = apps.get_model('main', model_name)
+        for field in fields:
+            model.objects.filter(**{field: name}).update(**{variants_field(field): ready})
+    return ready
+
+
+def process_image(name, force=False):
+    """Variantlarni yaratish va natijani bazaga yozish (fon pool va backfill buyrug‘i uchun)"""
+    created = generate_variants(name, force=force)
+    record_variants(name)
+    return created
+
+
+def _process_in_background(name):
+    try:
+        process_image(name)
+    except Exception:
+        logger.exception("Rasm variantlari yozilmadi: %s", name)
+    finally:
+        # pool oqimi o‘z ulanishini ochiq qoldirmasin
+        connections.close_all()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'IMAGE_VARIANT_WORKERS', 2),
+            thread_name_prefix='image-variants',
+        )
+    return _executor
+
+
+def schedule_variants(name):
+    """
+    Tranzaksiya commit bo‘lgach variantlarni fon pool ida yaratish. Pillow resize/encode vaqtida
+    GIL ni bo‘shatadi, so‘rov esa kutib turmaydi. IMAGE_VARIANTS_ASYNC=False bo‘lsa darhol.
+    """
+    if getattr(settings, 'IMAGE_VARIANTS_ASYNC', True):
+        transaction.on_commit(lambda: _get_executor().submit(_process_in_background, name))
+    else:
+        transaction.on_commit(lambda: process_image(name))
+
+
+def image_variant_urls(field_file, request=None):
+    """
+    {'original', 'thumb', 'thumb_webp', 'medium', 'medium_webp'} URL lari. Qaysi variant borligi
+    yozuvning <maydon>_variants ustunidan olinadi (storage.exists chaqirilmaydi). Hali yaratilmagan
+    yoki rasm almashtirilgach eskirgan variant o‘rniga original URL beriladi.
+    """
+    if not field_file:
+        return None
+
+    storage = field_file.storage
+    original = field_file.url
+    recorded = getattr(field_file.instance, variants_field(field_file.field.name), None) or {}
+    urls = {'original': original}
+    urls.update(
+        (key, storage.url(name) if recorded.get(key) == name else original)
+        for key, name in variant_names(field_file.name).items()
+    )
+    if request is not None:
+        urls = {key: request.build_absolute_uri(url) for key, url in urls.items()}
+    return urls
@@ -0,0 +1,163 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Apartment, Application, Dormitory, Like, Student
+
+LIKE_MODELS = {
+    'dormitory': Dormitory,
+    'apartment': Apartment,
+}
+
+
+def count_subquery(queryset, field):
+    """Har bir qator uchun alohida COUNT; JOIN + Count(distinct) dagidek qatorlar ko‘payib ketmaydi"""
+    counts = queryset.filter(**{field: OuterRef('pk')}).values(field).annotate(total=Count('*')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def load_like_targets(likes):
+    """
+    Like lar obyektlarini content_type bo‘yicha guruhlab, har bir tur uchun bitta in_bulk
+    so‘rov bilan yuklash. Natija: {(content_type, object_id): obj}
+    """
+    ids = {'dormitory': set(), 'apartment': set()}
+    for like in likes:
+        if like.content_type in ids:
+            ids[like.content_type].add(like.object_id)
+
+    targets = {}
+    if ids['dormitory']:
+        dormitories = Dormitory.objects.select_related('university', 'admin').annotate(
+            total_students=count_subquery(Student.objects.all(), 'dormitory'),
+            approved_applications=count_subquery(Application.objects.filter(status='APPROVED'), 'dormitory'),
+        ).in_bulk(ids['dormitory'])
+        targets.update((('dormitory', pk), dormitory) for pk, dormitory in dormitories.items())
+    if ids['apartment']:
+        apartments = Apartment.objects.select_related('province', 'user').in_bulk(ids['apartment'])
+        targets.update((('apartment', pk), apartment) for pk, apartment in apartments.items())
+    return targets
+
+
+def change_like_count(content_type, object_id, delta):
+    """like_count ni bitta UPDATE bilan o‘zgartirish (poyga holatida ham to‘g‘ri)"""
+    LIKE_MODELS[content_type].objects.filter(pk=object_id).update(like_count=F('like_count') + delta)
+
+
+class LikeTargetNotFound(Exception):
+    pass
+
+
+def toggle_like(user_id, content_type, object_id):
+    """
+    Like qo‘yish yoki olib tashlash: avval DELETE ... RETURNING, o‘chadigan qator bo‘lmasa
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING. Obyekt mavjudligi INSERT ning
+    o‘zida tekshiriladi, ikki marta bosish unique cheklov orqali jim o‘tadi (IntegrityError yo‘q).
+    Signallar ishlamaydi, shuning uchun like_count va kesh shu yerda yangilanadi.
+    Natija: (is_liked, like_id)
+    """
+    quote = connection.ops.quote_name
+    like_table = quote(Like._meta.db_table)
+    target_table = quote(LIKE_MODELS[content_type]._meta.db_table)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {like_table} WHERE user_id = %s AND content_type = %s AND object_id = %s RETURNING id",
+            [user_id, content_type, object_id]
+        )
+        if cursor.fetchone():
+            change_like_count(content_type, object_id, -1)
+            invalidate_liked_ids(user_id, content_type)
+            return False, None
+
+        cursor.execute(
+            f"""
+            INSERT INTO {like_table} (user_id, content_type, object_id, created_at)
+            SELECT %s, %s, t.id, %s FROM {target_table} t WHERE t.id = %s
+            ON CONFLICT (user_id, content_type, object_id) DO NOTHING
+            RETURNING id
+            """,
+            [user_id, content_type, connection.ops.adapt_datetimefield_value(timezone.now()), object_id]
+        )
+        row = cursor.fetchone()
+        if row:
+            change_like_count(content_type, object_id, 1)
+            invalidate_liked_ids(user_id, content_type)
+            return True, row[0]
+
+    # qator qo‘shilmadi: yoki obyekt yo‘q, yoki parallel so‘rov xuddi shu like ni qo‘shib ulgurdi
+    like_id = Like.objects.filter(
+        user_id=user_id, content_type=content_type, object_id=object_id
+    ).values_list('id', flat=True).first()
+    if like_id is None:
+        raise LikeTargetNotFound
+    return True, like_id
+
+
+def recount_like_counts():
+    """like_count larni Like jadvalidan qayta hisoblash (bulk_create bilan yozilgan like lardan keyin)"""
+    for content_type, model in LIKE_MODELS.items():
+        counts = (
+            Like.objects.filter(content_type=content_type, object_id=OuterRef('pk'))
+            .values('object_id').annotate(total=Count('*')).values('total')
+        )
+        model.objects.update(like_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0))
+
+
+def _liked_ids_key(user_id, content_type):
+    return f"likes:liked:{user_id}:{content_type}"
+
+
+def get_liked_ids(user_id, content_type):
+    """Foydalanuvchi like qo‘ygan obyektlar ID lari to‘plami (keshdan, bo‘lmasa bitta so‘rov)"""
+    key = _liked_ids_key(user_id, content_type)
+    liked = cache.get(key)
+    if liked is None:
+        liked = frozenset(
+            Like.objects.filter(user_id=user_id, content_type=content_type).values_list('object_id', flat=True)
+        )
+        cache.set(key, liked, getattr(settings, 'LIKED_IDS_CACHE_TIMEOUT', 300))
+    return liked
+
+
+async def aget_liked_ids(user_id, content_type):
+    """get_liked_ids ning async varianti (main.async_views uchun)"""
+    key = _liked_ids_key(user_id, content_type)
+    liked = await cache.aget(key)
+    if liked is None:
+        liked = frozenset([
+            object_id async for object_id in
+            Like.objects.filter(user_id=user_id, content_type=content_type).values_list('object_id', flat=True)
+        ])
+        await cache.aset(key, liked, getattr(settings, 'LIKED_IDS_CACHE_TIMEOUT', 300))
+    return liked
+
+
+def invalidate_liked_ids(user_id, content_type):
+    # tranzaksiya tugagandan keyin: aks holda boshqa so‘rov eski holatni keshga qaytarib yozishi mumkin
+    transaction.on_commit(lambda: cache.delete(_liked_ids_key(user_id, content_type)))
+
+
+def like_statuses(user_id, content_type, object_ids):
+    """{object_id: {'is_liked', 'total_likes'}}: bitta kesh o‘qish va bitta so‘rov"""
+    liked = get_liked_ids(user_id, content_type)
+    counts = dict(LIKE_MODELS[content_type].objects.filter(pk__in=object_ids).values_list('pk', 'like_count'))
+    return {
+        object_id: {'is_liked': object_id in liked, 'total_likes': counts.get(object_id, 0)}
+        for object_id in object_ids
+    }
+
+
+async def alike_statuses(user_id, content_type, object_ids):
+    liked = await aget_liked_ids(user_id, content_type)
+    counts = {
+        pk: like_count async for pk, like_count in
+        LIKE_MODELS[content_type].objects.filter(pk__in=object_ids).values_list('pk', 'like_count')
+    }
+    return {
+        object_id: {'is_liked': object_id in liked, 'total_likes': counts.get(object_id, 0)}
+        for object_id in object_ids
+    }
@@ -0,0 +1,176 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import types
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+import core.urls
+from main.async_views import async_urlpatterns
+from main.auth import ClaimsRefreshToken
+from main.models import Dormitory
+from main.synthetic import SyntheticDataGenerator
+
+# (route, rol, query): rol=None - anonim so‘rov
+ENDPOINTS = [
+    ('notifications/unread-count/', 'student', lambda ids: ''),
+    ('likes/status/', 'student', lambda ids: f"content_type=dormitory&object_id={ids['dormitory']}"),
+    ('check-username/', 'student', lambda ids: f"username={ids['username']}"),
+    ('statistics/', None, lambda ids: ''),
+    ('dormitories/', None, lambda ids: ''),
+]
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def _urlconf(name, patterns):
+    # ROOT_URLCONF sifatida modul obyekti ham qabul qilinadi (URLResolver.urlconf_module)
+    module = types.ModuleType(name)
+    module.urlpatterns = patterns
+    return module
+
+
+async def asgi_get(app, path, query, headers):
+    """ASGI ilovasiga bitta GET: tarmoqsiz, lekin to‘liq middleware va handler zanjiri orqali"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': headers, 'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    body_sent = False
+    response = {}
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # mijoz uzilmaydi: javob tugagach Django bu kutishni bekor qiladi
+        await asyncio.Future()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+
+    await app(scope, receive, send)
+    return response.get('status')
+
+
+class Command(BaseCommand):
+    help = (
+        "main.async_views dagi async endpointlarni sync DRF variantlari bilan ASGI handler orqali yuqori "
+        "parallellikda solishtiradi: sekundiga so‘rovlar, p50 va p99. Test bazasida ishlaydi; real "
+        "ASGI sozlamalari uchun DJANGO_ASGI=1 bilan ishga tushiring."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 100],
+                            help="Bir vaqtdagi so‘rovlar soni (masalan: 10 100 500)")
+        parser.add_argument('--requests', type=int, default=1000, help="Har bir o‘lchov uchun so‘rovlar soni")
+        parser.add_argument('--dormitories', type=int, default=5)
+        parser.add_argument('--students', type=int, default=100, help="Har bir yotoqxonadagi talabalar soni")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--only', nargs='*', default=None, help="Faqat shu route lar (masalan: statistics/)")
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp(prefix='async-bench-')
+        if connection.vendor == 'sqlite':
+            # in-memory test bazasi o‘rniga fayl: har bir thread o‘z ulanishi bilan bir xil ma'lumotni ko‘radi
+            connections.settings['default'].setdefault('TEST', {})['NAME'] = os.path.join(workdir, 'bench.sqlite3')
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            ids = self.prepare(options)
+            self.run(ids, options)
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def prepare(self, options):
+        self.stdout.write("Sintetik ma'lumotlar yaratilmoqda...")
+        users = SyntheticDataGenerator(
+            students_per_dormitory=options['students'], months=1, seed=options['seed'],
+        ).generate(dormitories=options['dormitories'])
+        student = users['student']
+        ids = {
+            'dormitory': Dormitory.objects.values_list('id', flat=True).first(),
+            'username': student.username,
+            'token': str(ClaimsRefreshToken.for_user(student).access_token),
+        }
+        connections.close_all()
+        return ids
+
+    def run(self, ids, options):
+        base = [pattern for pattern in core.urls.urlpatterns if pattern not in async_urlpatterns]
+        modes = {
+            'sync': _urlconf('benchmark_sync_urls', base),
+            'async': _urlconf('benchmark_async_urls', async_urlpatterns + base),
+        }
+        app = ASGIHandler()
+
+        self.stdout.write(
+            f"DB: {connection.vendor}, CONN_MAX_AGE={connection.settings_dict['CONN_MAX_AGE']}, "
+            f"{options['requests']} so‘rov har bir o‘lchovda"
+        )
+        self.stdout.write(f"{'endpoint':<30} {'parallel':>8} {'rejim':>6} {'so‘rov/s':>10} {'p50':>9} {'p99':>9}")
+        for route, role, query in ENDPOINTS:
+            if options['only'] and route not in options['only']:
+                continue
+            headers = [(b'authorization', f"Bearer {ids['token']}".encode())] if role else []
+            for concurrency in options['concurrency']:
+                results = {}
+                for mode, urlconf in modes.items():
+                    with override_settings(ROOT_URLCONF=urlconf):
+                        results[mode] = asyncio.run(
+                            self.load(app, '/' + route, query(ids), headers, concurrency, options['requests'])
+                        )
+                    result = results[mode]
+                    self.stdout.write(
+                        f"{route:<30} {concurrency:>8} {mode:>6} {result['rps']:>10.1f} "
+                        f"{result['p50_ms']:>7.1f}ms {result['p99_ms']:>7.1f}ms"
+                    )
+                speedup = results['async']['rps'] / results['sync']['rps']
+                self.stdout.write(self.style.SUCCESS(f"{'':<30} {'':>8} {'async/sync':>17} {speedup:>6.2f}x"))
+
+    async def load(self, app, path, query, headers, concurrency, total):
+        # isitish: ulanishlar, URL resolver va serializer keshlari o‘lchovga kirmasin
+        for _ in range(3):
+            await asgi_get(app, path, query, headers)
+
+        latencies, failures = [], []
+        remaining = total
+
+        async def client():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                status = await asgi_get(app, path, query, headers)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if status != 200:
+                    failures.append(status)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        if failures:
+            raise CommandError(f"{path}: {len(failures)} ta so‘rov muvaffaqiyatsiz (status {failures[0]})")
+        return {
+            'rps': len(latencies) / elapsed,
+            'p50_ms': _percentile(latencies, 50),
+            'p99_ms': _percentile(latencies, 99),
+        }
@@ -0,0 +1,98 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import (
+    CaptureQueriesContext, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from main.auth import ClaimsJWTAuthentication, ClaimsRefreshToken
+from main.permissions import IsDormitoryAdmin, IsFloorLeader
+from main.synthetic import SyntheticDataGenerator
+
+# (rol, ruxsat): autentifikatsiya + view ning ruxsat tekshiruvi
+CASES = [
+    ('student', IsAuthenticated),
+    ('admin', IsDormitoryAdmin),
+    ('leader', IsFloorLeader),
+]
+
+MODES = {
+    # (autentifikatsiya klassi, token klassi)
+    'db': (JWTAuthentication, RefreshToken),
+    'claims': (ClaimsJWTAuthentication, ClaimsRefreshToken),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "So‘rov autentifikatsiyasi narxi: odatdagi JWTAuthentication (har so‘rovda User SELECT) va "
+        "main.auth.ClaimsJWTAuthentication (imzolangan claim lar) - bitta so‘rov uchun mikrosekund va SQL "
+        "so‘rovlar soni, ruxsat tekshiruvi bilan. Oxirida bekor qilingan claim lar bazaga qaytishi tekshiriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            users = SyntheticDataGenerator(students_per_dormitory=10, months=1, seed=options['seed']).generate()
+            self.run(users, options['iterations'])
+            self.check_revocation(users['admin'])
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def request(self, token):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f"Bearer {token}")
+        return APIView().initialize_request(request)
+
+    def authorize(self, authentication, permission, http_request):
+        user, _ = authentication.authenticate(http_request)
+        http_request.user = user
+        if not permission().has_permission(http_request, None):
+            raise CommandError(f"{permission.__name__}: ruxsat berilmadi ({user.pk})")
+        return user
+
+    def run(self, users, iterations):
+        self.stdout.write(f"{'rol':<10} {'rejim':<8} {'us/so‘rov':>10} {'SQL/so‘rov':>11}")
+        for role, permission in CASES:
+            timings = {}
+            for mode, (authentication_class, token_class) in MODES.items():
+                authentication = authentication_class()
+                http_request = self.request(token_class.for_user(users[role]).access_token)
+                self.authorize(authentication, permission, http_request)
+
+                # queries_log deque i to‘lib qolsa CaptureQueriesContext noto‘g‘ri son ko‘rsatadi
+                connection.queries_log.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    self.authorize(authentication, permission, http_request)
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    self.authorize(authentication, permission, http_request)
+                timings[mode] = (time.perf_counter() - started) / iterations * 1e6
+                self.stdout.write(f"{role:<10} {mode:<8} {timings[mode]:>10.1f} {len(queries):>11}")
+            self.stdout.write(self.style.SUCCESS(f"{'':<10} {'':<8} {timings['db'] / timings['claims']:>9.1f}x"))
+
+    def check_revocation(self, admin):
+        authentication = ClaimsJWTAuthentication()
+        http_request = self.request(ClaimsRefreshToken.for_user(admin).access_token)
+
+        admin.role = 'student'
+        # main.signals claim larni bekor qiladi
+        admin.save()
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as queries:
+            user, _ = authentication.authenticate(http_request)
+        if len(queries) != 1 or user.role != 'student':
+            raise CommandError("Bekor qilingan claim lar bazadan qayta o‘qilmadi")
+        self.stdout.write(self.style.SUCCESS("Rol o‘zgargandan keyin token bazadagi foydalanuvchi bilan o‘tdi"))
@@ -0,0 +1,529 @@
+import json
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from main.models import (
+    Amenity, Apartment, ApartmentImage, Application, ApplicationNotification, AttendanceSession, ChunkedUpload,
+    Collection, Dormitory, DormitoryImage, DutySchedule, Floor, FloorLeader, Payment, Province, Room, Rule, Student, Task,
+    TaskForLeader, University, User, UserNotification,
+)
+from main.profiling import find_n_plus_one, fingerprint
+from main.synthetic import DEFAULT_PASSWORD, SyntheticDataGenerator
+
+
+class Endpoint:
+    """Bitta URL pattern uchun so‘rov: qaysi rol, qaysi method, qanday ma'lumot bilan"""
+
+    def __init__(self, route, method='GET', role=None, kwargs=None, data=None, query='', format='json', path=None):
+        self.route = route
+        self.path = path
+        self.method = method
+        self.role = role
+        self.kwargs = kwargs
+        self.data = data
+        self.query = query
+        self.format = format
+
+    @property
+    def key(self):
+        return f"{self.method} {self.route}"
+
+    def url(self, ids):
+        path = self.path or self.route
+        for name, value in (self.kwargs(ids) if self.kwargs else {}).items():
+            path = re.sub(rf"<(?:\w+:)?{name}>", str(value), path)
+        query = self.query(ids) if callable(self.query) else self.query
+        return '/' + path + (f"?{query}" if query else '')
+
+
+ENDPOINTS = [
+    Endpoint('', role=None, query='format=openapi'),
+    Endpoint(r'^swagger\.(?P<fmt>json|yaml)$', path='swagger.yaml'),
+    Endpoint('admin/', role='superuser'),
+    Endpoint('health/live/'),
+    Endpoint('health/ready/'),
+    Endpoint('register/', 'POST', data=lambda ids: {
+        'username': 'bench_new_student', 'email': 'bench_new_student@example.com', 'phone': '+998900000000',
+        'password': 'bench-pass-123', 'password2': 'bench-pass-123', 'first_name': 'A', 'last_name': 'B'}),
+    Endpoint('change-password/', 'POST', 'student',
+             data={'old_password': DEFAULT_PASSWORD, 'new_password': 'bench-pass-456'}),
+    Endpoint('profile/', role='student'),
+
+    Endpoint('notifications/my/', role='student'),
+    Endpoint('notifications/<int:pk>/', role='student', kwargs=lambda ids: {'pk': ids['user_notification']}),
+    Endpoint('notifications/mark-read/', 'POST', 'student',
+             data=lambda ids: {'notification_id': ids['notification']}),
+    Endpoint('notifications/mark-all-read/', 'POST', 'student'),
+    Endpoint('notifications/unread-count/', role='student'),
+
+    Endpoint('users/', role='superuser'),
+    Endpoint('user/create/', 'POST', 'superuser',
+             data={'username': 'bench_user', 'password': 'bench-pass-123', 'role': 'ijarachi',
+                   'email': 'bench_user@example.com'}),
+    Endpoint('users/<int:pk>/', role='superuser', kwargs=lambda ids: {'pk': ids['student_user']}),
+
+    Endpoint('universities/'),
+    Endpoint('university/create/', 'POST', 'superuser', data={'name': 'Bench', 'address': 'Bench'}),
+    Endpoint('universities/<int:pk>/', role='superuser', kwargs=lambda ids: {'pk': ids['university']}),
+
+    Endpoint('dormitories/'),
+    Endpoint('my-dormitory/', role='admin'),
+    Endpoint('my-dormitory-update/', 'PATCH', 'admin', data={'description': 'Yangilandi'}),
+    Endpoint('dormitory/create/', 'POST', 'superuser', data=lambda ids: {
+        'name': 'Bench', 'address': 'Bench', 'university': ids['university'], 'admin': ids['admin_user'],
+        'amenities': [ids['amenity']]}),
+    Endpoint('dormitories/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['dormitory']}),
+
+    Endpoint('floors/', role='admin'),
+    Endpoint('available-floors/', role='admin'),
+    Endpoint('floor/create/', 'POST', 'admin', data={'name': 'Bench qavat', 'gender': 'male'}),
+    Endpoint('floors/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['floor']}),
+
+    Endpoint('rooms/', role='admin'),
+    Endpoint('every-available-rooms/', role='admin'),
+    Endpoint('available-rooms/', role='admin'),
+    Endpoint('room/create/', 'POST', 'admin', data=lambda ids: {'name': 'B01', 'floor': ids['floor'], 'capacity': 4}),
+    Endpoint('rooms/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['room']}),
+
+    Endpoint('students/', role='admin'),
+    Endpoint('export-student/', role='admin'),
+    Endpoint('student/create/', 'POST', 'admin', format='multipart',
+             data=lambda ids: {'application_id': ids['pending_application']}),
+    Endpoint('students/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['student']}),
+
+    Endpoint('applications/', role='admin'),
+    Endpoint('application/create/', 'POST', 'student', format='multipart', data=lambda ids: {
+        'dormitory': ids['dormitory'], 'name': 'Bench', 'province': ids['province'], 'district': ids['district']}),
+    Endpoint('applications/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['application']}),
+
+    Endpoint('payments/', role='admin'),
+    Endpoint('export-payment/', role='admin'),
+    Endpoint('payment/create/', 'POST', 'admin', data=lambda ids: {
+        'student': ids['student'], 'amount': 500000, 'method': 'Cash', 'status': 'APPROVED',
+        'valid_until': '2030-01-01'}),
+    Endpoint('payments/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['payment']}),
+
+    Endpoint('provinces/'),
+    Endpoint('districts/', query=lambda ids: f"province={ids['province']}"),
+    Endpoint('dashboard/', role='admin'),
+
+    Endpoint('dormitory_images/', role='admin'),
+    Endpoint('dormitory_image_create', 'POST', 'admin', format='multipart', data={}),
+    Endpoint('dormitory_images/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['dormitory_image']}),
+
+    Endpoint('monthly_revenue/', role='admin'),
+    Endpoint('room_status_stats/', role='admin'),
+
+    Endpoint('tasks/', role='admin'),
+    Endpoint('tasks/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['task']}),
+    Endpoint('recent_activity/', role='admin'),
+
+    Endpoint('register/tenant/', 'POST', data={
+        'username': 'bench_tenant', 'email': 'bench_tenant@example.com', 'phone': '+998900000001',
+        'password': 'bench-pass-123', 'password2': 'bench-pass-123'}),
+
+    Endpoint('apartments/'),
+    Endpoint('my_apartments/', role='ijarachi'),
+    Endpoint('apartments/<int:pk>/', kwargs=lambda ids: {'pk': ids['apartment']}),
+    Endpoint('apartments/create/', 'POST', 'superuser', data=lambda ids: {
+        'title': 'Bench', 'province': ids['province'], 'amenities': [ids['amenity']]}),
+    Endpoint('apartments/<int:pk>/update/', 'PATCH', 'ijarachi', kwargs=lambda ids: {'pk': ids['apartment']},
+             data={'description': 'Yangilandi'}),
+
+    Endpoint('amenities/', role='student'),
+    Endpoint('amenities/<int:pk>/update/', 'PATCH', 'superuser', kwargs=lambda ids: {'pk': ids['amenity']},
+             data={'is_active': True}),
+
+    Endpoint('rules/', role='admin'),
+    Endpoint('rules/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['rule']}),
+
+    Endpoint('statistics/'),
+
+    Endpoint('application_notifications/<int:pk>/', role='admin',
+             kwargs=lambda ids: {'pk': ids['application_notification']}),
+    Endpoint('application_notifications/mark-read/', 'POST', 'admin',
+             data=lambda ids: {'notification_id': ids['application_notification']}),
+
+    Endpoint('likes/toggle/', 'POST', 'student',
+             data=lambda ids: {'content_type': 'dormitory', 'object_id': ids['dormitory']}),
+    Endpoint('likes/status/', role='student',
+             query=lambda ids: f"content_type=dormitory&object_id={ids['dormitory']}"),
+    Endpoint('likes/status/batch/', role='student',
+             query=lambda ids: f"content_type=dormitory&object_ids={','.join(map(str, ids['dormitories']))}"),
+    Endpoint('likes/my/', role='student'),
+
+    Endpoint('apartment_images/', role='ijarachi'),
+    Endpoint('apartment_images/<int:pk>/', role='ijarachi', kwargs=lambda ids: {'pk': ids['apartment_image']}),
+
+    Endpoint('leaders/', role='admin'),
+    Endpoint('leaders/<int:pk>/', role='admin', kwargs=lambda ids: {'pk': ids['floor_leader']}),
+
+    Endpoint('collections/', role='leader'),
+    Endpoint('collections/create/', 'POST', 'leader', data={'title': 'Bench yig‘im', 'amount': 10000}),
+    Endpoint('collections/<int:pk>/', role='leader', kwargs=lambda ids: {'pk': ids['collection']}),
+    Endpoint('collection-records/<int:collection_id>/bulk-update/', 'PATCH', 'leader',
+             kwargs=lambda ids: {'collection_id': ids['collection']},
+             data=lambda ids: {'records': ids['collection_records']}),
+
+    Endpoint('attendance-sessions/', role='leader'),
+    Endpoint('attendance-sessions/create/', 'POST', 'leader', data={}),
+    Endpoint('attendance-sessions/<int:pk>/', role='leader', kwargs=lambda ids: {'pk': ids['session']}),
+    Endpoint('attendance-records/<int:session_id>/bulk-update/', 'PATCH', 'leader',
+             kwargs=lambda ids: {'session_id': ids['session']},
+             data=lambda ids: {'records': ids['attendance_records']}),
+    Endpoint('attendance-analytics/', role='leader'),
+
+    Endpoint('statistic-for-leader/', role='leader'),
+
+    Endpoint('tasks-for-leaders/', role='leader'),
+    Endpoint('tasks-for-leaders/create/', 'POST', 'leader', data={'description': 'Bench', 'status': 'PENDING'}),
+    Endpoint('tasks-for-leaders/<int:pk>/', role='leader', kwargs=lambda ids: {'pk': ids['task_for_leader']}),
+
+    Endpoint('student-me/', role='student'),
+
+    Endpoint('duty_schedules/', role='leader'),
+    Endpoint('duty_schedules/create/', 'POST', 'leader',
+             data=lambda ids: {'room': ids['leader_room'], 'date': '2030-01-01'}),
+    Endpoint('duty_schedules/<int:pk>/', role='leader', kwargs=lambda ids: {'pk': ids['duty_schedule']}),
+    Endpoint('check-username/', role='student', query='username=bench_free_username'),
+
+    Endpoint('uploads/', 'POST', 'student', data={'filename': 'bench.pdf', 'size': 1024}),
+    Endpoint('uploads/<uuid:token>/', role='student', kwargs=lambda ids: {'token': ids['chunked_upload']}),
+    Endpoint('uploads/<uuid:token>/complete/', 'POST', 'student', kwargs=lambda ids: {'token': ids['chunked_upload']},
+             data={}),
+
+    Endpoint('token/', 'POST', data=lambda ids: {'username': ids['student_username'], 'password': DEFAULT_PASSWORD}),
+    Endpoint('token/refresh/', 'POST', data=lambda ids: {'refresh': ids['refresh_token']}),
+    Endpoint('^media/(?P<path>.*)$', path='media/dormitory_images/fon.jpg'),
+]
+
+
+# benchmarkning o‘zi ochadigan tranzaksiya buyruqlari hisobga olinmaydi
+TRANSACTION_SQL = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+class CaptureAllQueries:
+    """Barcha DB alias lardagi so‘rovlar (read-replica sozlangan bo‘lsa o‘qishlar 'replica' da bajariladi)"""
+
+    def __enter__(self):
+        self.contexts = []
+        for alias in connections:
+            # queries_log deque i to‘lib qolsa CaptureQueriesContext 0 ko‘rsatadi
+            connections[alias].queries_log.clear()
+            context = CaptureQueriesContext(connections[alias])
+            context.__enter__()
+            self.contexts.append(context)
+        return self
+
+    def __exit__(self, *exc_info):
+        for context in reversed(self.contexts):
+            context.__exit__(*exc_info)
+
+    @property
+    def captured_queries(self):
+        return [query for context in self.contexts for query in context.captured_queries]
+
+
+def _app_queries(captured_queries):
+    return [q['sql'] for q in captured_queries if not q['sql'].upper().startswith(TRANSACTION_SQL)]
+
+
+def count_queries(captured_queries):
+    return len(_app_queries(captured_queries))
+
+
+def n_plus_one(captured_queries, view=None):
+    """NPLUSONE_THRESHOLD / NPLUSONE_ALLOWLIST sozlamalari bilan takrorlanuvchi so‘rovlar"""
+    fingerprints = Counter(fingerprint(sql) for sql in _app_queries(captured_queries))
+    return [{'sql': sql, 'count': count} for sql, count in find_n_plus_one(fingerprints, view=view)]
+
+
+def _route(pattern):
+    return str(pattern.pattern)
+
+
+def url_routes():
+    """core/urls.py dagi barcha pattern lar (include lar bitta yozuv sifatida)"""
+    routes = []
+    for pattern in get_resolver().url_patterns:
+        if isinstance(pattern, (URLPattern, URLResolver)):
+            routes.append(_route(pattern))
+    return routes
+
+
+def collect_ids(users):
+    """Benchmark so‘rovlari uchun kerakli obyekt ID lari (birinchi yotoqxonadan)"""
+    admin, leader_user, student_user, ijarachi = users['admin'], users['leader'], users['student'], users['ijarachi']
+    dormitory = Dormitory.objects.get(admin=admin)
+    leader = FloorLeader.objects.get(user=leader_user)
+    student = Student.objects.get(user=student_user)
+    session = AttendanceSession.objects.filter(floor=leader.floor).order_by('-date').first()
+    collection = Collection.objects.filter(leader=leader).first()
+    user_notification = UserNotification.objects.filter(user=student_user).first()
+    apartment = Apartment.objects.filter(user=ijarachi).first()
+    province = Province.objects.first()
+
+    return {
+        'admin_user': admin.id,
+        'student_user': student_user.id,
+        'student_username': student_user.username,
+        'refresh_token': str(RefreshToken.for_user(student_user)),
+        'dormitory': dormitory.id,
+        'dormitories': list(Dormitory.objects.values_list('id', flat=True)[:50]),
+        'floor': Floor.objects.filter(dormitory=dormitory).first().id,
+        'room': Room.objects.filter(floor__dormitory=dormitory).first().id,
+        'leader_room': Room.objects.filter(floor=leader.floor).first().id,
+        'student': student.id,
+        'application': Application.objects.filter(dormitory=dormitory).first().id,
+        'pending_application': Application.objects.filter(dormitory=dormitory, status='PENDING').first().id,
+        'payment': Payment.objects.filter(dormitory=dormitory).first().id,
+        'dormitory_image': DormitoryImage.objects.filter(dormitory=dormitory).first().id,
+        'task': Task.objects.filter(user=admin).first().id,
+        'rule': Rule.objects.filter(dormitory=dormitory).first().id,
+        'floor_leader': leader.id,
+        'application_notification': ApplicationNotification.objects.filter(user=admin).first().id,
+        'university': University.objects.first().id,
+        'amenity': Amenity.objects.first().id,
+        'province': province.id,
+        'district': province.district_set.first().id,
+        'user_notification': user_notification.id,
+        'notification': user_notification.notification_id,
+        'apartment': apartment.id,
+        'apartment_image': ApartmentImage.objects.filter(apartment=apartment).first().id,
+        'collection': collection.id,
+        'collection_records': [
+            {'id': r.id, 'student_id': r.student_id, 'status': 'To‘lagan'} for r in collection.records.all()[:20]
+        ],
+        'session': session.id,
+        'attendance_records': [
+            {'id': r.id, 'student_id': r.student_id, 'status': 'out'} for r in session.records.all()[:20]
+        ],
+        'task_for_leader': TaskForLeader.objects.filter(user=leader_user).first().id,
+        'duty_schedule': DutySchedule.objects.filter(floor=leader.floor).first().id,
+        'chunked_upload': ChunkedUpload.objects.create(user=student_user, filename='bench.pdf', size=1024).pk,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Sintetik ma'lumotlar ustida barcha endpointlarning SQL so‘rovlar soni, vaqti va xotirasini o‘lchaydi. "
+        "Test bazasida ishlaydi; --baseline berilsa so‘rovlar soni oshgan endpointlar xato bilan tugaydi. "
+        "PostgreSQL da o‘lchash uchun DATABASE_URL bering (core/settings.py dagi izohga qarang)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=[1], help="Yotoqxonalar soni (masalan: 1 10 100)")
+        parser.add_argument('--students', type=int, default=500, help="Har bir yotoqxonadagi talabalar soni")
+        parser.add_argument('--months', type=int, default=12, help="To‘lovlar tarixi (oy)")
+        parser.add_argument('--repeat', type=int, default=3, help="Vaqt o‘lchash uchun takrorlar soni")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--only', nargs='*', default=None, help="Faqat shu route lar (masalan: dormitories/)")
+        parser.add_argument('--output', help="Natijalarni JSON faylga yozish")
+        parser.add_argument('--baseline', help="Solishtirish uchun oldingi JSON natija")
+        parser.add_argument('--n-plus-one', choices=['off', 'log', 'raise'], default='log',
+                            help="N+1 topilganda: log - faqat hisobotda, raise - xato bilan tugash")
+
+    def handle(self, *args, **options):
+        self.check_coverage()
+
+        setup_test_environment()
+        # setup_databases TEST MIRROR larni ham sozlaydi (read-replica test bazada primary ga qaraydi)
+        old_config = setup_databases(verbosity=0, interactive=False)
+        # uploads/ endpointi yaratadigan vaqtinchalik fayllar haqiqiy papkaga tushmasin
+        upload_dir = tempfile.TemporaryDirectory()
+        try:
+            with override_settings(CHUNKED_UPLOAD_DIR=upload_dir.name):
+                results = {}
+                for scale in options['scales']:
+                    results[str(scale)] = self.run_scale(scale, options)
+        finally:
+            upload_dir.cleanup()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'students_per_dormitory': options['students'],
+                'months': options['months'],
+                'repeat': options['repeat'],
+                'seed': options['seed'],
+                'vendor': connection.vendor,
+                'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+                'pool': bool(connection.settings_dict['OPTIONS'].get('pool')),
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            self.stdout.write(f"Natijalar: {options['output']}")
+
+        if options['baseline']:
+            self.compare(report, options['baseline'])
+
+        if options['n_plus_one'] == 'raise':
+            found = [
+                f"[{scale}] {key}: {item['count']}x {item['sql'][:200]}"
+                for scale, endpoints in results.items()
+                for key, result in endpoints.items()
+                for item in result.get('n_plus_one', [])
+            ]
+            if found:
+                raise CommandError("N+1 so‘rovlar topildi (NPLUSONE_ALLOWLIST ga qo‘shing yoki tuzating):\n"
+                                   + '\n'.join(found))
+
+    def check_coverage(self):
+        covered = {endpoint.route for endpoint in ENDPOINTS}
+        missing = [route for route in url_routes() if route not in covered]
+        if missing:
+            raise CommandError(
+                "Benchmark ro‘yxatida yo‘q URL pattern lar (ENDPOINTS ga qo‘shing): " + ', '.join(missing)
+            )
+
+    def run_scale(self, scale, options):
+        call_command('flush', interactive=False, verbosity=0)
+        # oldingi o‘lchovdagi like keshi, token claim lari va /token/ throttle hisoblagichlari qolmasin
+        cache.clear()
+        self.stdout.write(f"\n== {scale} ta yotoqxona x {options['students']} talaba x {options['months']} oy ==")
+
+        started = time.perf_counter()
+        generator = SyntheticDataGenerator(
+            students_per_dormitory=options['students'], months=options['months'], seed=options['seed']
+        )
+        users = generator.generate(dormitories=scale)
+        self.stdout.write(f"Ma'lumotlar {time.perf_counter() - started:.1f}s da yaratildi")
+        ids = collect_ids(users)
+
+        routes = set(url_routes())
+        results = {}
+        for endpoint in ENDPOINTS:
+            if endpoint.route not in routes:
+                continue
+            if options['only'] and endpoint.route not in options['only']:
+                continue
+            result = self.measure(endpoint, users, ids, options['repeat'], options['n_plus_one'] != 'off')
+            results[endpoint.key] = result
+            self.stdout.write(
+                f"{endpoint.key:<60} {result['status']:>4} {result['queries']:>5}q "
+                f"{result['time_ms']:>9.1f}ms {result['peak_memory_kb']:>9.1f}KB"
+            )
+            for item in result.get('n_plus_one', []):
+                self.stdout.write(self.style.WARNING(f"    N+1 {item['count']}x {item['sql'][:150]}"))
+        return results
+
+    def _client(self, endpoint, users):
+        """
+        So‘rovdan oldin (o‘lchovdan tashqarida) tayyorlanadi. Foydalanuvchi bazadan qayta olinadi:
+        masalan change-password xotiradagi obyektni o‘zgartiradi, rollback esa faqat bazani tiklaydi.
+        """
+        client = APIClient()
+        if endpoint.role:
+            user = User.objects.get(pk=users[endpoint.role].pk)
+            if endpoint.route == 'admin/':
+                client.force_login(user)
+            else:
+                client.force_authenticate(user)
+        return client
+
+    def _request(self, client, endpoint, ids):
+        data = endpoint.data(ids) if callable(endpoint.data) else endpoint.data
+        method = getattr(client, endpoint.method.lower())
+        kwargs = {'format': endpoint.format} if data is not None else {}
+
+        # yozuvchi so‘rovlar bazani o‘zgartirmasligi uchun har biri rollback qilinadi
+        with transaction.atomic():
+            response = method(endpoint.url(ids), data, **kwargs) if data is not None else method(endpoint.url(ids))
+            if getattr(response, 'streaming', False):
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            transaction.set_rollback(True)
+        return response, size
+
+    def measure(self, endpoint, users, ids, repeat, detect_n_plus_one=True):
+        client = self._client(endpoint, users)
+        tracemalloc.start()
+        with CaptureAllQueries() as cold:
+            response, size = self._request(client, endpoint, ids)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings = []
+        for _ in range(repeat):
+            client = self._client(endpoint, users)
+            started = time.perf_counter()
+            self._request(client, endpoint, ids)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        client = self._client(endpoint, users)
+        with CaptureAllQueries() as warm:
+            self._request(client, endpoint, ids)
+
+        result = {
+            'status': response.status_code,
+            'queries': count_queries(cold.captured_queries),
+            'warm_queries': count_queries(warm.captured_queries),
+            'time_ms': round(statistics.median(timings), 2) if timings else None,
+            'peak_memory_kb': round(peak / 1024, 1),
+            'response_bytes': size,
+        }
+        if detect_n_plus_one:
+            match = getattr(response, 'resolver_match', None)
+            result['n_plus_one'] = n_plus_one(warm.captured_queries, view=match.view_name if match else None)
+        return result
+
+    def compare(self, report, baseline_path):
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        regressions = []
+        for scale, endpoints in report['results'].items():
+            for key, result in endpoints.items():
+                base = baseline.get('results', {}).get(scale, {}).get(key)
+                if not base:
+                    continue
+                for field in ('queries', 'warm_queries'):
+                    if result[field] > base.get(field, result[field]):
+                        regressions.append(f"[{scale}] {key}: {field} {base[field]} -> {result[field]}")
+
+                # baseline da bo‘lmagan yangi N+1 fingerprint
+                known = {item['sql'] for item in base.get('n_plus_one', [])}
+                for item in result.get('n_plus_one', []):
+                    if 'n_plus_one' in base and item['sql'] not in known:
+                        regressions.append(f"[{scale}] {key}: yangi N+1 {item['count']}x {item['sql'][:200]}")
+
+        # vaqt bo‘yicha umumiy taqqoslash (masalan SQLite baseline va PostgreSQL natijasi)
+        base_vendor = baseline.get('meta', {}).get('vendor')
+        for scale, endpoints in report['results'].items():
+            pairs = [
+                (base['time_ms'], result['time_ms'])
+                for key, result in endpoints.items()
+                if (base := baseline.get('results', {}).get(scale, {}).get(key))
+                and base.get('time_ms') and result.get('time_ms')
+            ]
+            if pairs:
+                before, after = sum(b for b, _ in pairs), sum(a for _, a in pairs)
+                self.stdout.write(
+                    f"[{scale}] {len(pairs)} ta endpoint vaqti: {before:.1f}ms ({base_vendor}) -> "
+                    f"{after:.1f}ms ({report['meta']['vendor']}), {before / after:.2f}x"
+                )
+
+        if regressions:
+            raise CommandError("So‘rovlar soni oshdi:\n" + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS("Baseline bilan solishtirildi: regressiya yo‘q"))
@@ -0,0 +1,112 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import (
+    CaptureQueriesContext, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from main.models import User
+from main.serializers import CustomTokenObtainPairSerializer
+from main.synthetic import DEFAULT_PASSWORD, SyntheticDataGenerator
+from main.throttles import LoginAccountRateThrottle
+
+
+class LegacyTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Oldingi login: username, keyin email so‘rovi, check_password va super().validate() (ikkinchi hash)"""
+
+    def validate(self, attrs):
+        username_or_email = attrs.get('username')
+        password = attrs.get('password')
+
+        user = User.objects.filter(username=username_or_email).first()
+        if user is None:
+            user = User.objects.filter(email=username_or_email).first()
+        if user is None or not user.check_password(password):
+            raise serializers.ValidationError('Login yoki parol noto‘g‘ri!')
+
+        data = super().validate({'username': user.username, 'password': password})
+        data['role'] = user.role
+        return data
+
+
+SERIALIZERS = {
+    'oldingi': LegacyTokenObtainPairSerializer,
+    'yangi': CustomTokenObtainPairSerializer,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "/token/ login narxi: oldingi va yangi CustomTokenObtainPairSerializer - bitta login uchun CPU vaqti "
+        "(parol hash lash shu yerda) va SQL so‘rovlar soni. Oxirida IP/akkaunt throttle i tekshiriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            users = SyntheticDataGenerator(students_per_dormitory=10, months=1, seed=options['seed']).generate()
+            student = users['student']
+            if not student.email:
+                student.email = f"{student.username}@example.com"
+                student.save(update_fields=['email'])
+            cases = [
+                ('username', student.username, DEFAULT_PASSWORD),
+                ('email', student.email, DEFAULT_PASSWORD),
+                ('noto‘g‘ri parol', student.username, 'wrong-password'),
+                ('noma‘lum login', 'no-such-user', DEFAULT_PASSWORD),
+            ]
+            self.run(cases, options['iterations'])
+            self.check_throttle(student.username)
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def login(self, serializer_class, username, password):
+        serializer = serializer_class(data={'username': username, 'password': password})
+        return serializer.is_valid()
+
+    def run(self, cases, iterations):
+        self.stdout.write(f"{'holat':<16} {'rejim':<8} {'CPU ms':>8} {'SQL':>5}")
+        for name, username, password in cases:
+            timings = {}
+            for mode, serializer_class in SERIALIZERS.items():
+                self.login(serializer_class, username, password)
+                connection.queries_log.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    self.login(serializer_class, username, password)
+                started = time.process_time()
+                for _ in range(iterations):
+                    self.login(serializer_class, username, password)
+                timings[mode] = (time.process_time() - started) / iterations * 1000
+                self.stdout.write(f"{name:<16} {mode:<8} {timings[mode]:>8.1f} {len(queries):>5}")
+            self.stdout.write(self.style.SUCCESS(
+                f"{'':<16} {'':<8} {timings['yangi'] / timings['oldingi'] * 100:>7.0f}%"
+            ))
+        self.stdout.write("(parol hash lash CPU ning deyarli hammasi: to‘g‘ri login da hash 2 martadan 1 martaga tushdi)")
+
+    def check_throttle(self, username):
+        cache.clear()
+        limit, _ = LoginAccountRateThrottle().parse_rate(LoginAccountRateThrottle().get_rate())
+        if limit is None:
+            self.stdout.write(self.style.WARNING("LOGIN_ACCOUNT_THROTTLE_RATE o‘chirilgan, throttle tekshirilmadi"))
+            return
+        statuses = []
+        for index in range(limit + 1):
+            # har safar boshqa IP: faqat akkaunt cheklovi ishlashi kerak
+            client = APIClient(REMOTE_ADDR=f"10.0.0.{index + 1}")
+            response = client.post('/token/', {'username': username, 'password': 'wrong-password'}, format='json')
+            statuses.append(response.status_code)
+        if statuses[-1] != 429 or 429 in statuses[:-1]:
+            raise CommandError(f"Akkaunt throttle i kutilganidek ishlamadi: {statuses}")
+        self.stdout.write(self.style.SUCCESS(f"{limit} ta urinishdan keyin akkaunt bloklandi (429)"))
@@ -0,0 +1,271 @@
+import http.client
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from main.auth import ClaimsRefreshToken
+from main.synthetic import DEFAULT_PASSWORD, SyntheticDataGenerator
+
+# nomi -> (buyruq, qo‘shimcha muhit o‘zgaruvchilari); {port} va {workers} ishga tushirishda qo‘yiladi
+SERVERS = {
+    'daphne': (['daphne', 'core.asgi:application', '--bind', '127.0.0.1', '--port', '{port}'], {}),
+    'gunicorn': (['gunicorn', '-c', 'gunicorn.conf.py', '--bind', '127.0.0.1:{port}', '--workers', '{workers}'],
+                 {'GUNICORN_INTERFACE': 'asgi'}),
+    'gunicorn-wsgi': (['gunicorn', '-c', 'gunicorn.conf.py', '--bind', '127.0.0.1:{port}', '--workers', '{workers}'],
+                      {'GUNICORN_INTERFACE': 'wsgi'}),
+}
+
+# (nomi, og‘irligi, method, yo‘l, tana, admin tokeni kerakmi). /token/ va eksport CPU ni band qiladi:
+# bitta jarayonda ular yengil so‘rovlarning p99 ini ham ko‘taradi.
+MIX = [
+    ('statistics', 50, 'GET', '/statistics/', None, False),
+    ('dormitories', 25, 'GET', '/dormitories/', None, False),
+    ('token', 15, 'POST', '/token/', 'login', False),
+    ('export-student', 10, 'GET', '/export-student/', None, True),
+]
+HEAVY = {'token', 'export-student'}
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Bitta daphne jarayoni va gunicorn (uvicorn/gthread worker lar) ni bir xil aralash yuklama ostida "
+        "solishtiradi: sekundiga so‘rovlar, har bir endpoint uchun p50/p99. Serverlar vaqtinchalik SQLite "
+        "bazasi bilan alohida jarayon sifatida ishga tushiriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', nargs='+', choices=list(SERVERS), default=['daphne', 'gunicorn'])
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help="gunicorn worker lari soni")
+        parser.add_argument('--concurrency', type=int, default=32, help="Parallel mijozlar (thread) soni")
+        parser.add_argument('--duration', type=float, default=15, help="Har bir server uchun sekund")
+        parser.add_argument('--dormitories', type=int, default=2)
+        parser.add_argument('--students', type=int, default=200)
+        parser.add_argument('--light-only', action='store_true', help="/token/ va eksportsiz")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        missing = [name for name in options['servers'] if shutil.which(SERVERS[name][0][0]) is None]
+        if missing:
+            raise CommandError(
+                f"O‘rnatilmagan: {', '.join(missing)} (pip install -r requirements.txt)"
+            )
+
+        workdir = tempfile.mkdtemp(prefix='server-bench-')
+        db_settings = connections.settings['default']
+        original = {'ENGINE': db_settings['ENGINE'], 'NAME': db_settings['NAME'], 'OPTIONS': db_settings['OPTIONS']}
+        try:
+            database = os.path.join(workdir, 'bench.sqlite3')
+            credentials = self.prepare(db_settings, database, options)
+            mix = [item for item in MIX if not (options['light_only'] and item[0] in HEAVY)]
+
+            summary = {}
+            for name in options['servers']:
+                self.stdout.write(f"\n== {name} ==")
+                with self.server(name, database, options) as port:
+                    summary[name] = self.load(port, mix, credentials, options)
+                self.report(summary[name])
+
+            self.stdout.write(f"\n{'server':<16} {'so‘rov/s':>10} {'p99':>10} {'xato':>6}")
+            for name, result in summary.items():
+                self.stdout.write(f"{name:<16} {result['rps']:>10.1f} {result['p99_ms']:>8.1f}ms {result['errors']:>6}")
+        finally:
+            connections.close_all()
+            db_settings.update(original)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def prepare(self, db_settings, database, options):
+        self.stdout.write("Baza tayyorlanmoqda (migrate + sintetik ma'lumotlar)...")
+        connections.close_all()
+        db_settings.update({'ENGINE': 'django.db.backends.sqlite3', 'NAME': database, 'OPTIONS': {}})
+        call_command('migrate', verbosity=0)
+        users = SyntheticDataGenerator(
+            students_per_dormitory=options['students'], months=1, seed=options['seed'],
+        ).generate(dormitories=options['dormitories'])
+        connections.close_all()
+        return {
+            'login': {'username': users['student'].username, 'password': DEFAULT_PASSWORD},
+            'admin_token': str(ClaimsRefreshToken.for_user(users['admin']).access_token),
+        }
+
+    def server(self, name, database, options):
+        command, extra_env = SERVERS[name]
+        port = _free_port()
+        argv = [part.format(port=port, workers=options['workers']) for part in command]
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),
+            'DATABASE_URL': f"sqlite:///{database}",
+            'DEBUG': 'False',
+            'REQUEST_PROFILING': 'False',
+            'GUNICORN_ACCESS_LOG': '',
+            # aralash yuklama bitta akkaunt bilan login qiladi
+            'LOGIN_THROTTLE_RATE': '',
+            'LOGIN_ACCOUNT_THROTTLE_RATE': '',
+            **extra_env,
+        }
+        return _ServerProcess(argv, env, port, settings.BASE_DIR)
+
+    def load(self, port, mix, credentials, options):
+        bodies = {'login': json.dumps(credentials['login']).encode()}
+        names = [item[0] for item in mix]
+        weights = [item[1] for item in mix]
+        items = {item[0]: item for item in mix}
+        deadline = time.perf_counter() + options['duration']
+        lock = threading.Lock()
+        latencies = {name: [] for name in names}
+        errors = []
+        totals = {'reconnects': 0}
+
+        def request(connection, name):
+            _, _, method, path, body, admin = items[name]
+            headers = {'Content-Type': 'application/json'}
+            if admin:
+                headers['Authorization'] = f"Bearer {credentials['admin_token']}"
+            connection.request(method, path, body=bodies.get(body), headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+
+        def client(index):
+            rng = random.Random(options['seed'] * 1000 + index)
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+            timings = {name: [] for name in names}
+            failed = []
+            reconnects, reused = 0, False
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    try:
+                        status = request(connection, name)
+                    except ConnectionResetError:
+                        if not reused:
+                            raise
+                        # worker max_requests dan keyin qayta ishga tushdi va keep-alive ulanishni yopdi:
+                        # brauzer/proxy kabi so‘rov yangi ulanishda takrorlanadi
+                        connection.close()
+                        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+                        reconnects += 1
+                        status = request(connection, name)
+                    reused = True
+                except (OSError, http.client.HTTPException) as exc:
+                    failed.append(f"{name}: {exc!r}")
+                    connection.close()
+                    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+                    reused = False
+                    continue
+                if status != 200:
+                    failed.append(f"{name}: HTTP {status}")
+                    continue
+                timings[name].append((time.perf_counter() - started) * 1000)
+            connection.close()
+            with lock:
+                for name, values in timings.items():
+                    latencies[name].extend(values)
+                errors.extend(failed)
+                totals['reconnects'] += reconnects
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        every = [value for values in latencies.values() for value in values]
+        if not every:
+            raise CommandError("Birorta ham muvaffaqiyatli so‘rov bo‘lmadi: " + '; '.join(errors[:3]))
+        return {
+            'rps': len(every) / elapsed,
+            'p99_ms': _percentile(every, 99),
+            'errors': len(errors),
+            'reconnects': totals['reconnects'],
+            'error_samples': errors[:3],
+            'endpoints': {
+                name: {
+                    'count': len(values),
+                    'p50_ms': _percentile(values, 50) if values else 0,
+                    'p99_ms': _percentile(values, 99) if values else 0,
+                }
+                for name, values in latencies.items()
+            },
+        }
+
+    def report(self, result):
+        self.stdout.write(f"{'endpoint':<16} {'soni':>7} {'p50':>10} {'p99':>10}")
+        for name, item in result['endpoints'].items():
+            self.stdout.write(f"{name:<16} {item['count']:>7} {item['p50_ms']:>8.1f}ms {item['p99_ms']:>8.1f}ms")
+        self.stdout.write(
+            f"Jami: {result['rps']:.1f} so‘rov/s, p99 {result['p99_ms']:.1f}ms, xatolar {result['errors']}, "
+            f"qayta ulanishlar {result['reconnects']}"
+        )
+        for sample in result['error_samples']:
+            self.stdout.write(self.style.WARNING(f"    {sample}"))
+
+
+class _ServerProcess:
+    """Serverni ishga tushirib /health/ready/ 200 qaytarguncha kutadi; chiqishda SIGTERM (graceful)"""
+
+    def __init__(self, argv, env, port, cwd, startup_timeout=60):
+        self.argv, self.env, self.port, self.cwd = argv, env, port, cwd
+        self.startup_timeout = startup_timeout
+        self.log = tempfile.TemporaryFile()
+
+    def __enter__(self):
+        self.process = subprocess.Popen(self.argv, env=self.env, cwd=self.cwd, stdout=self.log, stderr=self.log)
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f"{self.argv[0]} ishga tushmadi:\n{self._output()}")
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+                connection.request('GET', '/health/ready/')
+                if connection.getresponse().status == 200:
+                    return self.port
+            except OSError:
+                pass
+            time.sleep(0.2)
+        output = self._output()
+        self._stop()
+        raise CommandError(f"{self.argv[0]} {self.startup_timeout}s ichida tayyor bo‘lmadi:\n{output}")
+
+    def __exit__(self, *exc_info):
+        self._stop()
+
+    def _stop(self):
+        if self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.log.close()
+
+    def _output(self):
+        self.log.seek(0)
+        return self.log.read().decode(errors='replace')[-2000:]
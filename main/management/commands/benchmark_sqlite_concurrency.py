@@ -0,0 +1,158 @@
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import Count
+
+from core.database import sqlite_options
+from main.models import Payment, Room, Student
+from main.synthetic import SyntheticDataGenerator
+
+PROFILES = {
+    # Django ning standart SQLite sozlamalari: rollback journal, DEFERRED, 5 s timeout
+    'default': {},
+    'tuned': sqlite_options(),
+}
+
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+class Workload:
+    """
+    Signallar ishlaydigan haqiqiy yozish yo‘llari (to‘lov -> update_student_status_after_payment,
+    talabani boshqa xonaga ko‘chirish -> update_room_status) va ular bilan parallel o‘qishlar
+    """
+
+    def __init__(self, seed):
+        self.student_ids = list(Student.objects.values_list('id', flat=True))
+        self.room_ids = list(Room.objects.values_list('id', flat=True))
+        self.dormitory_id = Student.objects.values_list('dormitory_id', flat=True).first()
+        self.seed = seed
+
+    def write(self, rng):
+        student = Student.objects.get(pk=rng.choice(self.student_ids))
+        with transaction.atomic():
+            if rng.random() < 0.5:
+                Payment.objects.create(
+                    student=student, dormitory_id=self.dormitory_id, amount=500000,
+                    method='Cash', status='APPROVED',
+                )
+            else:
+                student.room_id = rng.choice(self.room_ids)
+                student.save()
+
+    def read(self, rng):
+        list(Room.objects.annotate(students_count=Count('students')).order_by('id')[:50])
+        Payment.objects.filter(student_id=rng.choice(self.student_ids)).order_by('-paid_date').first()
+
+
+class Command(BaseCommand):
+    help = (
+        "SQLite ning standart va sozlangan (WAL, synchronous=NORMAL, mmap, busy timeout, IMMEDIATE) "
+        "profillarida parallel o‘qish/yozish: sekundiga amallar, kechikish va 'database is locked' xatolari"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=5, help="Har bir profil uchun sekund")
+        parser.add_argument('--students', type=int, default=300)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("Bu benchmark faqat SQLite uchun (DATABASE_URL sqlite:/// bo‘lishi kerak)")
+
+        db_settings = connections.settings['default']
+        original = {'NAME': db_settings['NAME'], 'OPTIONS': db_settings['OPTIONS']}
+        workdir = tempfile.mkdtemp(prefix='sqlite-bench-')
+        try:
+            template = os.path.join(workdir, 'template.sqlite3')
+            self._use(db_settings, template, PROFILES['default'])
+            self.stdout.write("Baza tayyorlanmoqda (migrate + sintetik ma'lumotlar)...")
+            call_command('migrate', verbosity=0)
+            SyntheticDataGenerator(students_per_dormitory=options['students'], months=3, seed=options['seed']).generate()
+            connections.close_all()
+
+            self.stdout.write(f"{'profil':<10} {'yozish/s':>10} {'o‘qish/s':>10} {'yozish p95':>12} "
+                              f"{'o‘qish p95':>12} {'locked':>8}")
+            for profile in options['profiles']:
+                path = os.path.join(workdir, f"{profile}.sqlite3")
+                shutil.copy(template, path)
+                self._use(db_settings, path, PROFILES[profile])
+                result = self.run_profile(options)
+                self.stdout.write(
+                    f"{profile:<10} {result['writes_per_sec']:>10.1f} {result['reads_per_sec']:>10.1f} "
+                    f"{result['write_p95_ms']:>10.1f}ms {result['read_p95_ms']:>10.1f}ms {result['locked']:>8}"
+                )
+        finally:
+            connections.close_all()
+            self._use(db_settings, original['NAME'], original['OPTIONS'])
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _use(self, db_settings, name, db_options):
+        # settings_dict umumiy obyekt: yangi thread ulanishlari ham shu faylga ulanadi
+        connections.close_all()
+        db_settings['NAME'] = name
+        db_settings['OPTIONS'] = dict(db_options)
+
+    def run_profile(self, options):
+        workload = Workload(options['seed'])
+        deadline = time.perf_counter() + options['duration']
+        lock = threading.Lock()
+        stats = {'write': [], 'read': [], 'locked': 0, 'errors': []}
+
+        def worker(kind, index):
+            rng = random.Random(options['seed'] * 1000 + index)
+            operation = workload.write if kind == 'write' else workload.read
+            timings, locked = [], 0
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        operation(rng)
+                    except OperationalError as exc:
+                        if 'locked' not in str(exc):
+                            raise
+                        locked += 1
+                        continue
+                    timings.append((time.perf_counter() - started) * 1000)
+            except Exception as exc:
+                with lock:
+                    stats['errors'].append(repr(exc))
+            finally:
+                connections.close_all()
+                with lock:
+                    stats[kind].extend(timings)
+                    stats['locked'] += locked
+
+        threads = [threading.Thread(target=worker, args=('write', i)) for i in range(options['writers'])]
+        threads += [threading.Thread(target=worker, args=('read', 100 + i)) for i in range(options['readers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if stats['errors']:
+            raise CommandError("Benchmark xatosi: " + '; '.join(stats['errors'][:3]))
+        return {
+            'writes_per_sec': len(stats['write']) / options['duration'],
+            'reads_per_sec': len(stats['read']) / options['duration'],
+            'write_p95_ms': _percentile(stats['write'], 95) or 0,
+            'read_p95_ms': _percentile(stats['read'], 95) or 0,
+            'write_median_ms': statistics.median(stats['write']) if stats['write'] else 0,
+            'locked': stats['locked'],
+        }
@@ -0,0 +1,97 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Worker boot: Django setup + URLconf (view, serializer lar) - preload yoki birinchi so‘rov shuni qiladi
+BOOT_SCRIPT = """
+import json, os, resource, sys
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+    'heavy': sorted(name for name in HEAVY if name in sys.modules),
+}))
+"""
+
+# API jarayoni uchun kerak bo‘lmasligi kerak bo‘lgan paketlar
+HEAVY_MODULES = ['openpyxl', 'google.auth', 'google.oauth2', 'allauth', 'dj_rest_auth',
+                 'rest_framework.authtoken']
+
+PROFILES = {
+    'lean': {},
+    # Google/allauth/dj-rest-auth ilovalari yoqilgan
+    'social': {'SOCIAL_AUTH_ENABLED': 'True'},
+}
+
+
+def parse_importtime(stderr):
+    """-X importtime chiqishi: [(modul, o‘z vaqti us, umumiy vaqt us, yuqori darajami)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(own), int(cumulative), not name[1:].startswith(' ')))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker ishga tushish narxi: `python -X importtime` bilan Django setup + URLconf yuklash vaqti, "
+        "maksimal RSS, yuklangan modullar soni va eng sekin importlar. Har bir profil alohida jarayonda."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--top', type=int, default=10, help="Eng sekin yuqori darajadagi importlar soni")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'profil':<8} {'wall':>9} {'import':>9} {'RSS':>9} {'modullar':>9}  og‘ir modullar")
+        for profile in options['profiles']:
+            runs = [self.boot(PROFILES[profile]) for _ in range(options['repeat'])]
+            wall = statistics.median(run['wall_ms'] for run in runs)
+            imports = statistics.median(run['import_ms'] for run in runs)
+            rss = statistics.median(run['rss_kb'] for run in runs) / 1024
+            last = runs[-1]
+            self.stdout.write(
+                f"{profile:<8} {wall:>7.0f}ms {imports:>7.0f}ms {rss:>7.1f}MB {last['modules']:>9}  "
+                f"{', '.join(last['heavy']) or '-'}"
+            )
+            for name, cumulative in last['top'][:options['top']]:
+                self.stdout.write(f"{'':<8} {cumulative / 1000:>7.1f}ms  {name}")
+
+    def boot(self, extra_env):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),
+            **extra_env,
+        }
+        script = f"HEAVY = {HEAVY_MODULES!r}\n" + BOOT_SCRIPT
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise CommandError(f"Worker boot xatosi:\n{result.stderr[-2000:]}")
+
+        rows = parse_importtime(result.stderr)
+        top_level = sorted(((name, cumulative) for name, _, cumulative, top in rows if top),
+                           key=lambda item: item[1], reverse=True)
+        return {
+            'wall_ms': wall_ms,
+            'import_ms': sum(cumulative for _, cumulative in top_level) / 1000,
+            'top': top_level,
+            **json.loads(result.stdout.strip().splitlines()[-1]),
+        }
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.uploads import discard_upload, expired_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "CHUNKED_UPLOAD_EXPIRE_HOURS dan beri yangilanmagan (tashlab ketilgan yoki biriktirilmagan) "
+        "bo‘laklab yuklamalarni va ularning vaqtinchalik fayllarini o‘chiradi"
+    )
+
+    def handle(self, *args, **options):
+        removed = 0
+        for upload in expired_uploads().iterator():
+            discard_upload(upload)
+            removed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"{removed} ta eskirgan yuklama o‘chirildi ({settings.CHUNKED_UPLOAD_EXPIRE_HOURS} soatdan eski)"
+        ))
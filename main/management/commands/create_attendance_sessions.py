@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from main.seeding import create_daily_sessions
+
+
+class Command(BaseCommand):
+    help = "Sardori bor barcha qavatlar uchun kunlik davomat sessiyalarini bitta batchda yaratadi (cron uchun)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="YYYY-MM-DD (default: bugun)")
+
+    def handle(self, *args, **options):
+        date = None
+        if options['date']:
+            date = parse_date(options['date'])
+            if date is None:
+                raise CommandError("Sana formati noto'g'ri, YYYY-MM-DD bo'lishi kerak")
+
+        sessions, records = create_daily_sessions(date)
+        self.stdout.write(self.style.SUCCESS(f"{sessions} ta sessiya va {records} ta record yaratildi"))
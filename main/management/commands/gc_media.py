@@ -0,0 +1,65 @@
+import os
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from main.storage import HASHED_NAME_RE, content_addressed_fields, content_storage, file_references
+
+
+class Command(BaseCommand):
+    help = (
+        "Kontent-adresli papkalardagi hech bir model ishlatmayotgan fayllarni (va ularning rasm variantlarini) "
+        "o‘chiradi hamda deduplikatsiya statistikasini chiqaradi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Faqat hisobot, hech narsa o‘chirilmaydi")
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help="Shundan yangi fayllarga tegilmaydi (yuklanib, hali saqlanmagan bo‘lishi mumkin)")
+
+    def handle(self, *args, **options):
+        storage = content_storage()
+        references = file_references()
+        cutoff = time.time() - options['grace_hours'] * 3600
+
+        prefixes = sorted({field.upload_to.rstrip('/') for _, field in content_addressed_fields()})
+        # (papka, hash) -> [(nom, hajm, mtime, variantmi)]
+        groups = defaultdict(list)
+        for prefix in prefixes:
+            root = storage.path(prefix)
+            for directory, _, filenames in os.walk(root):
+                for filename in filenames:
+                    match = HASHED_NAME_RE.match(filename)
+                    if not match:
+                        continue
+                    path = os.path.join(directory, filename)
+                    name = os.path.relpath(path, storage.location).replace(os.sep, '/')
+                    stat = os.stat(path)
+                    groups[(directory, match['hash'])].append((name, stat.st_size, stat.st_mtime, bool(match['suffix'])))
+
+        scanned = shared = saved = orphans = freed = 0
+        for files in groups.values():
+            originals = [name for name, _, _, variant in files if not variant]
+            refs = sum(references[name] for name in originals)
+            scanned += len(originals)
+            if refs > 1:
+                shared += 1
+                saved += (refs - 1) * sum(size for name, size, _, variant in files if not variant)
+            if refs or any(mtime > cutoff for _, _, mtime, _ in files):
+                continue
+
+            orphans += 1
+            for name, size, _, _ in files:
+                freed += size
+                if options['dry_run']:
+                    self.stdout.write(f"o‘chiriladi: {name}")
+                else:
+                    storage.delete(name)
+
+        action = "o‘chiriladi" if options['dry_run'] else "o‘chirildi"
+        self.stdout.write(self.style.SUCCESS(
+            f"{scanned} ta fayl tekshirildi. {shared} tasi bir nechta yozuvda ishlatiladi "
+            f"(tejalgan joy {saved / 1024 / 1024:.1f} MB). "
+            f"{orphans} ta yetim fayl {action} ({freed / 1024 / 1024:.1f} MB)."
+        ))
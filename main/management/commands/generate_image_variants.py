@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.images import IMAGE_FIELDS, process_image
+
+
+class Command(BaseCommand):
+    help = "Mavjud rasmlar uchun thumb/medium/WebP variantlarni yaratish (backfill)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Mavjud variantlarni ham qayta yaratish")
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'IMAGE_VARIANT_WORKERS', 2))
+
+    def handle(self, *args, **options):
+        names = set()
+        for model_name, fields in IMAGE_FIELDS.items():
+            model = apps.get_model('main', model_name)
+            for field in fields:
+                names.update(
+                    model.objects.exclude(**{field: ''}).exclude(**{f"{field}__isnull": True})
+                    .values_list(field, flat=True)
+                )
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            results = list(executor.map(lambda name: process_image(name, force=options['force']), sorted(names)))
+
+        created = sum(len(result) for result in results)
+        self.stdout.write(self.style.SUCCESS(f"{len(names)} ta rasm tekshirildi, {created} ta variant yaratildi"))
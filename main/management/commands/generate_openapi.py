@@ -0,0 +1,35 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.openapi import FORMATS, artifact_path, build_schema, encode_schema, source_stamp, stamp_path
+
+
+class Command(BaseCommand):
+    help = (
+        "OpenAPI hujjatini (JSON va YAML) OPENAPI_SCHEMA_DIR ga yozadi. Build/deploy bosqichida ishga "
+        "tushiring: server hujjatni introspeksiya qilmasdan shu fayldan xotiraga oladi (kod o‘zgarmagan va "
+        "DEBUG o‘chiq bo‘lsa, openapi.stamp bo‘yicha)."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        schema = build_schema()
+        self.stdout.write(f"Sxema {(time.perf_counter() - started) * 1000:.0f}ms da yig‘ildi, "
+                          f"{len(schema['paths'])} ta yo‘l")
+
+        os.makedirs(settings.OPENAPI_SCHEMA_DIR, exist_ok=True)
+        for fmt in FORMATS:
+            content = encode_schema(schema, fmt)
+            path = artifact_path(fmt)
+            # yarim yozilgan faylni ishlayotgan server o‘qib qolmasin
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(content)
+            os.replace(f"{path}.tmp", path)
+            self.stdout.write(self.style.SUCCESS(f"{path} ({len(content) / 1024:.1f} KB)"))
+        # oxirida: stamp artefaktlar to‘liq yozilgandan keyingina joriy kodga mos keladi
+        with open(f"{stamp_path()}.tmp", 'w') as f:
+            f.write(source_stamp())
+        os.replace(f"{stamp_path()}.tmp", stamp_path())
@@ -0,0 +1,85 @@
+import statistics
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.profiling import load_profile_records
+
+SORT_KEYS = {
+    'total': lambda row: row['total_ms'],
+    'p95': lambda row: row['p95_ms'],
+    'queries': lambda row: row['avg_queries'],
+    'sql': lambda row: row['avg_sql_ms'],
+    'duplicates': lambda row: row['max_duplicate'],
+}
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def summarize(records):
+    """Yozuvlarni view bo‘yicha guruhlash"""
+    groups = defaultdict(list)
+    for record in records:
+        groups[(record['method'], record.get('view') or record['path'])].append(record)
+
+    rows = []
+    for (method, view), items in groups.items():
+        durations = [item['duration_ms'] for item in items]
+        duplicates = Counter()
+        for item in items:
+            for duplicate in item.get('duplicates', []):
+                duplicates[duplicate['sql']] = max(duplicates[duplicate['sql']], duplicate['count'])
+        top_duplicate = duplicates.most_common(1)
+        rows.append({
+            'endpoint': f"{method} {view}",
+            'requests': len(items),
+            'total_ms': sum(durations),
+            'p50_ms': statistics.median(durations),
+            'p95_ms': _percentile(durations, 95),
+            'avg_queries': statistics.mean(item['queries'] for item in items),
+            'max_queries': max(item['queries'] for item in items),
+            'avg_sql_ms': statistics.mean(item['sql_ms'] for item in items),
+            'max_duplicate': top_duplicate[0][1] if top_duplicate else 0,
+            'duplicate_sql': top_duplicate[0][0] if top_duplicate else '',
+        })
+    return rows
+
+
+class Command(BaseCommand):
+    help = "RequestProfilingMiddleware yozgan JSONL fayl bo‘yicha eng qimmat endpointlar hisoboti"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=getattr(settings, 'REQUEST_PROFILING_FILE', None))
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='total')
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if not options['file']:
+            raise CommandError("Profil fayli ko‘rsatilmagan (--file yoki REQUEST_PROFILING_FILE)")
+        try:
+            records = load_profile_records(options['file'])
+        except FileNotFoundError:
+            raise CommandError(f"Fayl topilmadi: {options['file']}. REQUEST_PROFILING=True bilan ishga tushiring.")
+        if not records:
+            self.stdout.write("Yozuvlar yo‘q")
+            return
+
+        rows = sorted(summarize(records), key=SORT_KEYS[options['sort']], reverse=True)[:options['limit']]
+        self.stdout.write(
+            f"{'endpoint':<55} {'req':>6} {'p50ms':>8} {'p95ms':>8} {'avg q':>7} {'max q':>6} {'sql ms':>8} {'dup':>5}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['endpoint'][:55]:<55} {row['requests']:>6} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                f"{row['avg_queries']:>7.1f} {row['max_queries']:>6} {row['avg_sql_ms']:>8.1f} {row['max_duplicate']:>5}"
+            )
+
+        self.stdout.write("\nEng ko‘p takrorlangan so‘rovlar (N+1 nomzodlari):")
+        for row in sorted(rows, key=SORT_KEYS['duplicates'], reverse=True):
+            if row['max_duplicate'] < 2:
+                break
+            self.stdout.write(f"{row['max_duplicate']:>5}x {row['endpoint']}\n       {row['duplicate_sql'][:200]}")
@@ -0,0 +1,69 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main.models import (
+    Application, AttendanceRecord, CollectionRecord, Dormitory, Like, Payment, Student, UserNotification,
+)
+from main.synthetic import DEFAULT_PASSWORD, SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Yuklama testlari uchun sintetik ma'lumotlar yaratadi. --scale yotoqxonalar soni; "
+        "masalan --scale 100 --students 500 --months 24 taxminan 1M to‘lov beradi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help="Yaratiladigan yotoqxonalar soni")
+        parser.add_argument('--students', type=int, default=500, help="Har bir yotoqxonadagi talabalar soni")
+        parser.add_argument('--months', type=int, default=12, help="To‘lovlar tarixi (oy)")
+        parser.add_argument('--attendance-days', type=int, default=7, help="Davomat tarixi (kun)")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=1,
+                            help="Yotoqxonalarni parallel yaratuvchi jarayonlar soni (PostgreSQL uchun)")
+        parser.add_argument('--start', type=int, default=None,
+                            help="Birinchi yotoqxona indeksi (standart: mavjud yotoqxonalar soni)")
+        parser.add_argument('--flush', action='store_true', help="Avval bazani tozalash")
+
+    def handle(self, *args, **options):
+        if options['scale'] < 1:
+            raise CommandError("--scale kamida 1 bo‘lishi kerak")
+
+        workers = options['workers']
+        if workers > 1 and connection.vendor == 'sqlite':
+            # SQLite bir vaqtda faqat bitta yozuvchiga ruxsat beradi, parallel tranzaksiyalar "database is locked" beradi
+            self.stdout.write(self.style.WARNING("SQLite bilan --workers e'tiborga olinmaydi, bitta jarayon ishlatiladi"))
+            workers = 1
+
+        if options['flush']:
+            call_command('flush', interactive=False, verbosity=0)
+
+        start = options['start'] if options['start'] is not None else Dormitory.objects.count()
+        generator = SyntheticDataGenerator(
+            students_per_dormitory=options['students'],
+            months=options['months'],
+            attendance_days=options['attendance_days'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+
+        started = time.perf_counter()
+
+        def progress(index):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"Yotoqxona #{index} tayyor ({elapsed:.1f}s)")
+
+        generator.generate(dormitories=options['scale'], start=start, workers=workers, callback=progress)
+        elapsed = time.perf_counter() - started
+
+        for model in (Dormitory, Student, Payment, Application, AttendanceRecord, CollectionRecord,
+                      UserNotification, Like):
+            self.stdout.write(f"{model.__name__:<20} {model.objects.count():>10}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Sintetik ma'lumotlar {elapsed:.1f}s da yaratildi. "
+            f"Foydalanuvchilar: admin_{start}, leader_{start}_0, student_{start}_0, parol: {DEFAULT_PASSWORD}"
+        ))
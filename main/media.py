@@ -0,0 +1,175 @@
+"""
+MEDIA fayllarini berish: HTTP Range, ETag/Last-Modified va kesh headerlari.
+MEDIA_OFFLOAD='x-accel' (nginx) yoki 'x-sendfile' (apache/caddy) bo‘lsa Django faqat ruxsat va
+headerlarni hal qiladi, baytlarni proxy ko‘chiradi.
+Himoyalangan fayllar (pasport rasmlari, hujjatlar) uchun imzoli URL yoki egasi/yotoqxona admini kerak.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .auth import claim_value
+from .storage import HASHED_NAME_RE, check_signature, is_protected
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def _request_user(request):
+    """Session yoki API dagi autentifikatsiya klasslari (DEFAULT_AUTHENTICATION_CLASSES) orqali foydalanuvchi"""
+    if request.user.is_authenticated:
+        return request.user
+    api_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        user = api_request.user
+    except APIException:
+        return None
+    return user if user.is_authenticated else None
+
+
+def can_access_protected(user, name):
+    """Fayl egasi (talaba/ariza egasi), shu yotoqxona admini yoki superuser"""
+    if user is None:
+        return False
+    if claim_value(user, 'is_superuser'):
+        return True
+
+    from .models import Application, Student
+
+    access = Q(user=user) | Q(dormitory__admin=user)
+    student_files = Q(passport_image_first=name) | Q(passport_image_second=name) | Q(document=name) | Q(picture=name)
+    application_files = (Q(passport_image_first=name) | Q(passport_image_second=name) | Q(document=name)
+                         | Q(user_image=name))
+    return (Student.objects.filter(student_files).filter(access).exists()
+            or Application.objects.filter(application_files).filter(access).exists())
+
+
+def _etag(name, stat):
+    match = HASHED_NAME_RE.match(os.path.basename(name))
+    if match and not match['suffix']:
+        # kontent-adresli nom: hash ning o‘zi kuchli ETag
+        return quote_etag(match['hash'])
+    return quote_etag(f"{stat.st_size:x}-{stat.st_mtime_ns:x}")
+
+
+def _cache_control(name, protected):
+    scope = 'private' if protected else 'public'
+    if HASHED_NAME_RE.match(os.path.basename(name)):
+        return f"{scope}, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return f"{scope}, max-age={getattr(settings, 'MEDIA_MAX_AGE', 3600)}"
+
+
+def _parse_range(header, size):
+    """Bitta diapazon (start, end) yoki None (butun fayl); noto‘g‘ri diapazon uchun ValueError"""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if start == '':
+        if end == '':
+            return None
+        length = int(end)
+        if length == 0:
+            raise ValueError
+        start, end = max(size - length, 0), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+def _file_chunks(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_media(request, path):
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponse(status=405, headers={'Allow': 'GET, HEAD'})
+
+    name = path.lstrip('/')
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    protected = is_protected(name)
+    if protected:
+        signed = check_signature(name, request.GET.get('expires'), request.GET.get('signature'))
+        if not signed and not can_access_protected(_request_user(request), name):
+            # mavjudligini oshkor qilmaslik uchun 403 emas, 404
+            raise Http404
+
+    stat = os.stat(full_path)
+    etag = _etag(name, stat)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': _cache_control(name, protected),
+        'Accept-Ranges': 'bytes',
+    }
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified[header] = value
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+
+    offload = getattr(settings, 'MEDIA_OFFLOAD', '')
+    if offload:
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if offload == 'x-accel':
+            # proxy Range va baytlarni o‘zi beradi
+            response['X-Accel-Redirect'] = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/_media/') + quote(name)
+        else:
+            response['X-Sendfile'] = full_path
+        return response
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and request.headers.get('If-Range', etag) == etag:
+        try:
+            byte_range = _parse_range(range_header, stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416, headers=headers)
+            response['Content-Range'] = f"bytes */{stat.st_size}"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type, headers=headers)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _file_chunks(full_path, start, length), status=206, content_type=content_type, headers=headers
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f"bytes {start}-{end}/{stat.st_size}"
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
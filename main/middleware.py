@@ -0,0 +1,102 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+from .profiling import NPlusOneDetector, QueryRecorder, get_profile_store
+from .routers import pin_to_primary, replica_configured, track_writes
+
+
+class RequestProfilingMiddleware:
+    """
+    REQUEST_PROFILING=True bo‘lganda har bir so‘rov uchun SQL soni/vaqti, takrorlanuvchi so‘rovlar
+    va javob hajmini yozadi, Server-Timing header qo‘shadi. O‘chiq bo‘lsa middleware umuman ulanmaydi.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 1.0)
+        self.store = get_profile_store()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        sql_time = recorder.sql_time
+        response['Server-Timing'] = (
+            f'sql;dur={sql_time * 1000:.1f};desc="{recorder.count} queries", '
+            f'app;dur={(duration - sql_time) * 1000:.1f}, '
+            f'total;dur={duration * 1000:.1f}'
+        )
+
+        if random.random() < self.sample_rate:
+            self.store.add(self.build_record(request, response, recorder, duration))
+        return response
+
+    def build_record(self, request, response, recorder, duration):
+        match = request.resolver_match
+        if getattr(response, 'streaming', False):
+            size = None
+        else:
+            size = len(response.content)
+        return {
+            'time': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'view': (match.view_name or match._func_path) if match else None,
+            'route': match.route if match else None,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'queries': recorder.count,
+            'sql_ms': round(recorder.sql_time * 1000, 2),
+            'duplicates': [{'sql': sql, 'count': count} for sql, count in recorder.duplicates()[:5]],
+            'response_bytes': size,
+        }
+
+
+class NPlusOneMiddleware:
+    """
+    Dev rejimida N+1 so‘rovlarni ushlash. NPLUSONE_DETECTION='log' ogohlantirish yozadi,
+    'raise' esa NPlusOneError ko‘taradi; 'off' (standart) bo‘lsa middleware ulanmaydi.
+    """
+
+    def __init__(self, get_response):
+        self.mode = getattr(settings, 'NPLUSONE_DETECTION', 'off')
+        if self.mode not in ('log', 'raise'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        detector = NPlusOneDetector(mode=self.mode)
+        with detector:
+            response = self.get_response(request)
+            match = request.resolver_match
+            detector.label = match.view_name if match else request.path
+        return response
+
+
+class ReplicaPinMiddleware:
+    """
+    Read-replica bo‘lsa: so‘rovda yozuv bo‘lgan foydalanuvchini REPLICA_STICKY_SECONDS davomida
+    primary ga bog‘laydi (keyingi GET lar o‘z yozuvini ko‘radi). Replica sozlanmagan bo‘lsa ulanmaydi.
+    """
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with track_writes() as wrote:
+            response = self.get_response(request)
+            # DRF autentifikatsiya qilgan foydalanuvchini request._request.user ga ham yozadi
+            user = getattr(request, 'user', None)
+            if wrote() and user is not None and user.is_authenticated:
+                pin_to_primary(user)
+        return response
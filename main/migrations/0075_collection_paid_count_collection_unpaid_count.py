@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-19 14:25
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_collection_counts(apps, schema_editor):
+    Collection = apps.get_model('main', 'Collection')
+    counts = (
+        Collection.objects
+        .annotate(
+            paid=Count('records', filter=Q(records__status='To‘lagan')),
+            unpaid=Count('records', filter=Q(records__status='To‘lamagan')),
+        )
+        .values_list('id', 'paid', 'unpaid')
+    )
+    for collection_id, paid, unpaid in counts:
+        Collection.objects.filter(id=collection_id).update(paid_count=paid, unpaid_count=unpaid)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0074_student_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collection',
+            name='paid_count',
+            field=models.PositiveIntegerField(default=0, help_text='To‘lagan talabalar soni'),
+        ),
+        migrations.AddField(
+            model_name='collection',
+            name='unpaid_count',
+            field=models.PositiveIntegerField(default=0, help_text='To‘lamagan talabalar soni'),
+        ),
+        migrations.RunPython(fill_collection_counts, migrations.RunPython.noop),
+    ]
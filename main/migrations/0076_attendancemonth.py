@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-19 14:27
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_attendance_months(apps, schema_editor):
+    AttendanceRecord = apps.get_model('main', 'AttendanceRecord')
+    AttendanceMonth = apps.get_model('main', 'AttendanceMonth')
+
+    masks = {}
+    for student_id, date, status in AttendanceRecord.objects.values_list('student_id', 'session__date', 'status').iterator():
+        key = (student_id, date.year, date.month)
+        recorded, out = masks.get(key, (0, 0))
+        bit = 1 << (date.day - 1)
+        recorded |= bit
+        if status == 'out':
+            out |= bit
+        masks[key] = (recorded, out)
+
+    AttendanceMonth.objects.bulk_create(
+        [
+            AttendanceMonth(student_id=student_id, year=year, month=month, recorded_mask=recorded, out_mask=out)
+            for (student_id, year, month), (recorded, out) in masks.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0075_collection_paid_count_collection_unpaid_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)])),
+                ('recorded_mask', models.IntegerField(default=0, help_text='Davomat olingan kunlar')),
+                ('out_mask', models.IntegerField(default=0, help_text='Talaba yo‘q bo‘lgan kunlar')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_months', to='main.student')),
+            ],
+            options={
+                'unique_together': {('student', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(fill_attendance_months, migrations.RunPython.noop),
+    ]
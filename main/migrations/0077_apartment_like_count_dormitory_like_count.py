@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-19 14:42
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_like_counts(apps, schema_editor):
+    Like = apps.get_model('main', 'Like')
+    for content_type, model_name in (('dormitory', 'Dormitory'), ('apartment', 'Apartment')):
+        model = apps.get_model('main', model_name)
+        counts = (
+            Like.objects.filter(content_type=content_type, object_id=OuterRef('pk'))
+            .values('object_id').annotate(total=Count('*')).values('total')
+        )
+        model.objects.update(like_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0076_attendancemonth'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apartment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, help_text='Like lar soni'),
+        ),
+        migrations.AddField(
+            model_name='dormitory',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, help_text='Like lar soni'),
+        ),
+        migrations.RunPython(fill_like_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-19 14:45
+
+import main.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0077_apartment_like_count_dormitory_like_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='document',
+            field=models.FileField(blank=True, null=True, storage=main.storage.content_storage, upload_to='documents/'),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='passport_image_first',
+            field=models.ImageField(blank=True, null=True, storage=main.storage.content_storage, upload_to='passport_image/'),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='passport_image_second',
+            field=models.ImageField(blank=True, null=True, storage=main.storage.content_storage, upload_to='passport_image/'),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='user_image',
+            field=models.ImageField(blank=True, null=True, storage=main.storage.content_storage, upload_to='student_pictures/'),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='document',
+            field=models.FileField(blank=True, null=True, storage=main.storage.content_storage, upload_to='documents/'),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='passport_image_first',
+            field=models.ImageField(blank=True, null=True, storage=main.storage.content_storage, upload_to='passport_image/'),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='passport_image_second',
+            field=models.ImageField(blank=True, null=True, storage=main.storage.content_storage, upload_to='passport_image/'),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='picture',
+            field=models.ImageField(blank=True, null=True, storage=main.storage.content_storage, upload_to='student_pictures/'),
+        ),
+    ]
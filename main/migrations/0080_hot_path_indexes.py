@@ -0,0 +1,57 @@
+# Generated by Django 5.2 on 2026-10-19 14:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0079_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['dormitory', 'status', '-created_at'], name='app_dorm_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['dormitory', '-created_at'], name='app_dorm_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationnotification',
+            index=models.Index(fields=['user', 'is_read', '-created_at'], name='appnotif_user_read_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['content_type', 'object_id'], name='like_target_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['dormitory', 'status', '-paid_date'], name='payment_dorm_status_paid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status', 'APPROVED')), fields=['student', '-valid_until'], name='payment_student_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['floor', 'status'], name='room_floor_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['dormitory', 'status'], name='student_dorm_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['dormitory', 'placement_status'], name='student_dorm_placement_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['dormitory', '-accepted_date'], name='student_dorm_accepted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user'], name='usernotif_unread_idx'),
+        ),
+    ]
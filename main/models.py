@@ -1,8 +1,12 @@
+import uuid
+
 from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 
+from .storage import content_storage, protected_content_storage
+
 
 class User(AbstractUser):
     ROLE_CHOICES = (
@@ -21,10 +25,20 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        # deferred maydonga murojaat: qolgan deferred maydonlar ham shu so‘rovda yuklansin
+        # (main.auth dagi faqat pk li foydalanuvchi har maydon uchun alohida SELECT qilmasin)
+        if fields is not None:
+            deferred_fields = self.get_deferred_fields()
+            if deferred_fields.intersection(fields):
+                fields = deferred_fields.union(fields)
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     image = models.ImageField(upload_to='user_profiles/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     birth_date = models.DateField(blank=True, null=True)
@@ -56,6 +70,7 @@ class University(models.Model):
     description = models.TextField(blank=True, null=True)
     contact = models.TextField(blank=True, null=True)
     logo = models.ImageField(blank=True, null=True)
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         verbose_name = 'University'
@@ -89,6 +104,7 @@ class Dormitory(models.Model):
     distance_to_university = models.FloatField(blank=True, null=True, help_text="Universitetgacha masofa (km)")
     amenities = models.ManyToManyField(Amenity, related_name='dormitories')
     is_active = models.BooleanField(default=True)
+    like_count = models.PositiveIntegerField(default=0, help_text="Like lar soni")
 
     class Meta:
         verbose_name = 'Dormitory'
@@ -101,6 +117,7 @@ class Dormitory(models.Model):
 class DormitoryImage(models.Model):
     dormitory = models.ForeignKey(Dormitory, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='dormitory_images', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return self.dormitory.name
@@ -143,6 +160,10 @@ class Room(models.Model):
     class Meta:
         verbose_name = 'Room'
         verbose_name_plural = 'Rooms'
+        indexes = [
+            # bo'sh xonalar ro'yxati: floor bo'yicha, to'lgan xonalar chiqarib tashlanadi
+            models.Index(fields=['floor', 'status'], name='room_floor_status_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -183,10 +204,13 @@ class Student(models.Model):
     gender = models.CharField(max_length=120, choices=Gender_CHOICES, default='Erkak')
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='students', blank=True, null=True)
     phone = models.CharField(blank=True, null=True, max_length=25)
-    picture = models.ImageField(upload_to='student_pictures/', blank=True, null=True)
-    passport_image_first = models.ImageField(upload_to='passport_image/', blank=True, null=True)
-    passport_image_second = models.ImageField(upload_to='passport_image/', blank=True, null=True)
-    document = models.FileField(upload_to='documents/', blank=True, null=True)
+    picture = models.ImageField(upload_to='student_pictures/', storage=content_storage, blank=True, null=True)
+    picture_variants = models.JSONField(default=dict, blank=True, editable=False)
+    passport_image_first = models.ImageField(upload_to='passport_image/', storage=protected_content_storage,
+                                             blank=True, null=True)
+    passport_image_second = models.ImageField(upload_to='passport_image/', storage=protected_content_storage,
+                                              blank=True, null=True)
+    document = models.FileField(upload_to='documents/', storage=protected_content_storage, blank=True, null=True)
     privilege = models.BooleanField(default=False)
     privilege_share = models.PositiveIntegerField(default=0)
     accepted_date = models.DateTimeField(auto_now_add=True)
@@ -205,6 +229,13 @@ class Student(models.Model):
     class Meta:
         verbose_name = 'Student'
         verbose_name_plural = 'Students'
+        indexes = [
+            # dashboard/statistika: yotoqxona bo'yicha qarzdor/haqdor va joylashish holati sanog'i
+            models.Index(fields=['dormitory', 'status'], name='student_dorm_status_idx'),
+            models.Index(fields=['dormitory', 'placement_status'], name='student_dorm_placement_idx'),
+            # recent_activity: oxirgi qabul qilinganlar
+            models.Index(fields=['dormitory', '-accepted_date'], name='student_dorm_accepted_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -230,18 +261,26 @@ class Application(models.Model):
     group = models.CharField(max_length=120, blank=True, null=True)
     phone = models.CharField(blank=True, null=True, max_length=25)
     passport = models.CharField(max_length=9, unique=True, blank=True, null=True)
-    user_image = models.ImageField(upload_to='student_pictures/', blank=True, null=True)
-    document = models.FileField(blank=True, null=True)
+    user_image = models.ImageField(upload_to='student_pictures/', storage=content_storage, blank=True, null=True)
+    user_image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    document = models.FileField(upload_to='documents/', storage=protected_content_storage, blank=True, null=True)
     status = models.CharField(choices=STATUS_CHOICES, max_length=20, default='PENDING')
     comment = models.TextField(blank=True, null=True)
     admin_comment = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    passport_image_first = models.ImageField(upload_to='passport_image/', blank=True, null=True)
-    passport_image_second = models.ImageField(upload_to='passport_image/', blank=True, null=True)
+    passport_image_first = models.ImageField(upload_to='passport_image/', storage=protected_content_storage,
+                                             blank=True, null=True)
+    passport_image_second = models.ImageField(upload_to='passport_image/', storage=protected_content_storage,
+                                              blank=True, null=True)
 
     class Meta:
         verbose_name = 'Application'
         verbose_name_plural = 'Applications'
+        indexes = [
+            models.Index(fields=['dormitory', 'status', '-created_at'], name='app_dorm_status_created_idx'),
+            # dashboard/recent_activity: status siz, oxirgi arizalar
+            models.Index(fields=['dormitory', '-created_at'], name='app_dorm_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -261,6 +300,13 @@ class Payment(models.Model):
     class Meta:
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
+        indexes = [
+            # ro'yxat, dashboard summasi va recent_activity (status='APPROVED' ORDER BY -paid_date)
+            models.Index(fields=['dormitory', 'status', '-paid_date'], name='payment_dorm_status_paid_idx'),
+            # talabaning oxirgi tasdiqlangan to'lovi (signal va update_students_status_for_user)
+            models.Index(fields=['student', '-valid_until'], condition=models.Q(status='APPROVED'),
+                         name='payment_student_approved_idx'),
+        ]
 
     def __str__(self):
         return self.student.name
@@ -309,6 +355,7 @@ class Apartment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='apartments')
     is_active = models.BooleanField(default=True)
+    like_count = models.PositiveIntegerField(default=0, help_text="Like lar soni")
 
     def __str__(self):
         return self.title
@@ -317,6 +364,7 @@ class Apartment(models.Model):
 class ApartmentImage(models.Model):
     apartment = models.ForeignKey(Apartment, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='apartment_images/')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -353,6 +401,10 @@ class UserNotification(models.Model):
     class Meta:
         ordering = ['-received_at']
         unique_together = ['user', 'notification']
+        indexes = [
+            # o'qilmaganlar soni: faqat is_read=False qatorlar indekslanadi
+            models.Index(fields=['user'], condition=models.Q(is_read=False), name='usernotif_unread_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.notification.message}"
@@ -368,6 +420,11 @@ class ApplicationNotification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'is_read', '-created_at'], name='appnotif_user_read_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.message[:30]}"
 
@@ -387,6 +444,10 @@ class Like(models.Model):
     class Meta:
         unique_together = ['user', 'content_type', 'object_id']
         ordering = ['-created_at']
+        indexes = [
+            # obyekt bo'yicha like lar (recount_like_counts, obyekt o'chirilganda)
+            models.Index(fields=['content_type', 'object_id'], name='like_target_idx'),
+        ]
         verbose_name = 'Like'
         verbose_name_plural = 'Likes'
     
@@ -461,6 +522,21 @@ class AttendanceRecord(models.Model):
     def __str__(self):
         return f"{self.student} - {self.session.date} - {self.status}"
 
+
+class AttendanceMonth(models.Model):
+    """Talabaning bir oylik davomati bitmap ko‘rinishida: N-kun -> (N-1)-bit"""
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='attendance_months')
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(12)])
+    recorded_mask = models.IntegerField(default=0, help_text="Davomat olingan kunlar")
+    out_mask = models.IntegerField(default=0, help_text="Talaba yo‘q bo‘lgan kunlar")
+
+    class Meta:
+        unique_together = ("student", "year", "month")
+
+    def __str__(self):
+        return f"{self.student} - {self.year}-{self.month:02d}"
+
 class Collection(models.Model):
     title = models.CharField(max_length=100)
     amount = models.PositiveIntegerField(blank=True, null=True)
@@ -469,6 +545,8 @@ class Collection(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     floor = models.ForeignKey(Floor, on_delete=models.CASCADE, related_name='collections', blank=True, null=True)
     leader = models.ForeignKey('FloorLeader', on_delete=models.CASCADE, related_name='collections', blank=True, null=True)
+    paid_count = models.PositiveIntegerField(default=0, help_text="To‘lagan talabalar soni")
+    unpaid_count = models.PositiveIntegerField(default=0, help_text="To‘lamagan talabalar soni")
 
     def __str__(self):
         return self.title
@@ -512,4 +590,33 @@ class DutySchedule(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.floor} - {self.room} - {self.date}"
\ No newline at end of file
+        return f"{self.floor} - {self.room} - {self.date}"
+
+
+class ChunkedUpload(models.Model):
+    """
+    Bo‘laklab (resumable) yuklanayotgan fayl. Bo‘laklar to‘g‘ridan-to‘g‘ri CHUNKED_UPLOAD_DIR dagi
+    vaqtinchalik faylga yoziladi, tugagach fayl token (id) orqali istalgan FileField ga biriktiriladi.
+    """
+    STATUS_UPLOADING = 'uploading'
+    STATUS_COMPLETE = 'complete'
+    STATUS_CHOICES = (
+        (STATUS_UPLOADING, 'Yuklanmoqda'),
+        (STATUS_COMPLETE, 'Tugallangan'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chunked_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    status = models.CharField(choices=STATUS_CHOICES, max_length=20, default=STATUS_UPLOADING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
@@ -0,0 +1,165 @@
+"""
+OpenAPI hujjati bir marta yig‘iladi va xotiradan beriladi.
+
+drf_yasg ning schema_view i har bir so‘rovda (Swagger UI sahifasining o‘zida ham) barcha view va
+serializerlarni qayta introspeksiya qilardi. Endi hujjat build paytida `python manage.py generate_openapi`
+bilan OPENAPI_SCHEMA_DIR ga yoziladi (bo‘lmasa birinchi so‘rovda yig‘iladi), JSON/YAML baytlari va ETag
+jarayon xotirasida saqlanadi. Artefakt yonidagi openapi.stamp unga yig‘ilgan kod hashini yozadi:
+kod o‘zgargan bo‘lsa (yoki DEBUG da) eski artefakt o‘rniga hujjat qayta yig‘iladi. Swagger UI sahifasi
+sxemasiz render qilinadi, spec ni `?format=openapi` dan oladi. Host ko‘rsatilmaydi: UI so‘rovlarni
+sahifa ochilgan manzilga yuboradi.
+"""
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.renderers import SwaggerUIRenderer
+from rest_framework.views import APIView
+
+API_INFO = openapi.Info(
+    title="Joy Bor API",
+    default_version='v1',
+    description="Test description",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="contact@snippets.local"),
+    license=openapi.License(name="BSD License"),
+)
+
+FORMATS = {
+    'json': ('application/json', OpenAPICodecJson),
+    'yaml': ('application/yaml', OpenAPICodecYaml),
+}
+
+_lock = threading.Lock()
+_documents = {}
+
+
+def _anonymous_request():
+    # view lardagi get_queryset/get_serializer_class self.request.user ga murojaat qiladi
+    http_request = HttpRequest()
+    http_request.method = 'GET'
+    http_request.path = '/'
+    http_request.META = {'SERVER_NAME': 'localhost', 'SERVER_PORT': '80'}
+    request = APIView().initialize_request(http_request)
+    request.user = AnonymousUser()
+    return request
+
+
+def build_schema():
+    """Barcha endpointlar (public=True: ruxsatlardan qat'i nazar), anonim so‘rov bilan"""
+    schema = OpenAPISchemaGenerator(API_INFO).get_schema(request=_anonymous_request(), public=True)
+    # host/scheme so‘rovdan olinadi: soxta so‘rov manzili hujjatga tushmasin
+    schema.pop('host', None)
+    schema.pop('schemes', None)
+    return schema
+
+
+def encode_schema(schema, fmt):
+    return FORMATS[fmt][1](validators=[]).encode(schema)
+
+
+def artifact_path(fmt):
+    return os.path.join(settings.OPENAPI_SCHEMA_DIR, f"openapi.{fmt}")
+
+
+def stamp_path():
+    return os.path.join(settings.OPENAPI_SCHEMA_DIR, 'openapi.stamp')
+
+
+def source_stamp():
+    """Hujjatga ta'sir qiladigan kod (core va main dagi .py fayllar) hashi, jarayonda bir marta hisoblanadi"""
+    stamp = _documents.get('stamp')
+    if stamp is None:
+        digest = hashlib.sha256()
+        for package in ('core', 'main'):
+            root = os.path.join(settings.BASE_DIR, package)
+            for directory, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith('.py'):
+                        path = os.path.join(directory, filename)
+                        digest.update(os.path.relpath(path, root).encode())
+                        with open(path, 'rb') as f:
+                            digest.update(f.read())
+        stamp = _documents['stamp'] = digest.hexdigest()
+    return stamp
+
+
+def _read_artifact(fmt):
+    """Joriy kod bilan yig‘ilgan artefakt baytlari yoki None"""
+    if settings.DEBUG:
+        return None
+    try:
+        with open(stamp_path()) as f:
+            if f.read().strip() != source_stamp():
+                return None
+        with open(artifact_path(fmt), 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _document(content):
+    return content, quote_etag(hashlib.sha256(content).hexdigest()[:32])
+
+
+def get_document(fmt):
+    """(baytlar, ETag): avval xotiradan, keyin build artefaktidan (kod o‘zgarmagan bo‘lsa), bo‘lmasa yig‘ib"""
+    document = _documents.get(fmt)
+    if document is not None:
+        return document
+    with _lock:
+        if fmt not in _documents:
+            content = _read_artifact(fmt)
+            if content is None:
+                schema = _documents.get('schema') or build_schema()
+                # ikkinchi format so‘ralsa sxema qayta yig‘ilmasin
+                _documents['schema'] = schema
+                content = encode_schema(schema, fmt)
+            _documents[fmt] = _document(content)
+        return _documents[fmt]
+
+
+def warm():
+    """Oldindan yuklash (gunicorn preload): worker lar hujjatni master dan meros oladi"""
+    for fmt in FORMATS:
+        get_document(fmt)
+    _documents.pop('schema', None)
+    _documents.pop('stamp', None)
+
+
+def _serve_document(request, fmt):
+    content, etag = get_document(fmt)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type=FORMATS[fmt][0])
+    response['ETag'] = etag
+    # har safar ETag bilan tekshiriladi: deploy dan keyin eski hujjat keshda qolib ketmaydi
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+@require_safe
+def schema_document(request, fmt):
+    if fmt not in FORMATS:
+        raise Http404
+    return _serve_document(request, fmt)
+
+
+@require_safe
+def swagger_ui(request):
+    if request.GET.get('format') == 'openapi':
+        return _serve_document(request, 'json')
+    # UI shabloniga faqat info (sarlavha, versiya) kerak; yo‘llar brauzerda spec dan yuklanadi
+    stub = openapi.Swagger(info=API_INFO, _prefix='/', paths=openapi.Paths(paths={}))
+    html = SwaggerUIRenderer().render(stub, renderer_context={'request': request})
+    return HttpResponse(html, content_type='text/html; charset=utf-8')
@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission
 from .models import *
 from rest_framework.exceptions import PermissionDenied
+from .auth import claim_value, user_claims
 
 
 class IsStudent(BasePermission):
@@ -10,7 +11,7 @@ class IsStudent(BasePermission):
 
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.is_superuser
+        return request.user.is_authenticated and claim_value(request.user, 'is_superuser')
 
 
 class IsDormitoryAdmin(BasePermission):
@@ -18,8 +19,12 @@ class IsDormitoryAdmin(BasePermission):
         if not request.user.is_authenticated:
             return False
 
-        if request.user.role == 'admin':
-            has_dormitory = Dormitory.objects.filter(admin=request.user).exists()
+        if claim_value(request.user, 'role') == 'admin':
+            claims = user_claims(request.user)
+            if claims is not None:
+                has_dormitory = claims['dormitory_id'] is not None
+            else:
+                has_dormitory = Dormitory.objects.filter(admin=request.user).exists()
             if not has_dormitory:
                 raise PermissionDenied("Sizda yotoqxona mavjud emas.")
             return True
@@ -28,7 +33,9 @@ class IsDormitoryAdmin(BasePermission):
 
 class IsOwnerOrIsAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return request.user.is_authenticated and (request.user.is_superuser or obj.admin == request.user)
+        if not request.user.is_authenticated:
+            return False
+        return claim_value(request.user, 'is_superuser') or obj.admin == request.user
 
 
 class IsAdminOrDormitoryAdmin(BasePermission):
@@ -38,13 +45,18 @@ class IsAdminOrDormitoryAdmin(BasePermission):
 
 class IsIjarachiAdmin(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and (request.user.role == 'ijarachi' or request.user.is_superuser)
+        if not request.user.is_authenticated:
+            return False
+        return claim_value(request.user, 'role') == 'ijarachi' or claim_value(request.user, 'is_superuser')
 
 
 class IsFloorLeader(BasePermission):
     def has_permission(self, request, view):
         if not request.user.is_authenticated:
             return False
+        claims = user_claims(request.user)
+        if claims is not None:
+            return claims['floor_leader_id'] is not None
         # role flag or record existence
         if getattr(request.user, 'role', None) == 'floor_leader':
             return FloorLeader.objects.filter(user=request.user).exists()
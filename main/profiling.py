@@ -0,0 +1,156 @@
+"""
+So‘rovlar profili: SQL so‘rovlar soni, vaqti va takrorlanuvchi so‘rovlar (N+1).
+RequestProfilingMiddleware va benchmark shu yerdagi yordamchilardan foydalanadi.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('main.nplusone')
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?|\d+|'[^']*')\s*,?)+\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Parametrlarsiz SQL shakli: bir xil so‘rov turli qiymatlar bilan bitta fingerprint beradi"""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """Barcha ulanishlardagi so‘rovlarni DEBUG ga bog‘liq bo‘lmagan holda yozib olish"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def sql_time(self):
+        return sum(duration for _, duration in self.queries)
+
+    def fingerprints(self):
+        return Counter(fingerprint(sql) for sql, _ in self.queries)
+
+    def duplicates(self, threshold=2):
+        """`threshold` va undan ko‘p marta bajarilgan so‘rovlar, eng ko‘pi birinchi"""
+        return [(sql, count) for sql, count in self.fingerprints().most_common() if count >= threshold]
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def find_n_plus_one(fingerprints, threshold=None, allowlist=None, view=None):
+    """
+    `threshold` dan ko‘p marta bajarilgan fingerprintlar. Allowlist elementlari regex bo‘lib,
+    fingerprint yoki view nomiga mos kelsa e'tiborga olinmaydi.
+    """
+    if threshold is None:
+        threshold = getattr(settings, 'NPLUSONE_THRESHOLD', 5)
+    if allowlist is None:
+        allowlist = getattr(settings, 'NPLUSONE_ALLOWLIST', [])
+    patterns = [re.compile(pattern) for pattern in allowlist]
+
+    found = []
+    for sql, count in fingerprints.most_common():
+        if count <= threshold:
+            break
+        if any(pattern.search(sql) or (view and pattern.fullmatch(view)) for pattern in patterns):
+            continue
+        found.append((sql, count))
+    return found
+
+
+class NPlusOneDetector(QueryRecorder):
+    """
+    Blok ichida bir xil so‘rov `threshold` dan ko‘p bajarilsa xato (mode='raise') yoki
+    ogohlantirish (mode='log'). Testlarda: `with NPlusOneDetector(): client.get(...)`.
+    """
+
+    def __init__(self, threshold=None, allowlist=None, mode='raise', label=None):
+        super().__init__()
+        self.threshold = threshold
+        self.allowlist = allowlist
+        self.mode = mode
+        self.label = label
+        self.found = []
+
+    def __exit__(self, exc_type, *exc_info):
+        super().__exit__(exc_type, *exc_info)
+        if exc_type is not None:
+            return
+        self.found = find_n_plus_one(self.fingerprints(), self.threshold, self.allowlist, view=self.label)
+        if not self.found:
+            return
+        message = f"N+1 so‘rovlar{f' ({self.label})' if self.label else ''}: " + '; '.join(
+            f"{count}x {sql[:300]}" for sql, count in self.found
+        )
+        if self.mode == 'raise':
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+class ProfileStore:
+    """Oxirgi yozuvlar uchun xotiradagi ring buffer va ixtiyoriy JSONL fayl"""
+
+    def __init__(self, size, path=None):
+        self.records = deque(maxlen=size)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        self.records.append(record)
+        if self.path:
+            line = json.dumps(record, ensure_ascii=False)
+            with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+_store = None
+
+
+def get_profile_store():
+    global _store
+    if _store is None:
+        _store = ProfileStore(
+            size=getattr(settings, 'REQUEST_PROFILING_BUFFER_SIZE', 1000),
+            path=getattr(settings, 'REQUEST_PROFILING_FILE', None),
+        )
+    return _store
+
+
+def load_profile_records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,129 @@
+"""
+Read-replica marshrutlash. settings.DATABASES da 'replica' bo‘lsa (REPLICA_DATABASE_URL), faqat
+ReplicaReadMixin ulangan view larning GET/HEAD so‘rovlaridagi o‘qishlar replica ga ketadi; qolgan
+hamma narsa, shu jumladan barcha yozuvlar, 'default' (primary) da.
+
+Read-your-writes: so‘rov ichida yozuv bo‘lsa, so‘rovning qolgan o‘qishlari primary ga qaytadi. Javobdan
+keyin main.middleware.ReplicaPinMiddleware foydalanuvchini REPLICA_STICKY_SECONDS davomida primary ga "yopishtiradi",
+shuning uchun keyingi GET replikatsiya kechikishi sababli eski ma'lumot ko‘rmaydi.
+Holat contextvars da: thread lar va async view lar uchun ham so‘rovga xos.
+
+Kesh jadvali (DatabaseCache) va sessiya/token holati har doim primary da: kechikkan replica dan eski
+qiymat o‘qilmasin, cache.set esa so‘rovni "yozuv bo‘ldi" deb belgilab qolgan o‘qishlarni primary ga
+o‘tkazib yubormasin.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_ALIAS = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+_wrote = ContextVar('wrote', default=False)
+
+WRITE_SQL = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+# DatabaseCache modeli app_label='django_cache'; qolganlari autentifikatsiya holati
+PRIMARY_ONLY_APPS = ('django_cache', 'sessions', 'authtoken', 'token_blacklist')
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def replica_reads():
+    """Blok ichidagi o‘qishlarni replica ga yo‘naltirish (yozuv bo‘lmaguncha)"""
+    token = _use_replica.set(replica_configured())
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def _pin_key(user_id):
+    return f"replica:pin:{user_id}"
+
+
+def is_pinned(user):
+    return bool(user and user.is_authenticated and cache.get(_pin_key(user.pk)))
+
+
+async def ais_pinned(user):
+    return bool(user and user.is_authenticated and await cache.aget(_pin_key(user.pk)))
+
+
+def pin_to_primary(user):
+    cache.set(_pin_key(user.pk), True, getattr(settings, 'REPLICA_STICKY_SECONDS', 10))
+
+
+def _primary_only(model):
+    return model._meta.app_label in PRIMARY_ONLY_APPS
+
+
+def _cache_tables():
+    return [
+        cache_settings['LOCATION'] for cache_settings in settings.CACHES.values()
+        if cache_settings['BACKEND'] == 'django.core.cache.backends.db.DatabaseCache'
+    ]
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and not _wrote.get() and not _primary_only(model):
+            return REPLICA_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        if not _primary_only(model):
+            _wrote.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica primary ning nusxasi: ikkala bazadagi obyektlar bir-biriga bog‘lanishi mumkin
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # sxema faqat primary da o‘zgaradi, replica uni replikatsiya orqali oladi
+        return db != REPLICA_ALIAS
+
+
+class ReplicaReadMixin:
+    """
+    View uchun opt-in: xavfsiz so‘rovlar (GET/HEAD/OPTIONS) replica dan o‘qiydi, agar foydalanuvchi
+    yaqinda yozuv qilmagan bo‘lsa. initial() da autentifikatsiyadan keyin hal qilinadi.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _use_replica.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and replica_configured() and not is_pinned(request.user):
+            _use_replica.set(True)
+
+
+def _track_raw_writes(execute, sql, params, many, context):
+    # ORM yozuvlari db_for_write orqali, cursor() bilan yozilgan xom SQL (likes, seeding) shu yerda
+    if sql.lstrip()[:7].upper().startswith(WRITE_SQL) and not any(table in sql for table in _cache_tables()):
+        _wrote.set(True)
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def track_writes():
+    """So‘rov davomida yozuv bo‘ldimi: yield qilingan funksiya shuni qaytaradi"""
+    token = _wrote.set(False)
+    try:
+        with connections['default'].execute_wrapper(_track_raw_writes):
+            yield _wrote.get
+    finally:
+        _wrote.reset(token)
@@ -0,0 +1,119 @@
+"""
+Davomat sessiyalari va yig‘imlar uchun recordlarni bitta INSERT ... SELECT bilan yaratish.
+Talabalar Python obyektlariga yuklanmaydi, takroriy chaqiruvlar unique cheklov orqali
+ON CONFLICT DO NOTHING bilan jim o‘tadi (SQLite >= 3.24 va PostgreSQL).
+"""
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .attendance import mark_records_attendance
+from .likes import count_subquery
+from .models import (
+    AttendanceRecord, AttendanceSession, Collection, CollectionRecord, FloorLeader, Room, Student,
+)
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _now():
+    return connection.ops.adapt_datetimefield_value(timezone.now())
+
+
+def seed_attendance_records(session_ids):
+    """Sessiya qavatidagi (xonaga joylashgan) barcha talabalar uchun 'in' record yaratish"""
+    session_ids = list(session_ids)
+    if not session_ids:
+        return 0
+
+    placeholders = ', '.join(['%s'] * len(session_ids))
+    sql = f"""
+        INSERT INTO {_table(AttendanceRecord)} (session_id, student_id, status, created_at)
+        SELECT sess.id, s.id, %s, %s
+        FROM {_table(AttendanceSession)} sess
+        INNER JOIN {_table(Room)} r ON r.floor_id = sess.floor_id
+        INNER JOIN {_table(Student)} s ON s.room_id = r.id
+        WHERE sess.id IN ({placeholders})
+        ON CONFLICT (session_id, student_id) DO NOTHING
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [AttendanceRecord.Status.IN.value, _now(), *session_ids])
+        return cursor.rowcount
+
+
+def get_or_create_attendance_session(leader):
+    """
+    Bugungi sessiyani olish yoki yaratish. (date, floor) unique cheklovi poygani hal qiladi,
+    shuning uchun takroriy so‘rov xato emas, mavjud sessiyani qaytaradi.
+    """
+    today = timezone.now().date()
+    with transaction.atomic():
+        session, created = AttendanceSession.objects.get_or_create(
+            date=today,
+            floor_id=leader.floor_id,
+            defaults={'leader': leader},
+        )
+        if created:
+            seed_attendance_records([session.id])
+            mark_records_attendance(session.date, AttendanceRecord.objects.filter(session=session))
+    return session, created
+
+
+def create_daily_sessions(date=None):
+    """
+    Sardori bor barcha qavatlar uchun kunlik sessiyalarni bitta batchda yaratish.
+    Mavjud sessiyalarga keyin joylashgan talabalar ham qo‘shiladi.
+    """
+    date = date or timezone.now().date()
+    sql = f"""
+        INSERT INTO {_table(AttendanceSession)} (date, floor_id, leader_id, created_at)
+        SELECT %s, fl.floor_id, MIN(fl.id), %s
+        FROM {_table(FloorLeader)} fl
+        WHERE 1 = 1
+        GROUP BY fl.floor_id
+        ON CONFLICT (date, floor_id) DO NOTHING
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [connection.ops.adapt_datefield_value(date), _now()])
+            created_sessions = cursor.rowcount
+
+        session_ids = list(AttendanceSession.objects.filter(date=date).values_list('id', flat=True))
+        created_records = seed_attendance_records(session_ids)
+        mark_records_attendance(date, AttendanceRecord.objects.filter(session_id__in=session_ids))
+
+    return created_sessions, created_records
+
+
+def seed_collection_records(collection):
+    """Yig‘im qavatidagi barcha talabalar uchun 'To‘lamagan' record yaratish va hisoblagichni yangilash"""
+    sql = f"""
+        INSERT INTO {_table(CollectionRecord)} (collection_id, student_id, status)
+        SELECT %s, s.id, %s
+        FROM {_table(Student)} s
+        INNER JOIN {_table(Room)} r ON s.room_id = r.id
+        WHERE r.floor_id = %s
+        ON CONFLICT (collection_id, student_id) DO NOTHING
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [collection.id, CollectionRecord.Status.UNPAID.value, collection.floor_id])
+        created = cursor.rowcount
+
+    if created:
+        Collection.objects.filter(id=collection.id).update(unpaid_count=F('unpaid_count') + created)
+        collection.refresh_from_db(fields=['unpaid_count'])
+    return created
+
+
+def recount_collection_counts(collection_ids):
+    """
+    paid_count/unpaid_count ni recordlardan qayta hisoblash (bitta UPDATE). Signal yubormaydigan
+    yozuvlardan keyin chaqiriladi: admin panel, QuerySet.update.
+    """
+    records = CollectionRecord.objects.all()
+    return Collection.objects.filter(id__in=collection_ids).update(
+        paid_count=count_subquery(records.filter(status=CollectionRecord.Status.PAID), 'collection'),
+        unpaid_count=count_subquery(records.filter(status=CollectionRecord.Status.UNPAID), 'collection'),
+    )
@@ -1,19 +1,42 @@
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
 from rest_framework.fields import SerializerMethodField
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
 
 from .models import *
-from django.db.models import Sum
+from django.db.models import Prefetch, Sum
 from django.db.models.functions import TruncMonth
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import User as AuthUser
+from django.contrib.auth.models import User as AuthUser, update_last_login
 from django.db import transaction
+from django.conf import settings
 from .models import Application, ApplicationNotification
+from .attendance import longest_streak, days_in_month
+from .auth import ClaimsRefreshToken, find_login_user
+from .images import image_variant_urls
+from .likes import load_like_targets
+from .uploads import ChunkedUploadSerializerMixin, UploadTokenField
+from .seeding import get_or_create_attendance_session, seed_collection_records
 
 User = get_user_model()
 
 
+class ImageVariantsField(serializers.Field):
+    """Rasm uchun srcset uslubidagi xarita: original, thumb, medium va ularning WebP variantlari"""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return image_variant_urls(value, self.context.get('request'))
+
+    def get_attribute(self, instance):
+        # bo'sh rasm maydoni uchun ham to_representation chaqirilsin (None qaytaradi)
+        return super().get_attribute(instance) or None
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -52,11 +75,12 @@ class UserProfileUpdateSerializer(serializers.ModelSerializer):
     last_name = serializers.CharField(source='user.last_name', required=False)
     password = serializers.CharField(write_only=True, required=False, min_length=8)
     image = serializers.ImageField(required=False, allow_null=True)
+    image_srcset = ImageVariantsField(source='image')
 
     class Meta:
         model = UserProfile
-        fields = ['username', 'first_name', 'last_name', 'email', 'password', 'image', 'bio', 'phone', 'birth_date',
-                  'address', 'telegram']
+        fields = ['username', 'first_name', 'last_name', 'email', 'password', 'image', 'image_srcset', 'bio', 'phone',
+                  'birth_date', 'address', 'telegram']
 
     def validate_username(self, value):
         user = self.instance.user
@@ -201,21 +225,30 @@ class GoogleLoginSerializer(serializers.Serializer):
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # rol, yotoqxona va qavat sardori claim lari (main.auth.ClaimsJWTAuthentication uchun)
+    token_class = ClaimsRefreshToken
+
     def validate(self, attrs):
         username_or_email = attrs.get('username')
         password = attrs.get('password')
 
-        # Username orqali qidirish
-        user = User.objects.filter(username=username_or_email).first()
-        # Email orqali qidirish
-        if user is None:
-            user = User.objects.filter(email=username_or_email).first()
+        # Username yoki email bo‘yicha bitta so‘rov; parol bir marta tekshiriladi
+        user, claims = find_login_user(username_or_email)
         if user is None or not user.check_password(password):
             raise serializers.ValidationError('Login yoki parol noto‘g‘ri!')
-
-        data = super().validate({'username': user.username, 'password': password})
-        data['role'] = user.role
-        return data
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        self.user = user
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+
+        refresh = self.token_class.for_user(user, claims)
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'role': user.role,
+        }
 
 
 class ProvinceSerializer(serializers.ModelSerializer):
@@ -231,15 +264,19 @@ class DistrictSerializer(serializers.ModelSerializer):
 
 
 class UniversitySerializer(serializers.ModelSerializer):
+    logo_srcset = ImageVariantsField(source='logo')
+
     class Meta:
         model = University
-        fields = ['id', 'name', 'address', 'description', 'contact', 'logo']
+        fields = ['id', 'name', 'address', 'description', 'contact', 'logo', 'logo_srcset']
 
 
 class UniversityShortSerializer(serializers.ModelSerializer):
+    logo_srcset = ImageVariantsField(source='logo')
+
     class Meta:
         model = University
-        fields = ['id', 'name', 'logo']
+        fields = ['id', 'name', 'logo', 'logo_srcset']
 
 
 class DormitoryShortSerializer(serializers.ModelSerializer):
@@ -255,16 +292,19 @@ class DormitoryShortSerializer(serializers.ModelSerializer):
 
 class DormitoryImageSafeSerializer(serializers.ModelSerializer):
     dormitory = DormitoryShortSerializer(read_only=True)
+    srcset = ImageVariantsField(source='image')
 
     class Meta:
         model = DormitoryImage
-        fields = ['id', 'dormitory', 'image']
+        fields = ['id', 'dormitory', 'image', 'srcset']
 
 
 class DormitoryImageSerializer(serializers.ModelSerializer):
+    srcset = ImageVariantsField(source='image')
+
     class Meta:
         model = DormitoryImage
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'srcset']
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -322,10 +362,16 @@ class DormitorySafeSerializer(serializers.ModelSerializer):
     def get_admin_telegram(self, obj):
         return getattr(obj.admin.profile, 'telegram', None)
 
+    # ro‘yxatda sonlar queryset annotatsiyasidan olinadi (views._with_dormitory_list_data),
+    # bitta obyekt uchun esa alohida so‘rov bilan hisoblanadi
     def get_total_capacity(self, obj):
+        if hasattr(obj, 'total_capacity'):
+            return obj.total_capacity
         return Room.objects.filter(floor__dormitory=obj).aggregate(total=Sum('capacity'))['total'] or 0
 
     def get_available_capacity(self, obj):
+        if hasattr(obj, 'available_capacity'):
+            return obj.available_capacity
         rooms = Room.objects.filter(floor__dormitory=obj)
         available = 0
         for room in rooms:
@@ -333,12 +379,18 @@ class DormitorySafeSerializer(serializers.ModelSerializer):
         return available
 
     def get_accepted_students(self, obj):
+        if hasattr(obj, 'accepted_students'):
+            return obj.accepted_students
         return Student.objects.filter(dormitory=obj, placement_status='Joylashdi').count()
 
     def get_approved_applications(self, obj):
+        if hasattr(obj, 'approved_applications'):
+            return obj.approved_applications
         return Application.objects.filter(dormitory=obj, status='APPROVED').count()
 
     def get_total_rooms(self, obj):
+        if hasattr(obj, 'total_rooms'):
+            return obj.total_rooms
         return Room.objects.filter(floor__dormitory=obj).count()
 
 
@@ -493,11 +545,12 @@ class StudentSafeSerializer(serializers.ModelSerializer):
     payments = PaymentShortSerializer(read_only=True, many=True)
     total_payment = SerializerMethodField()
     picture = SerializerMethodField()
+    picture_srcset = ImageVariantsField(source='picture')
 
     class Meta:
         model = Student
         fields = ['id', 'name', 'last_name', 'middle_name', 'province', 'district', 'faculty',
-                  'direction', 'dormitory', 'floor', 'room', 'phone', 'picture', 'privilege',
+                  'direction', 'dormitory', 'floor', 'room', 'phone', 'picture', 'picture_srcset', 'privilege',
                   'payments', 'total_payment', 'accepted_date', 'group', 'passport', 'course',
                   'gender', 'placement_status', 'passport_image_first', 'passport_image_second', 'status',
                   'privilege_share', 'document']
@@ -518,7 +571,7 @@ class StudentSafeSerializer(serializers.ModelSerializer):
 class StudentDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Student
-        fields = '__all__'
+        exclude = ['picture_variants']
 
 
 class StudentCreateSerializer(serializers.ModelSerializer):
@@ -599,7 +652,7 @@ class StudentCreateSerializer(serializers.ModelSerializer):
         return StudentDetailSerializer(instance).data
 
 
-class StudentUpdateSerializer(serializers.ModelSerializer):
+class StudentUpdateSerializer(ChunkedUploadSerializerMixin, serializers.ModelSerializer):
     province = serializers.PrimaryKeyRelatedField(queryset=Province.objects.all(), write_only=True, required=False)
     district = serializers.PrimaryKeyRelatedField(queryset=District.objects.all(), write_only=True, required=False)
     floor = serializers.PrimaryKeyRelatedField(queryset=Floor.objects.all(), write_only=True, required=False)
@@ -608,6 +661,11 @@ class StudentUpdateSerializer(serializers.ModelSerializer):
     passport_image_first = serializers.ImageField(required=False)
     passport_image_second = serializers.ImageField(required=False)
     document = serializers.FileField(required=False)
+    # katta fayllar uchun: /uploads/ orqali bo'laklab yuklangan fayl tokeni
+    picture_upload = UploadTokenField(source='picture', image=True)
+    passport_image_first_upload = UploadTokenField(source='passport_image_first', image=True)
+    passport_image_second_upload = UploadTokenField(source='passport_image_second', image=True)
+    document_upload = UploadTokenField(source='document')
 
     class Meta:
         model = Student
@@ -615,7 +673,8 @@ class StudentUpdateSerializer(serializers.ModelSerializer):
             'id', 'name', 'last_name', 'middle_name', 'province', 'district', 'faculty',
             'direction', 'floor', 'room', 'phone', 'picture', 'privilege', 'accepted_date',
             'passport', 'group', 'course', 'gender', 'passport_image_first', 'passport_image_second',
-            'privilege_share', 'document'
+            'privilege_share', 'document', 'picture_upload', 'passport_image_first_upload',
+            'passport_image_second_upload', 'document_upload',
         ]
         read_only_fields = ['accepted_date', 'user']
 
@@ -663,30 +722,37 @@ class ApplicationSafeSerializer(serializers.ModelSerializer):
     user = UserShortSerializer(read_only=True)
     province = ProvinceSerializer(read_only=True)
     district = DistrictSerializer(read_only=True)
+    user_image_srcset = ImageVariantsField(source='user_image')
 
     class Meta:
         model = Application
         fields = ['id', 'user', 'dormitory', 'name', 'last_name', 'middle_name', 'province',
                   'district', 'faculty', 'direction', 'course', 'group', 'phone', 'passport',
-                  'status', 'comment', 'admin_comment', 'document', 'user_image',
+                  'status', 'comment', 'admin_comment', 'document', 'user_image', 'user_image_srcset',
                   'passport_image_first', 'passport_image_second', 'created_at',
                   ]
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(ChunkedUploadSerializerMixin, serializers.ModelSerializer):
     dormitory = serializers.PrimaryKeyRelatedField(queryset=Dormitory.objects.all(), write_only=True)
     passport_image_first = serializers.ImageField(required=False)
     passport_image_second = serializers.ImageField(required=False)
     user_image = serializers.ImageField(required=False)
     province = serializers.PrimaryKeyRelatedField(queryset=Province.objects.all(), write_only=True, required=False)
     district = serializers.PrimaryKeyRelatedField(queryset=District.objects.all(), write_only=True, required=False)
+    # katta fayllar uchun: /uploads/ orqali bo'laklab yuklangan fayl tokeni
+    user_image_upload = UploadTokenField(source='user_image', image=True)
+    passport_image_first_upload = UploadTokenField(source='passport_image_first', image=True)
+    passport_image_second_upload = UploadTokenField(source='passport_image_second', image=True)
+    document_upload = UploadTokenField(source='document')
 
     class Meta:
         model = Application
         fields = ['id', 'dormitory', 'name', 'last_name', 'middle_name', 'province',
                   'district', 'faculty', 'direction', 'course', 'group', 'phone',
                   'passport', 'status', 'comment', 'admin_comment', 'document', 'user_image',
-                  'passport_image_first', 'passport_image_second',
+                  'passport_image_first', 'passport_image_second', 'user_image_upload',
+                  'passport_image_first_upload', 'passport_image_second_upload', 'document_upload',
                   ]
 
     def create(self, validated_data):
@@ -794,15 +860,19 @@ class MonthlyRevenueSerializer(serializers.Serializer):
 
 
 class ApartmentImageSafeSerializer(serializers.ModelSerializer):
+    srcset = ImageVariantsField(source='image')
+
     class Meta:
         model = ApartmentImage
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'srcset']
 
 
 class ApartmentImageSerializer(serializers.ModelSerializer):
+    srcset = ImageVariantsField(source='image')
+
     class Meta:
         model = ApartmentImage
-        fields = ['id', 'apartment', 'image', 'uploaded_at']
+        fields = ['id', 'apartment', 'image', 'srcset', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_at']
 
 
@@ -920,8 +990,14 @@ class LikeSerializer(serializers.ModelSerializer):
         read_only_fields = ['user', 'created_at']
 
     def get_data(self, obj):
+        # UserLikesAPIView barcha obyektlarni oldindan yuklab context orqali beradi
+        targets = self.context.get('like_targets')
+        if targets is None:
+            targets = load_like_targets([obj])
+        target = targets.get((obj.content_type, obj.object_id))
+
         if obj.content_type == 'dormitory':
-            dormitory = Dormitory.objects.filter(id=obj.object_id).first()
+            dormitory = target
             if dormitory:
                 return {
                     "type": "dormitory",
@@ -935,11 +1011,11 @@ class LikeSerializer(serializers.ModelSerializer):
                     "is_active": dormitory.is_active,
                     "university_name": dormitory.university.name if dormitory.university else None,
                     "admin_username": dormitory.admin.username if dormitory.admin else None,
-                    "total_students": Student.objects.filter(dormitory=dormitory).count(),
-                    "approved_applications": Application.objects.filter(dormitory=dormitory, status='APPROVED').count(),
+                    "total_students": dormitory.total_students,
+                    "approved_applications": dormitory.approved_applications,
                 }
         elif obj.content_type == 'apartment':
-            apartment = Apartment.objects.filter(id=obj.object_id).first()
+            apartment = target
             if apartment:
                 return {
                     "type": "apartment",
@@ -967,18 +1043,9 @@ class LikeCreateSerializer(serializers.ModelSerializer):
         fields = ['content_type', 'object_id']
 
     def validate(self, attrs):
-        content_type = attrs.get('content_type')
-        object_id = attrs.get('object_id')
-
-        if content_type == 'dormitory':
-            if not Dormitory.objects.filter(id=object_id).exists():
-                raise serializers.ValidationError("Dormitory topilmadi")
-        elif content_type == 'apartment':
-            if not Apartment.objects.filter(id=object_id).exists():
-                raise serializers.ValidationError("Apartment topilmadi")
-        else:
+        # obyekt mavjudligi toggle_like ichida, INSERT ning o'zida tekshiriladi
+        if attrs.get('content_type') not in ('dormitory', 'apartment'):
             raise serializers.ValidationError("Noto'g'ri content_type")
-
         return attrs
 
 
@@ -1117,21 +1184,34 @@ class AttendanceSessionSafeSerializer(serializers.ModelSerializer):
         model = AttendanceSession
         fields = ["id", "date", "floor", "leader", "rooms", 'exist_students', 'absent_students']
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # compact rejimda (ro‘yxat) xonalar bo‘yicha guruhlash hisoblanmaydi
+        if self.context.get('compact'):
+            self.fields.pop('rooms', None)
+
     def get_exist_students(self, obj):
+        if hasattr(obj, 'exist_count'):
+            return obj.exist_count
         records = getattr(obj, "records", None)
         if records is None:
             return 0
         return records.filter(status="in").count()
 
     def get_absent_students(self, obj):
+        if hasattr(obj, 'absent_count'):
+            return obj.absent_count
         records = getattr(obj, "records", None)
         if records is None:
             return 0
         return records.filter(status="out").count()
 
     def get_rooms(self, obj):
-        # sessionga tegishli barcha recordlarni olib kelamiz
-        records = obj.records.select_related("student__room").all().order_by("student__room__name")
+        # sessionga tegishli barcha recordlarni olib kelamiz (prefetch bo‘lsa qayta so‘rov yo‘q)
+        if 'records' in getattr(obj, '_prefetched_objects_cache', {}):
+            records = obj.records.all()
+        else:
+            records = obj.records.select_related("student__room").all().order_by("student__room__name")
 
         grouped = {}
         for record in records:
@@ -1175,26 +1255,9 @@ class AttendanceSessionSerializer(serializers.ModelSerializer):
         except FloorLeader.DoesNotExist:
             raise serializers.ValidationError(" Siz qavat sardori emassiz!")
 
-        today = timezone.now().date()
-
-        #  Bugungi kunda shu qavat uchun sessiya allaqachon bormi?
-        if AttendanceSession.objects.filter(date=today, floor=leader.floor).exists():
-            raise serializers.ValidationError(" Bugungi kunda ushbu qavat uchun davomat allaqachon yaratilgan!")
-
-        #  Session yaratish
-        session = AttendanceSession.objects.create(
-            floor=leader.floor,
-            leader=leader,
-        )
-
-        # Shu qavatdagi barcha studentlar uchun AttendanceRecord yaratish
-        students = Student.objects.filter(room__floor=leader.floor).only("id")
-        records = [
-            AttendanceRecord(session=session, student=student, status=AttendanceRecord.Status.IN)
-            for student in students
-        ]
-        AttendanceRecord.objects.bulk_create(records)
-
+        #  Bugungi sessiya bo‘lsa o‘shani qaytaramiz (idempotent), aks holda yaratib
+        #  qavatdagi barcha studentlar uchun AttendanceRecord larni bitta INSERT ... SELECT bilan qo‘shamiz
+        session, created = get_or_create_attendance_session(leader)
         return session
 
 
@@ -1208,6 +1271,47 @@ class AttendanceRecordBulkUpdateSerializer(serializers.Serializer):
     records = serializers.ListField(child=AttendanceRecordUpdateItemSerializer())
 
 
+class AttendanceMonthSerializer(serializers.ModelSerializer):
+    """Oylik davomat bitmapidan hisoblangan statistika"""
+    student = StudentShortSerializer(read_only=True)
+    room = serializers.CharField(source='student.room.name', read_only=True, default=None)
+    recorded_days = serializers.SerializerMethodField()
+    days_in = serializers.SerializerMethodField()
+    days_out = serializers.SerializerMethodField()
+    longest_absence_streak = serializers.SerializerMethodField()
+    heatmap = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AttendanceMonth
+        fields = ['id', 'student', 'room', 'year', 'month', 'recorded_days', 'days_in', 'days_out',
+                  'longest_absence_streak', 'heatmap']
+
+    def get_recorded_days(self, obj):
+        return obj.recorded_mask.bit_count()
+
+    def get_days_in(self, obj):
+        return (obj.recorded_mask & ~obj.out_mask).bit_count()
+
+    def get_days_out(self, obj):
+        return obj.out_mask.bit_count()
+
+    def get_longest_absence_streak(self, obj):
+        return longest_streak(obj.out_mask, days_in_month(obj.year, obj.month))
+
+    def get_heatmap(self, obj):
+        # har bir kun uchun: "in", "out" yoki None (davomat olinmagan)
+        heatmap = []
+        for day in range(days_in_month(obj.year, obj.month)):
+            bit = 1 << day
+            if not obj.recorded_mask & bit:
+                heatmap.append(None)
+            elif obj.out_mask & bit:
+                heatmap.append(AttendanceRecord.Status.OUT.value)
+            else:
+                heatmap.append(AttendanceRecord.Status.IN.value)
+        return heatmap
+
+
 class CollectionRecordSerializer(serializers.ModelSerializer):
     student = StudentShortSerializer(read_only=True)
     student_id = serializers.PrimaryKeyRelatedField(
@@ -1281,6 +1385,7 @@ class CollectionSerializer(serializers.ModelSerializer):
         fields = ["id", "title", "amount", "description", "deadline", "floor", "leader", "records", "created_at"]
         read_only_fields = ["id", "floor", "leader", "records", "created_at"]
 
+    @transaction.atomic
     def create(self, validated_data):
         request = self.context.get("request")
         user = request.user
@@ -1298,15 +1403,13 @@ class CollectionSerializer(serializers.ModelSerializer):
             **validated_data
         )
 
-        # Shu qavatdagi barcha studentlar uchun CollectionRecord yaratish
-        students = Student.objects.filter(room__floor=leader.floor).only("id")
-        records = [
-            CollectionRecord(collection=collection, student=student, status=CollectionRecord.Status.UNPAID)
-            for student in students
-        ]
-        CollectionRecord.objects.bulk_create(records)
+        # Shu qavatdagi barcha studentlar uchun CollectionRecord yaratish (hammasi to‘lamagan)
+        seed_collection_records(collection)
 
-        return collection
+        # javobdagi records (student bilan) har bir talaba uchun alohida so‘rov qilmasin
+        return Collection.objects.select_related('floor', 'leader__user').prefetch_related(
+            Prefetch('records', queryset=CollectionRecord.objects.select_related('student').order_by('id'))
+        ).get(pk=collection.pk)
 
 
 class CollectionRecordUpdateItemSerializer(serializers.Serializer):
@@ -1319,6 +1422,17 @@ class CollectionRecordBulkUpdateSerializer(serializers.Serializer):
     """Collection recordlarni bulk update qilish uchun"""
     records = serializers.ListField(child=CollectionRecordUpdateItemSerializer())
 
+    def validate_records(self, value):
+        seen = set()
+        errors = []
+        for item in value:
+            if item['id'] in seen:
+                errors.append({"id": item['id'], "detail": "Record bir necha marta yuborilgan"})
+            seen.add(item['id'])
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
 
 class StatisticForLeaderSerializer(serializers.Serializer):
     active_students = serializers.IntegerField()
@@ -1362,7 +1476,7 @@ class ForStudentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Student
-        fields = "__all__"
+        exclude = ["picture_variants"]
         read_only_fields = ["id", "user"]
 
     def get_roommates(self, obj):
@@ -1403,3 +1517,20 @@ class DutyScheduleSerializer(serializers.ModelSerializer):
         validated_data['floor'] = leader.floor
         return super().create(validated_data)
 
+
+class ChunkedUploadCreateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    token = serializers.UUIDField(source='id', read_only=True)
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUpload
+        fields = ['token', 'filename', 'size', 'offset', 'status', 'sha256', 'chunk_size', 'created_at']
+        read_only_fields = fields
+
+    def get_chunk_size(self, obj):
+        return settings.CHUNKED_UPLOAD_CHUNK_SIZE
@@ -1,9 +1,15 @@
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models.signals import post_save, pre_save, post_delete
+from django.db.models import F
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
 # from channels.layers import get_channel_layer
 # from asgiref.sync import async_to_sync
-from .models import Application, Payment, User, UserProfile, Notification, UserNotification, ApplicationNotification, Task, Floor, Room, Student
+from .models import Application, Payment, User, UserProfile, Dormitory, FloorLeader, Notification, UserNotification, ApplicationNotification, Task, Floor, Room, Student, Collection, CollectionRecord, \
+    AttendanceSession, AttendanceRecord, Like, DormitoryImage, ApartmentImage, University
+from .attendance import mark_attendance, unmark_attendance
+from .auth import revoke_claims
+from .images import IMAGE_FIELDS, schedule_variants, variant_names, variants_field
+from .likes import change_like_count, invalidate_liked_ids
 from django.utils import timezone
 from django.db import transaction
 from rest_framework import serializers
@@ -15,6 +21,39 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
 
 
+@receiver(post_save, sender=User)
+def revoke_user_token_claims(sender, instance, created, update_fields=None, **kwargs):
+    # login dagi last_login yangilanishi rol/huquqlarni o‘zgartirmaydi
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    revoke_claims(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_token_claims(sender, instance, **kwargs):
+    revoke_claims(instance.pk)
+
+
+@receiver(pre_save, sender=Dormitory)
+@receiver(pre_save, sender=FloorLeader)
+def revoke_relation_token_claims(sender, instance, **kwargs):
+    """Yotoqxona admini yoki qavat sardori o‘zgarsa eski va yangi foydalanuvchi claim lari eskiradi"""
+    field = 'admin_id' if sender is Dormitory else 'user_id'
+    previous = None
+    if not instance._state.adding:
+        previous = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+    current = getattr(instance, field)
+    if previous != current:
+        for user_id in {previous, current} - {None}:
+            revoke_claims(user_id)
+
+
+@receiver(post_delete, sender=Dormitory)
+@receiver(post_delete, sender=FloorLeader)
+def revoke_deleted_relation_token_claims(sender, instance, **kwargs):
+    revoke_claims(instance.admin_id if sender is Dormitory else instance.user_id)
+
+
 @receiver(post_save, sender=Application)
 def create_application_notification(sender, instance, created, **kwargs):
     if created:
@@ -226,3 +265,57 @@ def update_room_on_delete(sender, instance, **kwargs):
     if instance.room:
         update_room_status(instance.room)
 
+
+@receiver(post_delete, sender=CollectionRecord)
+def update_collection_counts_on_delete(sender, instance, **kwargs):
+    """Record o‘chirilganda (masalan student o‘chsa) yig‘im hisoblagichlarini kamaytirish"""
+    if instance.status == CollectionRecord.Status.PAID:
+        field = 'paid_count'
+    else:
+        field = 'unpaid_count'
+    Collection.objects.filter(id=instance.collection_id, **{f'{field}__gt': 0}).update(**{field: F(field) - 1})
+
+
+@receiver(post_save, sender=AttendanceRecord)
+def update_attendance_month_on_save(sender, instance, **kwargs):
+    """Bitta record saqlanganda (masalan admin paneldan) oylik bitmapni yangilash"""
+    if instance.status == AttendanceRecord.Status.OUT:
+        mark_attendance(instance.session.date, out_student_ids=[instance.student_id])
+    else:
+        mark_attendance(instance.session.date, in_student_ids=[instance.student_id])
+
+
+@receiver(pre_delete, sender=AttendanceSession)
+def clear_attendance_month_on_session_delete(sender, instance, **kwargs):
+    """Sessiya o‘chirilsa shu kun bitlarini tozalash"""
+    student_ids = list(instance.records.values_list('student_id', flat=True))
+    if student_ids:
+        unmark_attendance(instance.date, student_ids)
+
+
+@receiver(post_save, sender=Like)
+def increment_like_count(sender, instance, created, **kwargs):
+    if created:
+        change_like_count(instance.content_type, instance.object_id, 1)
+        invalidate_liked_ids(instance.user_id, instance.content_type)
+
+
+@receiver(post_delete, sender=Like)
+def decrement_like_count(sender, instance, **kwargs):
+    change_like_count(instance.content_type, instance.object_id, -1)
+    invalidate_liked_ids(instance.user_id, instance.content_type)
+
+
+@receiver(post_save, sender=DormitoryImage)
+@receiver(post_save, sender=ApartmentImage)
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Application)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_save, sender=University)
+def create_image_variants(sender, instance, **kwargs):
+    """Yangi yoki almashtirilgan rasm uchun thumb/medium/WebP variantlarni fonda yaratish"""
+    for field_name in IMAGE_FIELDS[sender.__name__]:
+        image = getattr(instance, field_name)
+        # yozilgan variantlar joriy rasmga tegishli bo‘lsa diskka qaramasdan o‘tkazib yuboriladi
+        if image and getattr(instance, variants_field(field_name)) != variant_names(image.name):
+            schedule_variants(image.name)
@@ -0,0 +1,158 @@
+"""
+Kontent-adresli fayl saqlash: fayl nomi uning SHA-256 hashidan olinadi.
+Bir xil fayl qayta yuklansa (yoki Application dan Student ga ko‘chirilsa) diskda bitta nusxa qoladi:
+passport_image/3f/3fa9...c1.jpg. Fayllarga havolalar modellar bo‘yicha sanaladi (file_references),
+hech kim ishlatmayotgan fayllarni `python manage.py gc_media` o‘chiradi.
+"""
+import hashlib
+import os
+import re
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+
+HASHED_NAME_RE = re.compile(r'^(?P<hash>[0-9a-f]{64})(?P<suffix>_[a-z_]+)?\.[a-z0-9]+$')
+
+
+def _has_protected_prefix(name):
+    return name.startswith(tuple(getattr(settings, 'PROTECTED_MEDIA_PREFIXES', ())))
+
+
+def protected_fields():
+    """Himoyalangan storage (ProtectedContentAddressedStorage) ishlatadigan (model, field) juftlari"""
+    return [(model, field) for model, field in content_addressed_fields() if field.storage.protected]
+
+
+def is_protected(name):
+    """
+    Fayl berishda (media.serve_media) ishlatiladi: papka prefiksi yoki upload_to='' davrida MEDIA_ROOT
+    ildiziga yuklangan himoyalangan maydon qiymati. URL qurishda so‘rov yo‘q: storage.protected yetarli.
+    """
+    if _has_protected_prefix(name):
+        return True
+    # ildizdagi fayl uchungina so‘rov: rasmlar va yangi fayllar papkalarda
+    if not name or '/' in name:
+        return False
+    return any(model._base_manager.filter(**{field.name: name}).exists() for model, field in protected_fields())
+
+
+def _media_signature(name, expires):
+    return signing.Signer(salt='main.media').signature(f"{name}:{expires}")
+
+
+def signed_query(name):
+    """
+    Himoyalangan fayl uchun vaqtinchalik imzo. Muddat TTL oralig‘iga yaxlitlanadi, shuning uchun
+    bir oraliqda URL o‘zgarmaydi va brauzer keshi ishlaydi.
+    """
+    ttl = getattr(settings, 'PROTECTED_MEDIA_URL_TTL', 3600)
+    expires = (int(time.time()) // ttl + 2) * ttl
+    return urlencode({'expires': expires, 'signature': _media_signature(name, expires)})
+
+
+def check_signature(name, expires, signature):
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires < time.time():
+        return False
+    return signing.constant_time_compare(signature or '', _media_signature(name, expires))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    protected = False
+
+    def url(self, name):
+        url = super().url(name)
+        if name and (self.protected or _has_protected_prefix(name)):
+            url = f"{url}?{signed_query(name)}"
+        return url
+
+    def hashed_name(self, name, digest):
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        return os.path.join(directory, digest[:2], f"{digest}{extension}")
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        name = self.hashed_name(name, digest.hexdigest())
+        try:
+            return super().save(name, content, max_length=max_length)
+        except FileExistsError:
+            if not self.exists(name):
+                raise
+            # xuddi shu kontent allaqachon bor (yoki parallel so‘rov hozir yozmoqda): o‘sha nomni qaytaramiz
+            return name
+
+    def get_available_name(self, name, max_length=None):
+        """
+        Hash nom kontentni to‘liq aniqlaydi, unga _XXXXXXX suffiks qo‘shilmaydi (HASHED_NAME_RE tanimay qoladi).
+        Band nom uchun FileExistsError: save() uni ushlaydi. _save() ning O_EXCL poygasida ham shu metod
+        chaqiriladi, shuning uchun bir vaqtda yuklangan ikki nusxa ham bitta nomga tushadi.
+        """
+        if self.exists(name):
+            raise FileExistsError(name)
+        return name
+
+
+class ProtectedContentAddressedStorage(ContentAddressedStorage):
+    """Pasport rasmlari va hujjatlar: URL har doim imzolanadi, fayl ildizda (eski yuklash) bo‘lsa ham"""
+    protected = True
+
+
+_content_storage = None
+_protected_content_storage = None
+
+
+def content_storage():
+    """FileField(storage=...) uchun callable: migratsiyalarda storage sozlamalari saqlanmaydi"""
+    global _content_storage
+    if _content_storage is None:
+        _content_storage = ContentAddressedStorage()
+    return _content_storage
+
+
+def protected_content_storage():
+    global _protected_content_storage
+    if _protected_content_storage is None:
+        _protected_content_storage = ProtectedContentAddressedStorage()
+    return _protected_content_storage
+
+
+def content_addressed_fields():
+    """ContentAddressedStorage ishlatadigan (model, field) juftlari"""
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def file_references():
+    """Barcha modellardagi FileField qiymatlari bo‘yicha har bir fayl nomiga havolalar soni"""
+    references = Counter()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if not isinstance(field, models.FileField):
+                continue
+            names = model._base_manager.exclude(**{field.name: ''}).exclude(**{f"{field.name}__isnull": True})
+            references.update(names.values_list(field.name, flat=True).iterator())
+    return references
@@ -0,0 +1,395 @@
+"""
+Benchmark va yuklama testlari uchun sintetik ma'lumotlar generatori.
+
+Hamma narsa bulk_create bilan yoziladi, shuning uchun signallar ishlamaydi: xona bandligi,
+talaba statusi, profillar va bitmaplar shu yerning o‘zida hisoblanadi. Bir xil seed bir xil
+ma'lumot beradi.
+"""
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from .attendance import rebuild_attendance_months
+from .likes import recount_like_counts
+from .models import (
+    Amenity, Apartment, ApartmentImage, Application, ApplicationNotification, AttendanceRecord,
+    AttendanceSession, Collection, CollectionRecord, District, Dormitory, DormitoryImage, DutySchedule,
+    Floor, FloorLeader, Like, Notification, Payment, Province, Room, Rule, Student, Task, TaskForLeader,
+    University, User, UserNotification, UserProfile,
+)
+
+DEFAULT_PASSWORD = 'benchmark-password'
+
+FIRST_NAMES = ['Ali', 'Vali', 'Aziz', 'Jasur', 'Sardor', 'Bekzod', 'Dilshod', 'Madina', 'Malika', 'Nilufar',
+               'Shahzod', 'Kamola', 'Zarina', 'Otabek', 'Javohir', 'Gulnoza', 'Sevara', 'Islom', 'Rustam', 'Diyora']
+LAST_NAMES = ['Karimov', 'Aliyev', 'Tursunov', 'Rahimov', 'Yusupov', 'Saidova', 'Qodirova', 'Ergashev',
+              'Nazarov', 'Xolmatov', 'Abdullayev', 'Mirzayev', 'Sobirova', 'Usmonov', 'Hasanova']
+PROVINCES = ['Toshkent', 'Samarqand', 'Buxoro', 'Farg‘ona', 'Andijon', 'Namangan', 'Qashqadaryo',
+             'Surxondaryo', 'Xorazm', 'Navoiy', 'Jizzax', 'Sirdaryo', 'Qoraqalpog‘iston', 'Toshkent viloyati']
+AMENITIES = ['WiFi', 'Konditsioner', 'Kir yuvish mashinasi', 'Oshxona', 'Sport zal', 'Kutubxona', 'Dush']
+
+ROOMS_PER_FLOOR = 10
+ROOM_CAPACITY = 4
+DISTRICTS_PER_PROVINCE = 5
+UNIVERSITIES = 20
+
+
+@contextmanager
+def manual_timestamps():
+    """auto_now_add maydonlarini vaqtincha o‘chirish (tarixiy sanalar yozish uchun)"""
+    fields = [
+        field
+        for model in (Student, Application, Payment, AttendanceSession, AttendanceRecord, Notification,
+                      UserNotification, ApplicationNotification, Like, Task)
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class SyntheticDataGenerator:
+    def __init__(self, students_per_dormitory=500, months=12, attendance_days=7, seed=42, batch_size=2000):
+        self.students_per_dormitory = students_per_dormitory
+        self.months = months
+        self.attendance_days = attendance_days
+        self.seed = seed
+        self.batch_size = batch_size
+        self.now = timezone.now().replace(microsecond=0)
+        self.today = self.now.date()
+        self._password = None
+
+    @property
+    def password(self):
+        # PBKDF2 bir marta hisoblanadi, barcha foydalanuvchilar bir xil hashni oladi
+        if self._password is None:
+            self._password = make_password(DEFAULT_PASSWORD)
+        return self._password
+
+    def _bulk(self, model, objs):
+        return model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def _users(self, usernames, role, rng):
+        users = self._bulk(User, [
+            User(username=username, role=role, password=self.password, email=None,
+                 first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES))
+            for username in usernames
+        ])
+        self._bulk(UserProfile, [
+            UserProfile(user=user, phone=f"+99890{rng.randint(1000000, 9999999)}", telegram=f"@{user.username}")
+            for user in users
+        ])
+        return users
+
+    def create_reference_data(self):
+        """Viloyat, tuman, universitet va qulayliklar (bir marta)"""
+        if Province.objects.exists():
+            return
+        rng = random.Random(self.seed)
+        provinces = self._bulk(Province, [Province(name=name) for name in PROVINCES])
+        self._bulk(District, [
+            District(name=f"{province.name} {i + 1}-tuman", province=province)
+            for province in provinces for i in range(DISTRICTS_PER_PROVINCE)
+        ])
+        self._bulk(University, [
+            University(name=f"Universitet {i + 1}", address=f"{rng.choice(PROVINCES)}, {i + 1}-ko‘cha",
+                       description="Sintetik universitet")
+            for i in range(UNIVERSITIES)
+        ])
+        self._bulk(Amenity, [Amenity(name=name) for name in AMENITIES])
+
+    def _reference(self):
+        districts = list(District.objects.values_list('id', 'province_id'))
+        universities = list(University.objects.values_list('id', flat=True))
+        amenities = list(Amenity.objects.values_list('id', flat=True))
+        return districts, universities, amenities
+
+    def _passport(self, index, number):
+        return f"{chr(65 + (index // 26) % 26)}{chr(65 + index % 26)}{number:07d}"
+
+    @transaction.atomic
+    def create_dormitory(self, index):
+        """Bitta yotoqxona: admin, qavatlar, xonalar, talabalar, to‘lovlar, arizalar, davomat, yig‘imlar"""
+        rng = random.Random(self.seed * 1000003 + index)
+        districts, universities, amenities = self._reference()
+
+        admin, = self._users([f"admin_{index}"], 'admin', rng)
+        dormitory = Dormitory.objects.create(
+            name=f"Yotoqxona {index + 1}", address=f"{rng.choice(PROVINCES)}, {index + 1}-uy",
+            university_id=rng.choice(universities), admin=admin, description="Sintetik yotoqxona",
+            month_price=rng.randrange(300_000, 900_000, 50_000), year_price=rng.randrange(3_000_000, 9_000_000, 500_000),
+            latitude=41 + rng.random(), longitude=69 + rng.random(), rating=rng.randint(1, 5),
+            distance_to_university=round(rng.uniform(0.2, 10), 1),
+        )
+        dormitory.amenities.set(rng.sample(amenities, k=min(3, len(amenities))))
+        self._bulk(DormitoryImage, [DormitoryImage(dormitory=dormitory, image='dormitory_images/fon.jpg')
+                                    for _ in range(3)])
+        self._bulk(Rule, [Rule(dormitory=dormitory, rule=f"{i + 1}-qoida") for i in range(5)])
+        with manual_timestamps():
+            self._bulk(Task, [Task(user=admin, description=f"Vazifa {i + 1}", status=rng.choice(['PENDING', 'COMPLETED']),
+                                   created_at=self.now - timedelta(days=i)) for i in range(10)])
+
+        per_floor = ROOMS_PER_FLOOR * ROOM_CAPACITY
+        floor_count = max(1, -(-self.students_per_dormitory // per_floor))
+        floors = self._bulk(Floor, [
+            Floor(name=f"{i + 1}-qavat", dormitory=dormitory, gender='male' if i % 2 == 0 else 'female')
+            for i in range(floor_count)
+        ])
+        rooms = self._bulk(Room, [
+            Room(name=f"{floor_number + 1}{r + 1:02d}", floor=floor, capacity=ROOM_CAPACITY, gender=floor.gender)
+            for floor_number, floor in enumerate(floors) for r in range(ROOMS_PER_FLOOR)
+        ])
+
+        # Talabalar: 90% joylashgan, qolgani faqat qabul qilingan
+        student_users = self._users(
+            [f"student_{index}_{i}" for i in range(self.students_per_dormitory)], 'student', rng
+        )
+        students = []
+        for i, user in enumerate(student_users):
+            placed = i < int(self.students_per_dormitory * 0.9)
+            room = rooms[i // ROOM_CAPACITY] if placed else None
+            district_id, province_id = rng.choice(districts)
+            students.append(Student(
+                user=user, name=user.first_name, last_name=user.last_name, middle_name=rng.choice(FIRST_NAMES),
+                province_id=province_id, district_id=district_id, faculty="Fakultet", direction="Yo‘nalish",
+                dormitory=dormitory, floor_id=room.floor_id if room else None, room=room,
+                passport=self._passport(index, i), group=f"{rng.randint(100, 999)}-guruh",
+                course=f"{rng.randint(1, 5)}-kurs", gender='Erkak' if room is None or room.gender == 'male' else 'Ayol',
+                phone=f"+99891{rng.randint(1000000, 9999999)}", placement_status='Joylashdi' if placed else 'Qabul qilindi',
+                status='Tekshirilmaydi', accepted_date=self.now - timedelta(days=rng.randint(0, 30 * self.months)),
+            ))
+
+        # To‘lovlar: har oy uchun bittadan, ba'zilari to‘lanmagan (qarzdorlar)
+        payments = []
+        for student in students:
+            if student.placement_status != 'Joylashdi':
+                continue
+            debtor = rng.random() < 0.15
+            last_valid = None
+            for month in range(self.months, 0, -1):
+                if debtor and month <= 2:
+                    continue
+                paid_date = self.now - timedelta(days=30 * month)
+                last_valid = (paid_date + timedelta(days=30)).date()
+                payments.append(Payment(
+                    student=student, dormitory=dormitory, amount=dormitory.month_price, paid_date=paid_date,
+                    valid_until=last_valid, method=rng.choice(['Cash', 'Card']),
+                    status='APPROVED' if rng.random() < 0.97 else 'CANCELLED',
+                ))
+            student.status = 'Haqdor' if last_valid and last_valid >= self.today else 'Qarzdor'
+
+        with manual_timestamps():
+            students = self._bulk(Student, students)
+            self._bulk(Payment, payments)
+
+        occupancy = {}
+        for student in students:
+            if student.room_id:
+                occupancy[student.room_id] = occupancy.get(student.room_id, 0) + 1
+        for room in rooms:
+            room.currentOccupancy = occupancy.get(room.id, 0)
+            if room.currentOccupancy == 0:
+                room.status = 'AVAILABLE'
+            elif room.currentOccupancy < room.capacity:
+                room.status = 'PARTIALLY_OCCUPIED'
+            else:
+                room.status = 'FULLY_OCCUPIED'
+        Room.objects.bulk_update(rooms, ['currentOccupancy', 'status'], batch_size=self.batch_size)
+
+        applications = []
+        for i, student in enumerate(students):
+            if i % 5 == 0:
+                applications.append(Application(
+                    user=student.user, dormitory=dormitory, name=student.name, last_name=student.last_name,
+                    province_id=student.province_id, district_id=student.district_id, course=student.course,
+                    phone=student.phone, passport=student.passport, status='APPROVED',
+                    created_at=student.accepted_date - timedelta(days=3),
+                ))
+        for i in range(max(1, self.students_per_dormitory // 10)):
+            district_id, province_id = rng.choice(districts)
+            applications.append(Application(
+                dormitory=dormitory, name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                province_id=province_id, district_id=district_id, phone=f"+99893{rng.randint(1000000, 9999999)}",
+                passport=self._passport(index, 5_000_000 + i), status='PENDING' if i % 2 == 0 else rng.choice(['REJECTED', 'CANCELLED']),
+                created_at=self.now - timedelta(days=rng.randint(0, 60)),
+            ))
+        with manual_timestamps():
+            self._bulk(Application, applications)
+            self._bulk(ApplicationNotification, [
+                ApplicationNotification(user=admin, message=f"Yangi ariza tushdi: {app.name}",
+                                        created_at=app.created_at, is_read=rng.random() < 0.5)
+                for app in applications[-20:]
+            ])
+
+        self._create_floor_life(index, rng, floors, rooms, students)
+        return dormitory
+
+    def _create_floor_life(self, index, rng, floors, rooms, students):
+        """Qavat sardorlari, davomat sessiyalari, yig‘imlar, navbatchilik"""
+        leader_users = self._users([f"leader_{index}_{i}" for i in range(len(floors))], 'floor_leader', rng)
+        leaders = self._bulk(FloorLeader, [FloorLeader(floor=floor, user=user) for floor, user in zip(floors, leader_users)])
+        by_floor = {}
+        for student in students:
+            if student.room_id:
+                by_floor.setdefault(student.floor_id, []).append(student)
+        rooms_by_floor = {}
+        for room in rooms:
+            rooms_by_floor.setdefault(room.floor_id, []).append(room)
+
+        sessions = []
+        for leader in leaders:
+            for day in range(self.attendance_days):
+                date = self.today - timedelta(days=day)
+                sessions.append(AttendanceSession(
+                    floor_id=leader.floor_id, leader=leader, date=date,
+                    created_at=self.now - timedelta(days=day),
+                ))
+        with manual_timestamps():
+            sessions = self._bulk(AttendanceSession, sessions)
+            self._bulk(AttendanceRecord, [
+                AttendanceRecord(session=session, student=student, created_at=session.created_at,
+                                 status='out' if rng.random() < 0.1 else 'in')
+                for session in sessions for student in by_floor.get(session.floor_id, [])
+            ])
+        rebuild_attendance_months(AttendanceRecord.objects.filter(session__in=[s.id for s in sessions]))
+
+        collections, records = [], []
+        for leader in leaders:
+            for i in range(2):
+                collection = Collection(title=f"Yig‘im {i + 1}", amount=rng.randrange(10_000, 100_000, 5_000),
+                                        floor_id=leader.floor_id, leader=leader,
+                                        deadline=self.now + timedelta(days=7 * (i + 1)))
+                floor_students = by_floor.get(leader.floor_id, [])
+                statuses = [CollectionRecord.Status.PAID if rng.random() < 0.6 else CollectionRecord.Status.UNPAID
+                            for _ in floor_students]
+                collection.paid_count = statuses.count(CollectionRecord.Status.PAID)
+                collection.unpaid_count = len(statuses) - collection.paid_count
+                collections.append((collection, list(zip(floor_students, statuses))))
+        self._bulk(Collection, [collection for collection, _ in collections])
+        for collection, items in collections:
+            records.extend(CollectionRecord(collection=collection, student=student, status=record_status)
+                           for student, record_status in items)
+        self._bulk(CollectionRecord, records)
+
+        self._bulk(TaskForLeader, [
+            TaskForLeader(user=leader.user, description=f"Sardor vazifasi {i + 1}", status='PENDING')
+            for leader in leaders for i in range(3)
+        ])
+        self._bulk(DutySchedule, [
+            DutySchedule(floor_id=leader.floor_id, room=rooms_by_floor[leader.floor_id][day % ROOMS_PER_FLOOR],
+                         date=self.today + timedelta(days=day))
+            for leader in leaders for day in range(7)
+        ])
+
+    @transaction.atomic
+    def create_apartments(self, owners=5, per_owner=4):
+        rng = random.Random(self.seed + 7)
+        provinces = list(Province.objects.values_list('id', flat=True))
+        amenities = list(Amenity.objects.values_list('id', flat=True))
+        start = User.objects.filter(role='ijarachi').count()
+        users = self._users([f"ijarachi_{start + i}" for i in range(owners)], 'ijarachi', rng)
+        apartments = self._bulk(Apartment, [
+            Apartment(title=f"Kvartira {user.id}-{i + 1}", description="Sintetik kvartira", user=user,
+                      province_id=rng.choice(provinces), exact_address=f"{i + 1}-uy", monthly_price=rng.randrange(1_000_000, 5_000_000, 100_000),
+                      room_type=rng.choice(['1 kishilik', '2 kishilik', 'Oilaviy']), phone_number=f"+99894{rng.randint(1000000, 9999999)}")
+            for user in users for i in range(per_owner)
+        ])
+        Apartment.amenities.through.objects.bulk_create([
+            Apartment.amenities.through(apartment_id=apartment.id, amenity_id=amenity_id)
+            for apartment in apartments for amenity_id in rng.sample(amenities, k=min(2, len(amenities)))
+        ], batch_size=self.batch_size)
+        self._bulk(ApartmentImage, [ApartmentImage(apartment=apartment, image='dormitory_images/fon.jpg')
+                                    for apartment in apartments for _ in range(2)])
+        return users
+
+    @transaction.atomic
+    def create_notifications(self, count=5):
+        """Umumiy bildirishnomalar va ularning barcha studentlarga tarqatilishi"""
+        with manual_timestamps():
+            notifications = self._bulk(Notification, [
+                Notification(message=f"E'lon {i + 1}", target_type='all_students',
+                             created_at=self.now - timedelta(days=i))
+                for i in range(count)
+            ])
+        student_ids = list(User.objects.filter(role='student').values_list('id', flat=True))
+        UserNotification.objects.bulk_create([
+            UserNotification(user_id=user_id, notification=notification)
+            for notification in notifications for user_id in student_ids
+        ], batch_size=self.batch_size, ignore_conflicts=True)
+
+    @transaction.atomic
+    def create_likes(self, users, per_user=10):
+        rng = random.Random(self.seed + 11)
+        dormitories = list(Dormitory.objects.values_list('id', flat=True))
+        apartments = list(Apartment.objects.values_list('id', flat=True))
+        likes = []
+        for user in users:
+            for dormitory_id in rng.sample(dormitories, k=min(per_user, len(dormitories))):
+                likes.append(Like(user=user, content_type='dormitory', object_id=dormitory_id))
+            for apartment_id in rng.sample(apartments, k=min(per_user, len(apartments))):
+                likes.append(Like(user=user, content_type='apartment', object_id=apartment_id))
+        Like.objects.bulk_create(likes, batch_size=self.batch_size, ignore_conflicts=True)
+        recount_like_counts()
+
+    def create_dormitories(self, indexes, workers=1, callback=None):
+        """
+        Yotoqxonalar bir-biridan mustaqil, shuning uchun ular alohida jarayonlarda yaratilishi mumkin.
+        Har bir yotoqxonaning random generatori faqat seed va indeksga bog‘liq, natija tartibga bog‘liq emas.
+        """
+        indexes = list(indexes)
+        if workers <= 1 or len(indexes) <= 1:
+            for index in indexes:
+                self.create_dormitory(index)
+                if callback:
+                    callback(index)
+            return
+
+        # fork qilingan jarayonlar ota jarayonning ochiq ulanishini ishlatmasligi kerak
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            for index in executor.map(_create_dormitory, [self] * len(indexes), indexes):
+                if callback:
+                    callback(index)
+
+    def generate(self, dormitories=1, start=0, workers=1, callback=None):
+        """To‘liq ma'lumotlar to‘plami; birinchi yotoqxona foydalanuvchilari benchmark uchun qaytariladi"""
+        self.create_reference_data()
+        self.create_dormitories(range(start, start + dormitories), workers=workers, callback=callback)
+        owners = self.create_apartments(owners=max(5, dormitories))
+        self.create_notifications()
+        sample_students = list(User.objects.filter(role='student').order_by('id')[:20 * dormitories])
+        self.create_likes(sample_students)
+
+        superuser = User.objects.filter(is_superuser=True).first()
+        if superuser is None:
+            superuser = User.objects.create(username='superadmin', role='admin', is_superuser=True, is_staff=True,
+                                            password=self.password, email=None)
+
+        return {
+            'superuser': superuser,
+            'admin': User.objects.get(username=f"admin_{start}"),
+            'leader': User.objects.get(username=f"leader_{start}_0"),
+            'student': User.objects.get(username=f"student_{start}_0"),
+            'ijarachi': owners[0],
+        }
+
+
+def _create_dormitory(generator, index):
+    """ProcessPoolExecutor uchun: har bir worker o‘z ulanishini ochadi va oxirida yopadi"""
+    try:
+        generator.create_dormitory(index)
+    finally:
+        connection.close()
+    return index
@@ -0,0 +1,29 @@
+"""
+/token/ uchun cheklovlar (DRF throttle, hisoblagichlar Django keshida). Har bir login urinishi parol
+hash lashga (PBKDF2) CPU sarflaydi: IP bo‘yicha cheklov bitta manzildan kelgan oqimni, akkaunt bo‘yicha
+cheklov esa ko‘p manzildan bitta akkauntga parol terishni to‘xtatadi. Tezliklar
+REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] da ('login', 'login_account'); bir nechta worker da kesh
+umumiy bo‘lishi kerak (settings.CACHES).
+"""
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    scope = 'login'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginAccountRateThrottle(SimpleRateThrottle):
+    scope = 'login_account'
+
+    def get_cache_key(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not isinstance(username, str) or not username.strip():
+            return None
+        # katta-kichik harf yoki bo‘sh joy bilan cheklovni aylanib o‘tib bo‘lmasin; kalit uzunligi cheklangan
+        ident = hashlib.sha256(username.strip().lower().encode()).hexdigest()[:32]
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
@@ -0,0 +1,173 @@
+"""
+Bo‘laklab (resumable) fayl yuklash: init -> PUT bo‘laklar -> complete.
+Bo‘lak tanasi MultiPartParser orqali emas, so‘rov oqimidan to‘g‘ridan-to‘g‘ri diskdagi vaqtinchalik
+faylga yoziladi. Aloqa uzilsa mijoz GET bilan joriy offset ni so‘rab, shu joydan davom ettiradi.
+Tugagan yuklama UploadTokenField orqali istalgan FileField/ImageField ga token bilan biriktiriladi.
+"""
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import ChunkedUpload
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, message, offset=None):
+        super().__init__(message)
+        self.offset = offset
+
+
+def upload_path(upload):
+    return os.path.join(settings.CHUNKED_UPLOAD_DIR, f"{upload.pk}.part")
+
+
+def start_upload(user, filename, size):
+    if size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+        raise UploadError(f"Fayl hajmi {settings.CHUNKED_UPLOAD_MAX_SIZE} baytdan oshmasligi kerak")
+    upload = ChunkedUpload.objects.create(user=user, filename=os.path.basename(filename), size=size)
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    open(upload_path(upload), 'wb').close()
+    return upload
+
+
+def write_chunk(upload, stream, start, length):
+    """
+    `stream` dan `length` bayt o‘qib `start` joyiga yozadi. Bir vaqtda bitta yozuvchi: yozuv qatori
+    select_for_update bilan qulflanadi (SQLite da IMMEDIATE tranzaksiya yozuvchilarni navbatga qo‘yadi).
+    start joriy offset ga teng bo‘lishi shart. Uzilgan bo‘lakning yetib kelgan qismi ham saqlanadi.
+    """
+    if length > settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+        raise UploadError(f"Bo‘lak {settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE} baytdan katta", upload.offset)
+    if start + length > upload.size:
+        raise UploadError("Bo‘lak e'lon qilingan fayl hajmidan oshib ketdi", upload.offset)
+
+    error = None
+    with transaction.atomic():
+        try:
+            current = ChunkedUpload.objects.select_for_update(nowait=True).only('offset', 'status').get(pk=upload.pk)
+        except DatabaseError:
+            raise UploadError("Bu yuklamaga boshqa bo‘lak yozilmoqda", upload.offset)
+        upload.offset, upload.status = current.offset, current.status
+        if upload.status != ChunkedUpload.STATUS_UPLOADING:
+            raise UploadError("Yuklash allaqachon tugallangan", upload.offset)
+        if start != upload.offset:
+            raise UploadError("Offset mos kelmadi", upload.offset)
+
+        remaining = length
+        with open(upload_path(upload), 'r+b') as f:
+            f.seek(start)
+            try:
+                while remaining > 0:
+                    chunk = stream.read(min(COPY_BUFFER_SIZE, remaining))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            except OSError as exc:
+                # ulanish uzildi (UnreadablePostError): yozilgan qism offset ga kiradi, xato commit dan keyin
+                error = exc
+
+        upload.offset = start + length - remaining
+        ChunkedUpload.objects.filter(pk=upload.pk).update(offset=upload.offset, updated_at=timezone.now())
+    if error is not None:
+        raise error
+    return upload.offset
+
+
+def complete_upload(upload, sha256=''):
+    if upload.status == ChunkedUpload.STATUS_COMPLETE:
+        return upload
+    if upload.offset != upload.size:
+        raise UploadError("Fayl hali to‘liq yuklanmagan", upload.offset)
+
+    digest = hashlib.sha256()
+    with open(upload_path(upload), 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_BUFFER_SIZE), b''):
+            digest.update(chunk)
+    if sha256 and sha256.lower() != digest.hexdigest():
+        raise UploadError("SHA-256 mos kelmadi, faylni qaytadan yuklang", upload.offset)
+
+    upload.sha256 = digest.hexdigest()
+    upload.status = ChunkedUpload.STATUS_COMPLETE
+    upload.save(update_fields=['sha256', 'status', 'updated_at'])
+    return upload
+
+
+def discard_upload(upload):
+    try:
+        os.remove(upload_path(upload))
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def expired_uploads():
+    cutoff = timezone.now() - timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRE_HOURS)
+    return ChunkedUpload.objects.filter(updated_at__lt=cutoff)
+
+
+class ChunkedUploadFile(File):
+    """Tugagan yuklama fayli; model saqlangach ChunkedUploadSerializerMixin uni o‘chiradi"""
+
+    def __init__(self, upload):
+        super().__init__(open(upload_path(upload), 'rb'), name=upload.filename)
+        self.upload = upload
+
+    def temporary_file_path(self):
+        # ImageField tekshiruvi Pillow ni shu yo‘ldan ochadi, faylni xotiraga o‘qimaydi
+        return upload_path(self.upload)
+
+
+class UploadTokenField(serializers.UUIDField):
+    """
+    FileField/ImageField o‘rniga token qabul qiladi:
+        passport_image_first_upload = UploadTokenField(source='passport_image_first', image=True)
+    """
+    default_error_messages = {
+        'not_found': "Yuklama topilmadi yoki hali tugallanmagan.",
+    }
+
+    def __init__(self, image=False, **kwargs):
+        kwargs.setdefault('write_only', True)
+        kwargs.setdefault('required', False)
+        self.file_field = serializers.ImageField() if image else serializers.FileField()
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        token = super().to_internal_value(data)
+        user = getattr(self.context.get('request'), 'user', None)
+        if user is None or not user.is_authenticated:
+            self.fail('not_found')
+        upload = ChunkedUpload.objects.filter(pk=token, user=user, status=ChunkedUpload.STATUS_COMPLETE).first()
+        if upload is None or not os.path.exists(upload_path(upload)):
+            self.fail('not_found')
+
+        file = ChunkedUploadFile(upload)
+        try:
+            # oddiy FileField/ImageField tekshiruvlari (rasm ekanligi, nom uzunligi)
+            self.file_field.run_validation(file)
+        except serializers.ValidationError:
+            file.close()
+            raise
+        file.seek(0)
+        return file
+
+
+class ChunkedUploadSerializerMixin:
+    """Model saqlangandan keyin ishlatilgan yuklamalarni (vaqtinchalik fayl va yozuv) o‘chiradi"""
+
+    def save(self, **kwargs):
+        instance = super().save(**kwargs)
+        for value in self.validated_data.values():
+            if isinstance(value, ChunkedUploadFile):
+                value.close()
+                transaction.on_commit(lambda upload=value.upload: discard_upload(upload))
+        return instance
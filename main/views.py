@@ -1,4 +1,5 @@
-import openpyxl
+import re
+
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import status
@@ -6,21 +7,27 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.generics import *
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.core.exceptions import MultipleObjectsReturned
 from django.http import Http404
 from .permissions import *
 from .serializers import *
 from .models import *
-from rest_framework.exceptions import PermissionDenied, NotFound
+from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from django.db.models import Count, Sum, Q, Prefetch, F, Case, When, IntegerField
+from django.db.models import Count, Sum, Q, Prefetch, F, Case, When, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework.filters import SearchFilter
 from rest_framework.parsers import MultiPartParser, FormParser
 from .filters import StudentFilter, ApplicationFilter, TaskFilter
+from .attendance import mark_attendance, streak_expression
+from .auth import ClaimsRefreshToken
+from .likes import LIKE_MODELS, LikeTargetNotFound, count_subquery, like_statuses, load_like_targets, toggle_like
+from .routers import ReplicaReadMixin
+from .throttles import LoginAccountRateThrottle, LoginRateThrottle
+from .uploads import UploadError, complete_upload, discard_upload, start_upload, write_chunk
 from django.utils.dateparse import parse_date
 from django.utils.timesince import timesince
 from django.utils.timezone import localtime, now, is_naive, make_aware
@@ -28,8 +35,6 @@ from django.utils import timezone
 from django.db import transaction
 from .serializers import UserProfileUpdateSerializer
 from django.conf import settings
-from google.oauth2 import id_token
-from google.auth.transport import requests
 
 
 class GoogleLoginAPIView(APIView):
@@ -39,6 +44,10 @@ class GoogleLoginAPIView(APIView):
                          operation_description="Login with Google and receive JWT access & refresh tokens",
                          responses={200: "JWT tokens and user info"})
     def post(self, request):
+        # google-auth requests va certifi ni ham tortadi: faqat Google login da import qilinadi
+        from google.auth.transport import requests
+        from google.oauth2 import id_token
+
         serializer = GoogleLoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         token = serializer.validated_data['token']
@@ -90,7 +99,7 @@ class GoogleLoginAPIView(APIView):
             # UserProfile yaratish
             profile, profile_created = UserProfile.objects.get_or_create(user=user)
 
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -108,7 +117,7 @@ class GoogleLoginAPIView(APIView):
             return Response({"error": f"Authentication failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class UserListAPIView(ListAPIView):
+class UserListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
@@ -157,7 +166,7 @@ class StudentRegisterCreateAPIView(CreateAPIView):
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
         user = User.objects.get(username=response.data['username'])
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         response.data['refresh'] = str(refresh)
         response.data['access'] = str(refresh.access_token)
         return response
@@ -170,7 +179,7 @@ class TenantRegisterAPIView(CreateAPIView):
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
         user = User.objects.get(username=response.data['username'])
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         response.data['refresh'] = str(refresh)
         response.data['access'] = str(refresh.access_token)
         return response
@@ -203,9 +212,10 @@ class UserDetailAPIView(RetrieveUpdateDestroyAPIView):
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [LoginRateThrottle, LoginAccountRateThrottle]
 
 
-class UniversityListAPIView(ListAPIView):
+class UniversityListAPIView(ReplicaReadMixin, ListAPIView):
     queryset = University.objects.all()
     serializer_class = UniversitySerializer
     permission_classes = [AllowAny]
@@ -223,8 +233,26 @@ class UniversityDetailApiView(RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAdmin]
 
 
-class DormitoryListAPIView(ListAPIView):
-    queryset = Dormitory.objects.all()
+def _rooms_total(expression):
+    rooms = Room.objects.filter(floor__dormitory=OuterRef('pk')).values('floor__dormitory')
+    return Coalesce(Subquery(rooms.annotate(total=expression).values('total'), output_field=IntegerField()), 0)
+
+
+def _with_dormitory_list_data(queryset):
+    """DormitorySafeSerializer uchun: sonlar subquery annotatsiyalari, bog‘liq obyektlar JOIN/prefetch bilan"""
+    return queryset.select_related('university', 'admin__profile').prefetch_related(
+        'images', 'amenities', 'rules',
+    ).annotate(
+        total_capacity=_rooms_total(Sum('capacity')),
+        available_capacity=_rooms_total(Sum(F('capacity') - F('currentOccupancy'))),
+        total_rooms=_rooms_total(Count('*')),
+        accepted_students=count_subquery(Student.objects.filter(placement_status='Joylashdi'), 'dormitory'),
+        approved_applications=count_subquery(Application.objects.filter(status='APPROVED'), 'dormitory'),
+    )
+
+
+class DormitoryListAPIView(ReplicaReadMixin, ListAPIView):
+    queryset = _with_dormitory_list_data(Dormitory.objects.all())
     serializer_class = DormitorySafeSerializer
     permission_classes = [AllowAny]
 
@@ -266,7 +294,7 @@ class DormitoryDetailAPIView(RetrieveUpdateDestroyAPIView):
         instance.delete()
 
 
-class DormitoryImageListAPIView(ListAPIView):
+class DormitoryImageListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = DormitoryImageSafeSerializer
     permission_classes = [IsDormitoryAdmin]
 
@@ -311,7 +339,7 @@ class DormitoryImageDetailAPIView(RetrieveUpdateDestroyAPIView):
             return DormitoryImage.objects.none()
 
 
-class FloorListAPIView(ListAPIView):
+class FloorListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = FloorSerializer
     permission_classes = [IsDormitoryAdmin]
 
@@ -345,7 +373,7 @@ class FloorDetailAPIView(RetrieveUpdateDestroyAPIView):
         return Floor.objects.none()
 
 
-class RoomListAPIView(ListAPIView):
+class RoomListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = RoomSafeSerializer
     permission_classes = [IsAuthenticated]
 
@@ -390,7 +418,7 @@ class RoomListAPIView(ListAPIView):
         return queryset
 
 
-class EveryAvailableRoomsAPIView(ListAPIView):
+class EveryAvailableRoomsAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = RoomSerializer
 
     @swagger_auto_schema(
@@ -421,7 +449,7 @@ class EveryAvailableRoomsAPIView(ListAPIView):
         return rooms
 
 
-class AvailableFloorsAPIView(ListAPIView):
+class AvailableFloorsAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = FloorSerializer
 
     def get_queryset(self):
@@ -429,7 +457,7 @@ class AvailableFloorsAPIView(ListAPIView):
         return Floor.objects.filter(dormitory=dormitory)
 
 
-class AvailableRoomsAPIView(ListAPIView):
+class AvailableRoomsAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = RoomSerializer
 
     @swagger_auto_schema(
@@ -581,10 +609,13 @@ class StudentListAPIView(ListAPIView):
         return Student.objects.filter(dormitory=dormitory) if dormitory else Student.objects.none()
 
 
-class ExportStudentExcelAPIView(APIView):
+class ExportStudentExcelAPIView(ReplicaReadMixin, APIView):
     permission_classes = [IsDormitoryAdmin]
 
     def get(self, request, *args, **kwargs):
+        # openpyxl faqat eksportda kerak: worker ishga tushishida yuklanmaydi
+        import openpyxl
+
         wb = openpyxl.Workbook()
         ws = wb.active
         ws.title = "Talabalar"
@@ -724,7 +755,7 @@ class StudentDetailAPIView(RetrieveUpdateDestroyAPIView):
                     instance.placement_status = PLACEMENT_STATUS_DONE
 
 
-class ApplicationListAPIView(ListAPIView):
+class ApplicationListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = ApplicationSafeSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -770,7 +801,7 @@ class ApplicationDetailAPIView(RetrieveUpdateDestroyAPIView):
             return Application.objects.filter(user=user)
 
 
-class PaymentListAPIView(ListAPIView):
+class PaymentListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = PaymentSafeSerializer
     permission_classes = [IsDormitoryAdmin]
     filter_backends = [DjangoFilterBackend, SearchFilter]
@@ -796,10 +827,12 @@ class PaymentListAPIView(ListAPIView):
         return queryset
 
 
-class ExportPaymentExcelAPIView(APIView):
+class ExportPaymentExcelAPIView(ReplicaReadMixin, APIView):
     permission_classes = [IsDormitoryAdmin]
 
     def get(self, request, *args, **kwargs):
+        import openpyxl
+
         dormitory = get_object_or_404(Dormitory, admin=request.user)
 
         wb = openpyxl.Workbook()
@@ -878,13 +911,13 @@ class PaymentDetailAPIView(RetrieveUpdateDestroyAPIView):
         return Payment.objects.none()
 
 
-class ProvinceListAPIView(ListAPIView):
+class ProvinceListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = ProvinceSerializer
     queryset = Province.objects.all()
     permission_classes = [AllowAny]
 
 
-class DistrictListAPIView(ListAPIView):
+class DistrictListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = DistrictSerializer
     permission_classes = [AllowAny]
 
@@ -906,7 +939,7 @@ class DistrictListAPIView(ListAPIView):
         return District.objects.all()
 
 
-class AdminDashboardAPIView(APIView):
+class AdminDashboardAPIView(ReplicaReadMixin, APIView):
     permission_classes = [IsDormitoryAdmin]
 
     def get(self, request):
@@ -976,7 +1009,7 @@ class AdminDashboardAPIView(APIView):
         return Response(data)
 
 
-class MonthlyRevenueAPIView(APIView):
+class MonthlyRevenueAPIView(ReplicaReadMixin, APIView):
     permission_classes = [IsDormitoryAdmin]
 
     def get(self, request):
@@ -985,7 +1018,7 @@ class MonthlyRevenueAPIView(APIView):
         return Response(data)
 
 
-class RoomStatusStatsAPIView(APIView):
+class RoomStatusStatsAPIView(ReplicaReadMixin, APIView):
     permission_classes = [IsDormitoryAdmin]
 
     def get(self, request):
@@ -1116,13 +1149,13 @@ class RecentActivityAPIView(APIView):
         return Response({"activities": activities})
 
 
-class ApartmentListAPIView(ListAPIView):
+class ApartmentListAPIView(ReplicaReadMixin, ListAPIView):
     queryset = Apartment.objects.all()
     serializer_class = ApartmentSafeSerializer
     permission_classes = [AllowAny]
 
 
-class MyApartmentListAPIView(ListAPIView):
+class MyApartmentListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = ApartmentSafeSerializer
     permission_classes = [IsIjarachiAdmin]
 
@@ -1207,7 +1240,7 @@ class RuleRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         return RuleSafeSerializer
 
 
-class AmenityListAPIView(ListAPIView):
+class AmenityListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = AmenitySerializer
     permission_classes = [IsAuthenticated]
     queryset = Amenity.objects.all()
@@ -1304,7 +1337,7 @@ class ApartmentImageDetailAPIView(RetrieveUpdateDestroyAPIView):
 #             )
 
 
-class UserNotificationListView(ListAPIView):
+class UserNotificationListView(ReplicaReadMixin, ListAPIView):
     serializer_class = UserNotificationSerializer
     permission_classes = [IsAuthenticated]
 
@@ -1606,33 +1639,17 @@ class LikeToggleAPIView(APIView):
             content_type = serializer.validated_data['content_type']
             object_id = serializer.validated_data['object_id']
 
-            # Like mavjudligini tekshirish
-            existing_like = Like.objects.filter(
-                user=request.user,
-                content_type=content_type,
-                object_id=object_id
-            ).first()
+            try:
+                is_liked, like_id = toggle_like(request.user.id, content_type, object_id)
+            except LikeTargetNotFound:
+                message = "Dormitory topilmadi" if content_type == 'dormitory' else "Apartment topilmadi"
+                return Response({'non_field_errors': [message]}, status=status.HTTP_400_BAD_REQUEST)
 
-            if existing_like:
-                # Like mavjud bo'lsa, uni o'chirish
-                existing_like.delete()
-                return Response({
-                    'detail': 'Like olib tashlandi',
-                    'is_liked': False,
-                    'like_id': None
-                })
-            else:
-                # Like mavjud bo'lmasa, qo'shish
-                like = Like.objects.create(
-                    user=request.user,
-                    content_type=content_type,
-                    object_id=object_id
-                )
-                return Response({
-                    'detail': 'Like qo\'shildi',
-                    'is_liked': True,
-                    'like_id': like.id
-                })
+            return Response({
+                'detail': 'Like qo\'shildi' if is_liked else 'Like olib tashlandi',
+                'is_liked': is_liked,
+                'like_id': like_id
+            })
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -1688,26 +1705,88 @@ class LikeStatusAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Foydalanuvchining like qo'yganligini tekshirish
-        is_liked = Like.objects.filter(
-            user=request.user,
-            content_type=content_type,
-            object_id=object_id
-        ).exists()
-
-        # Umumiy like sonini hisoblash
-        total_likes = Like.objects.filter(
-            content_type=content_type,
-            object_id=object_id
-        ).count()
+        if content_type not in LIKE_MODELS:
+            return Response(
+                {'error': 'content_type dormitory yoki apartment bo\'lishi kerak'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # like holati keshdagi to'plamdan, umumiy son like_count ustunidan
+        return Response(like_statuses(request.user.id, content_type, [object_id])[object_id])
+
+
+class LikeBatchStatusAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    max_ids = 500
+
+    @swagger_auto_schema(
+        operation_description="Ko'p obyektlarning like holatini bitta so'rovda olish (ro'yxat sahifalari uchun)",
+        manual_parameters=[
+            openapi.Parameter(
+                'content_type',
+                openapi.IN_QUERY,
+                description="Content type (dormitory yoki apartment)",
+                type=openapi.TYPE_STRING,
+                required=True
+            ),
+            openapi.Parameter(
+                'object_ids',
+                openapi.IN_QUERY,
+                description="Vergul bilan ajratilgan ID lar, masalan: 1,2,3",
+                type=openapi.TYPE_STRING,
+                required=True
+            )
+        ],
+        responses={
+            200: openapi.Response(
+                description="Har bir obyekt uchun like holati",
+                examples={
+                    "application/json": {
+                        "content_type": "dormitory",
+                        "results": {
+                            "1": {"is_liked": True, "total_likes": 15},
+                            "2": {"is_liked": False, "total_likes": 3}
+                        }
+                    }
+                }
+            )
+        }
+    )
+    def get(self, request):
+        content_type = request.query_params.get('content_type')
+        raw_ids = request.query_params.get('object_ids')
+
+        if not content_type or not raw_ids:
+            return Response(
+                {'error': 'content_type va object_ids kerak'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if content_type not in LIKE_MODELS:
+            return Response(
+                {'error': 'content_type dormitory yoki apartment bo\'lishi kerak'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            object_ids = list(dict.fromkeys(int(value) for value in raw_ids.split(',') if value.strip()))
+        except ValueError:
+            return Response(
+                {'error': 'object_ids raqamlar bo\'lishi kerak'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(object_ids) > self.max_ids:
+            return Response(
+                {'error': f'Bir so\'rovda ko\'pi bilan {self.max_ids} ta ID'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         return Response({
-            'is_liked': is_liked,
-            'total_likes': total_likes
+            'content_type': content_type,
+            'results': like_statuses(request.user.id, content_type, object_ids)
         })
 
 
-class UserLikesAPIView(ListAPIView):
+class UserLikesAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = LikeSerializer
     permission_classes = [IsAuthenticated]
 
@@ -1756,7 +1835,7 @@ class UserLikesAPIView(ListAPIView):
         return super().get(request, *args, **kwargs)
 
     def get_queryset(self):
-        queryset = Like.objects.filter(user=self.request.user).select_related('user')
+        queryset = Like.objects.filter(user=self.request.user)
         content_type = self.request.query_params.get('content_type')
 
         if content_type:
@@ -1764,27 +1843,89 @@ class UserLikesAPIView(ListAPIView):
 
         return queryset.order_by('-created_at')
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        likes = list(page if page is not None else queryset)
 
-class AttendanceSessionListAPIView(ListAPIView):
-    serializer_class = AttendanceSessionSafeSerializer
-    permission_classes = [IsAuthenticated]
+        # like lar soniga bog‘liq bo‘lmagan holda: har bir content_type uchun bitta so‘rov
+        context = self.get_serializer_context()
+        context['like_targets'] = load_like_targets(likes)
+        serializer = self.get_serializer(likes, many=True, context=context)
 
-    def get_queryset(self):
-        user = self.request.user
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
-        if user.role == 'admin':
+
+def _attendance_sessions_for_user(user):
+    if user.role == 'admin':
+        return AttendanceSession.objects.filter(
+            floor__dormitory__admin=user
+        )
+
+    elif user.role == 'floor_leader':
+        if hasattr(user, "floor_leader") and user.floor_leader.floor_id:
             return AttendanceSession.objects.filter(
-                floor__dormitory__admin=user
+                floor_id=user.floor_leader.floor_id
             )
+        return AttendanceSession.objects.none()
 
-        elif user.role == 'floor_leader':
-            if hasattr(user, "floor_leader") and user.floor_leader.floor:
-                return AttendanceSession.objects.filter(
-                    floor=user.floor_leader.floor
-                )
+    return AttendanceSession.objects.none()
+
+
+def _with_attendance_counts(queryset):
+    """in/out sonlarini DB tomonida hisoblash"""
+    return queryset.select_related('floor', 'leader__user', 'leader__floor').annotate(
+        exist_count=Count('records', filter=Q(records__status=AttendanceRecord.Status.IN)),
+        absent_count=Count('records', filter=Q(records__status=AttendanceRecord.Status.OUT)),
+    )
+
+
+def _with_attendance_rooms(queryset):
+    """Xonalar bo‘yicha guruhlash uchun recordlarni student va xonasi bilan birga olib kelish"""
+    return queryset.prefetch_related(
+        Prefetch(
+            'records',
+            queryset=AttendanceRecord.objects.select_related('student__room').order_by('student__room__name')
+        )
+    )
+
+
+class AttendanceSessionListAPIView(ReplicaReadMixin, ListAPIView):
+    serializer_class = AttendanceSessionSafeSerializer
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                'compact',
+                openapi.IN_QUERY,
+                description="false bo‘lsa xonalar bo‘yicha ro‘yxat ham qaytariladi (default: true)",
+                type=openapi.TYPE_BOOLEAN,
+                required=False
+            ),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def is_compact(self):
+        return self.request.query_params.get('compact', 'true').lower() not in ('false', '0')
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['compact'] = self.is_compact()
+        return context
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
             return AttendanceSession.objects.none()
 
-        return AttendanceSession.objects.none()
+        queryset = _with_attendance_counts(_attendance_sessions_for_user(self.request.user))
+        if not self.is_compact():
+            queryset = _with_attendance_rooms(queryset)
+        return queryset.order_by('-date')
 
 
 class AttendanceSessionCreateAPIView(CreateAPIView):
@@ -1812,21 +1953,8 @@ class AttendanceSessionDetailAPIView(RetrieveAPIView):
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return AttendanceSession.objects.none()
-        user = self.request.user
-
-        if user.role == 'admin':
-            return AttendanceSession.objects.filter(
-                floor__dormitory__admin=user
-            )
-
-        elif user.role == 'floor_leader':
-            if hasattr(user, "floor_leader") and user.floor_leader.floor:
-                return AttendanceSession.objects.filter(
-                    floor=user.floor_leader.floor
-                )
-            return AttendanceSession.objects.none()
 
-        return AttendanceSession.objects.none()
+        return _with_attendance_rooms(_with_attendance_counts(_attendance_sessions_for_user(self.request.user)))
 
 
 class AttendanceRecordBulkUpdateAPIView(APIView):
@@ -1854,7 +1982,6 @@ class AttendanceRecordBulkUpdateAPIView(APIView):
         serializer = AttendanceRecordBulkUpdateSerializer(data=request.data)
         if serializer.is_valid():
             records = serializer.validated_data['records']
-            updated_records = []
 
             try:
                 session = AttendanceSession.objects.get(id=session_id)
@@ -1864,35 +1991,110 @@ class AttendanceRecordBulkUpdateAPIView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
 
-            for record in records:
-                try:
-                    attendance = AttendanceRecord.objects.get(
-                        id=record['id'], session=session
-                    )
-                    if str(attendance.student.id) != str(record['student_id']):
+            with transaction.atomic():
+                existing = {
+                    obj.id: obj
+                    for obj in AttendanceRecord.objects
+                    .select_for_update()
+                    .filter(session=session, id__in=[r['id'] for r in records])
+                    .only('id', 'student_id', 'status')
+                }
+
+                for record in records:
+                    attendance = existing.get(record['id'])
+                    if attendance is None:
+                        return Response(
+                            {"detail": f"AttendanceRecord {record['id']} bu Sessionda mavjud emas!"},
+                            status=status.HTTP_404_NOT_FOUND
+                        )
+                    if attendance.student_id != record['student_id']:
                         return Response(
                             {"detail": f"Record {record['id']} student_id mos emas"},
                             status=status.HTTP_400_BAD_REQUEST
                         )
-
                     attendance.status = record['status']
-                    attendance.save()
-                    updated_records.append({
-                        "id": attendance.id,
-                        "student_id": attendance.student.id,
-                        "status": attendance.status,
-                    })
-                except AttendanceRecord.DoesNotExist:
-                    return Response(
-                        {"detail": f"AttendanceRecord {record['id']} bu Sessionda mavjud emas!"},
-                        status=status.HTTP_404_NOT_FOUND
-                    )
 
+                AttendanceRecord.objects.bulk_update(existing.values(), ['status'])
+                mark_attendance(
+                    session.date,
+                    in_student_ids=[a.student_id for a in existing.values() if a.status == AttendanceRecord.Status.IN],
+                    out_student_ids=[a.student_id for a in existing.values() if a.status == AttendanceRecord.Status.OUT],
+                )
+
+            updated_records = [
+                {
+                    "id": existing[record['id']].id,
+                    "student_id": existing[record['id']].student_id,
+                    "status": existing[record['id']].status,
+                }
+                for record in records
+            ]
             return Response({"updated": updated_records}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class AttendanceAnalyticsAPIView(ReplicaReadMixin, ListAPIView):
+    """Oylik davomat bitmaplari bo‘yicha statistika: yo‘qlik kunlari, ketma-ket yo‘qlik, heatmap"""
+    serializer_class = AttendanceMonthSerializer
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('year', openapi.IN_QUERY, description="Yil (default: joriy yil)",
+                              type=openapi.TYPE_INTEGER),
+            openapi.Parameter('month', openapi.IN_QUERY, description="Oy 1-12 (default: joriy oy)",
+                              type=openapi.TYPE_INTEGER),
+            openapi.Parameter('student', openapi.IN_QUERY, description="Student ID bo‘yicha filter",
+                              type=openapi.TYPE_INTEGER),
+            openapi.Parameter('min_streak', openapi.IN_QUERY,
+                              description="Kamida shuncha kun ketma-ket yo‘q bo‘lgan talabalar",
+                              type=openapi.TYPE_INTEGER),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return AttendanceMonth.objects.none()
+
+        user = self.request.user
+        params = self.request.query_params
+        today = timezone.now().date()
+
+        try:
+            year = int(params.get('year', today.year))
+            month = int(params.get('month', today.month))
+            min_streak = int(params.get('min_streak', 0))
+        except ValueError:
+            raise ValidationError({"detail": "year, month va min_streak raqam bo‘lishi kerak"})
+        if not 1 <= month <= 12:
+            raise ValidationError({"month": "Oy 1 dan 12 gacha bo‘lishi kerak"})
+
+        queryset = AttendanceMonth.objects.filter(year=year, month=month)
+        if user.role == 'admin':
+            queryset = queryset.filter(student__dormitory__admin=user)
+        elif user.role == 'floor_leader' and hasattr(user, 'floor_leader') and user.floor_leader.floor_id:
+            queryset = queryset.filter(student__floor_id=user.floor_leader.floor_id)
+        else:
+            # qavatsiz sardor: floor_id=None filtri qavatga biriktirilmagan hamma talabani qaytarardi
+            return AttendanceMonth.objects.none()
+
+        student_id = params.get('student')
+        if student_id and student_id.isdigit():
+            queryset = queryset.filter(student_id=int(student_id))
+
+        if min_streak > 1:
+            queryset = queryset.annotate(
+                absence_streak=streak_expression('out_mask', min(min_streak, 31))
+            ).exclude(absence_streak=0)
+        elif min_streak == 1:
+            queryset = queryset.exclude(out_mask=0)
+
+        return queryset.select_related('student__room').order_by('student__name')
+
+
 class FloorLeaderListCreateAPIView(ListCreateAPIView):
     permission_classes = [IsDormitoryAdmin]
     parser_classes = [MultiPartParser, FormParser]
@@ -1933,7 +2135,7 @@ class FloorLeaderDetailAPIView(RetrieveUpdateDestroyAPIView):
             user.save(update_fields=['role'])
 
 
-class CollectionListAPIView(ListAPIView):
+class CollectionListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = CollectionSafeSerializer
     permission_classes = [IsAuthenticated]
 
@@ -2006,16 +2208,24 @@ class CollectionRecordBulkUpdateAPIView(APIView):
                     }
                 }
             ),
-            400: "Validation error",
+            400: openapi.Response(
+                description="Validation error (hech bir record yangilanmaydi)",
+                examples={
+                    "application/json": {
+                        "errors": [
+                            {"id": 3, "detail": "Record 3 student_id mos emas"}
+                        ]
+                    }
+                }
+            ),
             403: "Faqat sardor o‘zgartira oladi",
-            404: "Collection yoki Record topilmadi"
+            404: "Collection topilmadi"
         }
     )
     def patch(self, request, collection_id, *args, **kwargs):
         serializer = CollectionRecordBulkUpdateSerializer(data=request.data)
         if serializer.is_valid():
             records = serializer.validated_data['records']
-            updated_records = []
 
             #  Collection mavjudligini tekshirish
             try:
@@ -2035,39 +2245,67 @@ class CollectionRecordBulkUpdateAPIView(APIView):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-            if collection.leader != leader:
+            if collection.leader_id != leader.id:
                 return Response(
                     {"detail": "Faqat o‘zingizga tegishli yig‘imni o‘zgartirishingiz mumkin"},
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-            #  Recordlarni yangilash
-            for record in records:
-                try:
-                    record_obj = CollectionRecord.objects.get(
-                        id=record['id'], collection=collection
-                    )
-                except CollectionRecord.DoesNotExist:
-                    return Response(
-                        {"detail": f"CollectionRecord {record['id']} bu Collectionda mavjud emas!"},
-                        status=status.HTTP_404_NOT_FOUND
-                    )
+            #  Recordlarni yangilash: bitta o‘qish, bitta yozish, hammasi yoki hech biri
+            with transaction.atomic():
+                existing = {
+                    obj.id: obj
+                    for obj in CollectionRecord.objects
+                    .select_for_update()
+                    .filter(collection=collection, id__in=[r['id'] for r in records])
+                    .only('id', 'student_id', 'status')
+                }
 
-                # student_id mosligini tekshirish
-                if str(record_obj.student.id) != str(record['student_id']):
-                    return Response(
-                        {"detail": f"Record {record['id']} student_id mos emas"},
-                        status=status.HTTP_400_BAD_REQUEST
+                errors = []
+                for record in records:
+                    record_obj = existing.get(record['id'])
+                    if record_obj is None:
+                        errors.append({
+                            "id": record['id'],
+                            "detail": f"CollectionRecord {record['id']} bu Collectionda mavjud emas!"
+                        })
+                    elif record_obj.student_id != record['student_id']:
+                        errors.append({
+                            "id": record['id'],
+                            "detail": f"Record {record['id']} student_id mos emas"
+                        })
+                if errors:
+                    return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+                paid_delta = 0
+                changed = []
+                for record in records:
+                    record_obj = existing[record['id']]
+                    if record_obj.status == record['status']:
+                        continue
+                    if record['status'] == CollectionRecord.Status.PAID:
+                        paid_delta += 1
+                    elif record_obj.status == CollectionRecord.Status.PAID:
+                        paid_delta -= 1
+                    record_obj.status = record['status']
+                    changed.append(record_obj)
+
+                if changed:
+                    CollectionRecord.objects.bulk_update(changed, ['status'], batch_size=len(changed))
+                if paid_delta:
+                    Collection.objects.filter(id=collection.id).update(
+                        paid_count=F('paid_count') + paid_delta,
+                        unpaid_count=F('unpaid_count') - paid_delta,
                     )
 
-                record_obj.status = record['status']
-                record_obj.save(update_fields=['status'])
-                updated_records.append({
-                    "id": record_obj.id,
-                    "student_id": record_obj.student.id,
-                    "status": record_obj.status
-                })
-
+            updated_records = [
+                {
+                    "id": existing[record['id']].id,
+                    "student_id": existing[record['id']].student_id,
+                    "status": existing[record['id']].status
+                }
+                for record in records
+            ]
             return Response({"updated": updated_records}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -2085,9 +2323,8 @@ class StatisticForLeaderAPIView(APIView):
         # 2. Collection degree -> oxirgi collectionni olish
         last_collection = Collection.objects.filter(floor=leader.floor).order_by("-created_at").first()
         if last_collection:
-            records = CollectionRecord.objects.filter(collection=last_collection)
-            total = records.count()
-            paid = records.filter(status=CollectionRecord.Status.PAID).count()
+            paid = last_collection.paid_count
+            total = paid + last_collection.unpaid_count
             collection_degree = f"{paid}/{total}" if total > 0 else "0/0"
         else:
             collection_degree = "0/0"
@@ -2117,7 +2354,7 @@ class StatisticForLeaderAPIView(APIView):
         return Response(serializer.data)
 
 
-class TaskForLeaderListAPIView(ListAPIView):
+class TaskForLeaderListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = TaskForLeaderSafeSerializer
     permission_classes = [IsAuthenticated]
 
@@ -2158,7 +2395,7 @@ class StudentMeAPIView(RetrieveAPIView):
         return Student.objects.get(user=self.request.user)
     
     
-class DutyScheduleListAPIView(ListAPIView):
+class DutyScheduleListAPIView(ReplicaReadMixin, ListAPIView):
     serializer_class = DutyScheduleSafeSerializer
     permission_classes = [IsFloorLeader]
     
@@ -2233,4 +2470,109 @@ class UsernameCheckAPIView(APIView):
         return Response({
             "username": username,
             "available": not exists
-        })
\ No newline at end of file
+        })
+
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+
+def _upload_error_response(exc):
+    data = {'detail': str(exc)}
+    if exc.offset is not None:
+        data['offset'] = exc.offset
+        return Response(data, status=status.HTTP_409_CONFLICT)
+    return Response(data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ChunkedUploadCreateAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        request_body=ChunkedUploadCreateSerializer,
+        operation_description=(
+            "Katta faylni bo'laklab yuklashni boshlash. Keyin bo'laklar PUT /uploads/<token>/ ga "
+            "Content-Range: bytes <start>-<end>/<size> headeri bilan yuboriladi, oxirida "
+            "POST /uploads/<token>/complete/. Tayyor token ariza/talaba serializerlaridagi *_upload maydoniga beriladi."
+        ),
+        responses={201: ChunkedUploadSerializer}
+    )
+    def post(self, request):
+        serializer = ChunkedUploadCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = start_upload(request.user, **serializer.validated_data)
+        except UploadError as exc:
+            return _upload_error_response(exc)
+        return Response(ChunkedUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+
+class ChunkedUploadDetailAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self, token):
+        return get_object_or_404(ChunkedUpload, pk=token, user=self.request.user)
+
+    @swagger_auto_schema(
+        operation_description="Yuklama holati: uzilishdan keyin shu offset dan davom ettiriladi",
+        responses={200: ChunkedUploadSerializer}
+    )
+    def get(self, request, token):
+        return Response(ChunkedUploadSerializer(self.get_object(token)).data)
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Bitta bo'lak: tanasi xom baytlar (multipart emas), Content-Range: bytes <start>-<end>/<size>. "
+            "start joriy offset ga teng bo'lmasa 409 va to'g'ri offset qaytadi."
+        ),
+        responses={200: ChunkedUploadSerializer, 409: "Offset mos kelmadi", 416: "Hajm mos kelmadi"}
+    )
+    def put(self, request, token):
+        upload = self.get_object(token)
+        content_range = request.headers.get('Content-Range', '')
+        match = CONTENT_RANGE_RE.match(content_range.strip())
+        if match:
+            start, end = int(match.group(1)), int(match.group(2))
+            length = end - start + 1
+            total = match.group(3)
+            if total != '*' and int(total) != upload.size:
+                # boshqa fayl (yoki hajmi o'zgargan) bo'lagi shu yuklamaga yozilmasin
+                return Response({'detail': "Content-Range dagi hajm yuklama hajmiga mos emas", 'size': upload.size},
+                                status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        else:
+            # Content-Range siz: bo'lak joriy offset dan boshlanadi
+            start, length = upload.offset, int(request.headers.get('Content-Length') or 0)
+        if length <= 0:
+            return Response({'detail': "Bo'lak bo'sh yoki Content-Range noto'g'ri"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            offset = write_chunk(upload, request.stream, start, length)
+        except UploadError as exc:
+            return _upload_error_response(exc)
+        upload.offset = offset
+        return Response(ChunkedUploadSerializer(upload).data)
+
+    @swagger_auto_schema(operation_description="Yuklamani bekor qilish", responses={204: "O'chirildi"})
+    def delete(self, request, token):
+        discard_upload(self.get_object(token))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ChunkedUploadCompleteAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={'sha256': openapi.Schema(type=openapi.TYPE_STRING, description="Ixtiyoriy tekshiruv")}
+        ),
+        operation_description="Barcha bo'laklar yuklangach faylni yakunlash (hajm va ixtiyoriy SHA-256 tekshiriladi)",
+        responses={200: ChunkedUploadSerializer, 409: "Fayl to'liq yuklanmagan"}
+    )
+    def post(self, request, token):
+        upload = get_object_or_404(ChunkedUpload, pk=token, user=request.user)
+        try:
+            complete_upload(upload, request.data.get('sha256', ''))
+        except UploadError as exc:
+            return _upload_error_response(exc)
+        return Response(ChunkedUploadSerializer(upload).data)